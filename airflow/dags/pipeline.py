@@ -0,0 +1,363 @@
+import uuid
+from collections import Counter
+from dataclasses import asdict
+from datetime import datetime, timedelta
+
+from airflow.decorators import dag, task
+from airflow.exceptions import AirflowSkipException
+
+from infra.containers import Container
+from infra.pipeline import process_brand, report_write_failure
+
+
+def seed_pacing(container, logger):
+    """
+    Starts the rate limiter at the request rate the previous task settled on,
+    so every task does not have to rediscover it from scratch. Only the aimd
+    strategy adapts its rate, a fixed rate is always the configured one.
+    """
+    if container.config.rate_limit.strategy() != "aimd":
+        return
+    request_rate = container.run_service().get_last_request_rate()
+    if request_rate is None:
+        return
+    logger.info(f"Resuming request rate of {request_rate:.3f} req/s")
+    container.rate_limiter().set_rate(container.config.http.url(), request_rate)
+
+
+def record_pacing(container, run_id, logger):
+    """
+    Stores the request rate and error ratio reached by the rate limiter on the run,
+    when the rate limiter adapts its rate (aimd strategy).
+    """
+    if container.config.rate_limit.strategy() != "aimd":
+        return
+    state = container.rate_limiter().state(container.config.http.url())
+    logger.info(
+        f"Pacing: rate={state.rate:.3f} req/s, error_ratio={state.error_ratio:.2%} "
+        f"over last {state.requests} requests"
+    )
+    if state.requests:
+        container.run_service().record_pacing(run_id, state.rate, state.error_ratio)
+
+
+def on_pipeline_failure(context):
+    """
+    Callback triggered when the DAG run fails.
+    Ensures the 'runs' table reflects the failure and records the error message.
+    """
+    container = Container.create_and_patch()
+    dag_run = context.get("dag_run")
+    if not dag_run:
+        logger = container.logger_factory().create("airflow.on_pipeline_failure")
+        logger.error("DAG run not found, skipping...")
+        return
+
+    run_id = context["ti"].xcom_pull(task_ids="prepare_run", key="return_value")
+    if isinstance(run_id, list) and len(run_id) > 0:
+        run_id = run_id[0]
+
+    if not run_id:
+        run_id = dag_run.conf.get("run_id")
+
+    if not run_id:
+        logger = container.logger_factory().create("airflow.on_pipeline_failure")
+        logger.error("Run ID not found, skipping...")
+        return
+
+    logger = container.logger_factory().create(
+        "airflow.on_pipeline_failure",
+        context={"run_id": str(run_id)},
+    )
+    run_service = container.run_service()
+
+    # identify which task failed
+    failed_ti = context.get("task_instance")
+    task_id = failed_ti.task_id if failed_ti else "unknown"
+    exception = context.get("exception")
+    map_index = failed_ti.map_index if failed_ti else None
+
+    err_msg = (
+        f"Pipeline failed at task: {task_id} (index: {map_index})."
+        if map_index is not None
+        else f"Pipeline failed at task: {task_id}. Error: {str(exception)}"
+        if exception
+        else f"Pipeline failed at task: {task_id}."
+    )
+    logger.error(err_msg)
+    logger.info("Marking run as failed.")
+    run_service.fail_run(str(run_id), err_msg)
+    logger.info("Run marked as failed.")
+
+
+def on_pipeline_success(context):
+    """
+    Callback triggered when the entire DAG completes successfully.
+    """
+    container = Container.create_and_patch()
+    dag_run = context.get("dag_run")
+    if not dag_run:
+        logger = container.logger_factory().create("airflow.on_pipeline_success")
+        logger.error("DAG run not found, skipping...")
+        return
+
+    run_id = context["ti"].xcom_pull(task_ids="prepare_run", key="return_value")
+    if isinstance(run_id, list) and len(run_id) > 0:
+        run_id = run_id[0]
+
+    if not run_id:
+        run_id = dag_run.conf.get("run_id")
+
+    if not run_id:
+        logger = container.logger_factory().create("airflow.on_pipeline_success")
+        logger.error("Run ID not found, skipping...")
+        return
+
+    logger = container.logger_factory().create(
+        "airflow.on_pipeline_success",
+        context={"run_id": run_id},
+    )
+    run_service = container.run_service()
+
+    # Ensure run_id is a string before passing it to internal services
+    logger.info("Marking run as completed.")
+    run_service.complete_run(str(run_id))
+    logger.info("Pipeline completed successfully.")
+
+
+@dag(
+    dag_id="carscout_pipeline",
+    start_date=datetime(2025, 1, 1),
+    schedule_interval=None,
+    catchup=False,
+    max_active_runs=1,
+    default_args={"retries": 2},
+    on_failure_callback=on_pipeline_failure,
+    on_success_callback=on_pipeline_success,
+)
+def carscout_pipeline():
+    @task
+    def prepare_run(**context):
+        """
+        Generates or reuses run_id and returns it. Helps track the pipeline run.
+        """
+        import json
+
+        run_id = context.get("dag_run").conf.get("run_id") if context.get("dag_run") else None
+        if run_id is None:
+            run_id = str(uuid.uuid4())
+
+        # init container, services and database
+        container = Container.create_and_patch()
+        container.init_db()
+        run_service = container.run_service()
+
+        logger = container.logger_factory().create(
+            "airflow.prepare_run",
+            context={"run_id": run_id},
+        )
+        logger.info(f"Starting run: {run_id}")
+        logger.info(f"Using configuration: {json.dumps(container.config(), indent=2)}")
+
+        run_service.start_run(run_id)
+
+        return run_id
+
+    @task
+    def get_brands():
+        """
+        Loads brands from seed file and groups them into shards of similar listing volume,
+        returned as lists of dicts for mapping.
+        """
+        container = Container.create_and_patch()
+        logger = container.logger_factory().create("airflow.get_brands")
+        brand_service = container.brand_service()
+        brand_service.read_brands()
+        brands = brand_service.load_brands()
+
+        volumes = container.listing_service().get_brand_volumes(
+            container.config.scrapers.listing_scraper.sharding.lookback_runs()
+        )
+        shards = container.sharding_policy().shard(brands, volumes)
+        logger.info(
+            f"Split {len(brands)} brands into {len(shards)} shards, expected pages per shard: "
+            f"{[shard.expected_pages for shard in shards]}"
+        )
+        # convert dataclasses to dicts for xcom serialization
+        return [[asdict(b) for b in shard.brands] for shard in shards]
+
+    @task(
+        max_active_tis_per_dag=1,
+        execution_timeout=timedelta(hours=2),
+    )
+    def process_listings(brand_dicts: list[dict], task_run_id: str):
+        """
+        Processes listings for a shard of brands, reusing the same browser across brands.
+        A failed brand does not stop the shard and does not fail the task either: it is counted
+        in the run metrics, and retrying the task would store the brands that succeeded again.
+        """
+
+        from core.entities.brand import Brand
+
+        brands = [Brand(**brand_dict) for brand_dict in brand_dicts]
+
+        # init container and services
+        container = Container.create_and_patch()
+        logger = container.logger_factory().create(
+            "airflow.listings",
+            context={"run_id": task_run_id, "brands": [brand.slug for brand in brands]},
+        )
+        listing_scraper = container.listing_scraper()
+        listing_service = container.listing_service()
+        run_service = container.run_service()
+        watermark_service = container.watermark_service()
+
+        logger.info(f"Processing {len(brands)} brands: {[brand.slug for brand in brands]}")
+        seed_pacing(container, logger)
+        success_listings = 0
+        failed_listings = 0
+        failed_brands = []
+
+        try:
+            for brand in brands:
+                try:
+                    stats = process_brand(
+                        brand,
+                        task_run_id,
+                        listing_scraper,
+                        listing_service,
+                        run_service,
+                        watermark_service,
+                        logger,
+                        container.write_behind_buffer,
+                    )
+                    success_listings += stats["success_listings"]
+                    failed_listings += stats["failed_listings"]
+                except Exception as err:
+                    logger.error(f"Failed to process {brand.slug}: {err}", exc_info=True)
+                    run_service.update_metrics(task_run_id, num_errors=1)
+                    failed_brands.append(brand.slug)
+        finally:
+            record_pacing(container, task_run_id, logger)
+            # quits the pooled browsers
+            container.shutdown_resources()
+
+        if failed_brands:
+            logger.warning(f"Failed to process brands: {failed_brands}")
+
+        return {
+            "brands": [brand.slug for brand in brands],
+            "failed_brands": failed_brands,
+            "success_listings": success_listings,
+            "failed_listings": failed_listings,
+        }
+
+    @task
+    def process_vehicles(task_run_id: str, listing_results: list):
+        """
+        Identifies listings for which vehicle information is missing.
+        Requires a run_id to be provided.
+        Processes all identified listings to scrape and store vehicle data.
+        """
+        if not task_run_id:
+            raise AirflowSkipException("No task_run_id found, skipping vehicle processing.")
+
+        # init container and services
+        container = Container.create_and_patch()
+        logger = container.logger_factory().create(
+            "airflow.process_vehicles",
+            context={"run_id": task_run_id},
+        )
+        vehicle_scraper = container.vehicle_scraper()
+        listing_service = container.listing_service()
+        vehicle_service = container.vehicle_service()
+        run_service = container.run_service()
+
+        # retrieve new listings and listings with outdated vehicles for the given task_run_id
+        logger.info(f"Retrieving listings for task_run_id={task_run_id}")
+        candidates = listing_service.find_listings_to_scrape(
+            task_run_id, container.refresh_policy()
+        )
+        reasons = Counter(candidate.reason.value for candidate in candidates)
+        logger.info(
+            f"Selected {len(candidates)} listings for task_run_id={task_run_id}: {dict(reasons)}"
+        )
+        listings = [candidate.listing for candidate in candidates]
+
+        if not listings:
+            msg = "No listings to process."
+            logger.info(msg)
+            raise AirflowSkipException(msg)
+
+        # process each listing to scrape and store vehicle data, written in the background
+        seed_pacing(container, logger)
+        total = len(listings)
+        missing = 0
+
+        with container.write_behind_buffer(
+            write_batch=vehicle_service.save_vehicles,
+            write_one=vehicle_service.save_vehicle,
+            on_failed=report_write_failure("vehicle", task_run_id, run_service, logger),
+        ) as buffer:
+            for vehicle in vehicle_scraper.run(listings):
+                if vehicle:
+                    buffer.put(vehicle)
+                else:
+                    missing += 1
+
+        success = buffer.written
+        failed = buffer.failed + missing
+
+        # update run metrics
+        run_service.update_metrics(task_run_id, num_vehicles=success, num_errors=failed)
+        record_pacing(container, task_run_id, logger)
+
+        # push results to xcom for subsequent tasks
+        result = {
+            "run_id": task_run_id,
+            "total_listings": total,
+            "processed_listings": success + failed,
+            "success_listings": success,
+            "failed_listings": failed,
+        }
+        return result
+
+    @task(
+        trigger_rule="all_done",  # ensures the task runs even if some brands failed
+    )
+    def summarize_run(vehicle_results: dict):
+        container = Container.create_and_patch()
+        logger = container.logger_factory().create("airflow.summarize")
+
+        logger.info("--- RUN SUMMARY ---")
+        if not vehicle_results:
+            logger.warning(
+                "No vehicle results to summarize (upstream might have been skipped or failed)."
+            )
+            return
+
+        run_id = vehicle_results.get("run_id", "unknown")
+        logger.info(f"Run ID: {run_id}")
+        logger.info(f"Total Number of Listings: {vehicle_results.get('total_listings', 0)}")
+        logger.info(f"Total Listings Processed: {vehicle_results.get('processed_listings', 0)}")
+        logger.info(f"Total Vehicles Scraped: {vehicle_results.get('success_listings', 0)}")
+        logger.info(f"Total Vehicles Failed: {vehicle_results.get('failed_listings', 0)}")
+
+    # orchestration flow
+    task_run_id = prepare_run()
+    brands = get_brands()
+    # brand volumes are read from the listings table, which prepare_run creates
+    task_run_id >> brands
+
+    # map listings tasks over shards of brands
+    listings_stats = process_listings.partial(task_run_id=task_run_id).expand(brand_dicts=brands)
+
+    # process vehicles after listings are done
+    vehicle_results = process_vehicles(task_run_id=task_run_id, listing_results=listings_stats)
+
+    # summarize run
+    summarize_run(vehicle_results)
+
+
+# instantiate the DAG
+carscout_pipeline()
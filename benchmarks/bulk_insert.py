@@ -0,0 +1,138 @@
+"""
+Compares rows/sec of inserting listings and vehicles one by one (`add`, one transaction and
+one SELECT per row) with batched inserts (`add_many`, one executemany per batch), and of
+re-saving stored vehicles in a refresh run one by one (`save_vehicle`, a lookup and an update
+per row) with batched upserts (`upsert_many`, one `ON CONFLICT DO UPDATE` per batch).
+
+Rows are written to a fresh SQLite database file in a temporary directory, so every commit
+is synced to disk like in the pipeline.
+
+Usage:
+    python -m benchmarks.bulk_insert --rows 2000 --batch-size 500
+"""
+
+import argparse
+import tempfile
+import time
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+
+from more_itertools import chunked
+
+from core.entities.listing import Listing
+from core.entities.vehicle import Vehicle
+from core.services.vehicle_service import VehicleService
+from infra.db.models.base import Base
+from infra.db.repositories.listings import SqlAlchemyListingRepository
+from infra.db.repositories.vehicles import SqlAlchemyVehicleRepository
+from infra.db.service import DatabaseService
+
+
+def make_listings(rows: int) -> list[Listing]:
+    visited_at = datetime.now()
+    return [
+        Listing(
+            id=str(1_000_000 + idx),
+            url=f"https://olx.ba/artikal/{1_000_000 + idx}",
+            title=f"Car {idx}",
+            price=f"{10 + idx % 90}.500 KM",
+            visited_at=visited_at,
+            run_id="benchmark",
+            brand_id=str(idx % 40),
+        )
+        for idx in range(rows)
+    ]
+
+
+def make_vehicles(rows: int) -> list[Vehicle]:
+    visited_at = datetime.now()
+    return [
+        Vehicle(
+            id=str(1_000_000 + idx),
+            url=f"https://olx.ba/artikal/{1_000_000 + idx}",
+            title=f"Car {idx}",
+            price=f"{10 + idx % 90}.500 KM",
+            last_visited_at=visited_at,
+            brand="BMW",
+            model="320d",
+            fuel_type="Dizel",
+            build_year=2010 + idx % 15,
+            engine_power=110,
+        )
+        for idx in range(rows)
+    ]
+
+
+def measure(write, rows: list, directory: Path, name: str, stored: list | None = None) -> float:
+    db_service = DatabaseService(f"sqlite:///{directory / name}.db")
+    Base.metadata.create_all(db_service.engine)
+    try:
+        if stored:
+            SqlAlchemyVehicleRepository(db_service).add_many(stored)
+        start = time.perf_counter()
+        write(db_service, rows)
+        return len(rows) / (time.perf_counter() - start)
+    finally:
+        db_service.engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    def one_by_one(repository):
+        def write(db_service, rows):
+            repo = repository(db_service)
+            for row in rows:
+                repo.add(row)
+
+        return write
+
+    def batched(repository):
+        def write(db_service, rows):
+            repo = repository(db_service)
+            for batch in chunked(rows, args.batch_size):
+                repo.add_many(batch)
+
+        return write
+
+    def save_one_by_one(db_service, rows):
+        service = VehicleService(SqlAlchemyVehicleRepository(db_service))
+        for row in rows:
+            service.save_vehicle(row)
+
+    def upsert_batched(db_service, rows):
+        repo = SqlAlchemyVehicleRepository(db_service)
+        for batch in chunked(rows, args.batch_size):
+            repo.upsert_many(batch)
+
+    print(f"{'table':<10} {'method':<12} {'rows/sec':>10} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for table, repository, rows in (
+            ("listings", SqlAlchemyListingRepository, make_listings(args.rows)),
+            ("vehicles", SqlAlchemyVehicleRepository, make_vehicles(args.rows)),
+        ):
+            baseline = None
+            for method, write in (("add", one_by_one), ("add_many", batched)):
+                rate = measure(write(repository), rows, Path(directory), f"{table}_{method}")
+                baseline = baseline or rate
+                print(f"{table:<10} {method:<12} {rate:>10.0f} {rate / baseline:>7.1f}x")
+
+        # a refresh run re-saves stored vehicles, every other one with a new price
+        stored = make_vehicles(args.rows)
+        rows = [
+            replace(vehicle, price="1.000 KM") if idx % 2 else vehicle
+            for idx, vehicle in enumerate(make_vehicles(args.rows))
+        ]
+        baseline = None
+        for method, write in (("save_vehicle", save_one_by_one), ("upsert_many", upsert_batched)):
+            rate = measure(write, rows, Path(directory), f"refresh_{method}", stored=stored)
+            baseline = baseline or rate
+            print(f"{'refresh':<10} {method:<12} {rate:>10.0f} {rate / baseline:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Compares the equipment flags of vehicles stored as one text column per flag with the packed
+`features_mask` and `features_known` columns: the bytes they take per row and the time of a
+"has all of these features" query over the vehicles table.
+
+The flags text columns are filtered with one comparison per feature, the masks with a single
+bitwise predicate. Both queries are checked to count the same vehicles. The vehicles table
+keeps the text columns next to the masks, which only back the equipment index and filters,
+so stored rows grow by the packed size rather than shrink to it.
+
+Usage:
+    python -m benchmarks.feature_flags --rows 50000 --repeat 20
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+from more_itertools import chunked
+from sqlalchemy import BigInteger, Column, Integer, MetaData, String, Table, and_, func, select
+
+from benchmarks.bulk_insert import make_vehicles
+from core.entities.vehicle import FEATURES, feature_mask
+from infra.db.models.base import Base
+from infra.db.models.vehicle import VehicleModel
+from infra.db.repositories.vehicles import SqlAlchemyVehicleRepository
+from infra.db.service import DatabaseService
+
+QUERY = ["navigation", "car_play", "seat_heating"]
+
+
+def random_flags(rng: random.Random) -> dict:
+    # most flags are listed by most sellers, a few are left out
+    return {feature: rng.random() < 0.4 if rng.random() < 0.9 else None for feature in FEATURES}
+
+
+def bytes_per_row(db_service: DatabaseService, vehicles: list) -> dict[str, float]:
+    """Payload bytes per row of tables holding only the flags, in each representation."""
+    metadata = MetaData()
+    text = Table(
+        "flags_text",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        *(Column(feature, String) for feature in FEATURES),
+    )
+    packed = Table(
+        "flags_packed",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("features_mask", BigInteger),
+        Column("features_known", BigInteger),
+    )
+    metadata.create_all(db_service.engine)
+    with db_service.engine.begin() as connection:
+        connection.execute(text.insert(), [{f: getattr(v, f) for f in FEATURES} for v in vehicles])
+        connection.execute(
+            packed.insert(),
+            [
+                {"features_mask": v.features_mask, "features_known": v.features_known}
+                for v in vehicles
+            ],
+        )
+        return {
+            name: connection.exec_driver_sql(
+                "SELECT sum(payload) FROM dbstat WHERE name = ? AND pagetype = 'leaf'", (name,)
+            ).scalar()
+            / len(vehicles)
+            for name in ("flags_text", "flags_packed")
+        }
+
+
+def timed(run, repeat: int) -> tuple[float, int]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        count = run()
+    return (time.perf_counter() - start) / repeat, count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vehicles = [replace(vehicle, **random_flags(rng)) for vehicle in make_vehicles(args.rows)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_service = DatabaseService(f"sqlite:///{Path(directory) / 'features.db'}")
+        Base.metadata.create_all(db_service.engine)
+        repo = SqlAlchemyVehicleRepository(db_service)
+        for batch in chunked(vehicles, 5000):
+            repo.add_many(batch)
+
+        sizes = bytes_per_row(db_service, vehicles)
+
+        mask = feature_mask(QUERY)
+        text_query = select(func.count()).where(
+            and_(*(getattr(VehicleModel, feature) == "1" for feature in QUERY))
+        )
+        mask_query = select(func.count()).where(VehicleModel.features_mask.op("&")(mask) == mask)
+        with db_service.engine.connect() as connection:
+            text_seconds, text_count = timed(
+                lambda: connection.execute(text_query).scalar(), args.repeat
+            )
+            mask_seconds, mask_count = timed(
+                lambda: connection.execute(mask_query).scalar(), args.repeat
+            )
+        assert text_count == mask_count, "flag columns and masks match different vehicles"
+        search_seconds, _ = timed(lambda: repo.search(features=QUERY, limit=50)[1], args.repeat)
+        db_service.engine.dispose()
+
+    print(f"{len(QUERY)} features, {mask_count} of {args.rows} vehicles match")
+    print(f"{'flags':<8} {'bytes/row':>10} {'count ms':>9} {'speedup':>8}")
+    print(f"{'text':<8} {sizes['flags_text']:>10.1f} {text_seconds * 1000:>9.1f} {1:>7.1f}x")
+    print(
+        f"{'packed':<8} {sizes['flags_packed']:>10.1f} {mask_seconds * 1000:>9.1f} "
+        f"{text_seconds / mask_seconds:>7.1f}x"
+    )
+    print(f"search(features=...) with a page of 50: {search_seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Compares pages/sec of the webdriver (rendered search pages, parsed from the page source or
+extracted by a script inside the browser) and api (json search endpoint) listing discovery
+engines.
+
+Both engines run against a local mock of the search page and of `/api/search`, serving the
+same generated listings after a fixed latency. The webdriver engine needs a local Chrome or
+Chromium with chromedriver and is skipped when none can be started. Parsing alone (without
+any network or browser) is measured for both engines as well.
+
+Usage:
+    python -m benchmarks.listing_scraper --pages 20 --listings-per-page 40 --latency 0.05
+"""
+
+import argparse
+import json
+import logging
+import time
+import timeit
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.mock_api import serve
+from core.entities.brand import Brand
+from infra.factory.clients.http import ClientType, HttpClientFactory
+from infra.factory.logger import LoggerFactory
+from infra.factory.webdriver import WebdriverFactory
+from infra.scraping.api_listing_scraper import ApiListingScraper
+from infra.scraping.listing_scraper import ListingScraper
+
+CHROME_OPTIONS = ["--headless=new", "--no-sandbox", "--disable-dev-shm-usage"]
+
+
+class NoCookieProvider:
+    def provide(self, url: str) -> list[dict]:
+        return []
+
+    def invalidate(self, url: str) -> None:
+        pass
+
+
+def make_items(page: int, per_page: int) -> list[dict]:
+    return [
+        {
+            "id": page * 100_000 + idx,
+            "title": f"Car {page}-{idx}",
+            "display_price": f"{10 + idx}.500 KM",
+        }
+        for idx in range(per_page)
+    ]
+
+
+def render_html(page: int, pages: int, per_page: int) -> bytes:
+    cards = "".join(
+        f'<div class="card"><a href="/artikal/{item["id"]}">'
+        f'<h1 class="main-heading">{item["title"]}</h1>'
+        f'<div class="price-wrap"><span class="smaller">{item["display_price"]}</span></div>'
+        "</a></div>"
+        for item in make_items(page, per_page)
+    )
+    items = "".join(
+        f'<li class="active">{p}</li>' if p == page else f"<li>{p}</li>"
+        for p in range(1, pages + 1)
+    )
+    pagination = f'<div class="olx-pagination-wrapper"><ul>{items}</ul></div>'
+    return f"<html><body>{cards}{pagination}</body></html>".encode()
+
+
+def render_json(page: int, pages: int, per_page: int) -> bytes:
+    payload = {
+        "data": make_items(page, per_page),
+        "meta": {"current_page": page, "last_page": pages},
+    }
+    return json.dumps(payload).encode()
+
+
+def measure(scraper, brand: Brand, pages: int) -> float:
+    start = time.perf_counter()
+    scraped = sum(1 for _ in scraper.run(brand))
+    elapsed = time.perf_counter() - start
+    assert scraped > 0, "no listings scraped"
+    return pages / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--listings-per-page", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    def page_of(path: str) -> int:
+        return int(parse_qs(urlsplit(path).query)["page"][0])
+
+    routes = {
+        "/pretraga": lambda path: (
+            200,
+            "text/html",
+            render_html(page_of(path), args.pages, args.listings_per_page),
+        ),
+        "/api/search": lambda path: (
+            200,
+            "application/json",
+            render_json(page_of(path), args.pages, args.listings_per_page),
+        ),
+    }
+    logger_factory = LoggerFactory(format_str="%(message)s", log_level=logging.WARNING)
+    brand = Brand(id="1", name="Car", slug="car")
+
+    print(f"{'engine':<10} {'pages/sec':>10} {'parse-only pages/sec':>21}")
+    with serve(routes, latency=args.latency) as base_url:
+        webdriver_scraper = ListingScraper(
+            logger_factory=logger_factory,
+            webdriver_factory=WebdriverFactory(
+                chrome_options=CHROME_OPTIONS,
+                use_stealth=False,
+                logger_factory=logger_factory,
+            ),
+            base_url=base_url,
+        )
+        script_scraper = ListingScraper(
+            logger_factory=logger_factory,
+            webdriver_factory=WebdriverFactory(
+                chrome_options=CHROME_OPTIONS,
+                use_stealth=False,
+                logger_factory=logger_factory,
+            ),
+            base_url=base_url,
+            extraction="script",
+        )
+        api_scraper = ApiListingScraper(
+            logger_factory=logger_factory,
+            http_client_factory=HttpClientFactory(
+                url=base_url,
+                headers={},
+                logger_factory=logger_factory,
+                cookie_provider=NoCookieProvider(),
+                client_type=ClientType.REQUESTS,
+            ),
+            base_url=base_url,
+        )
+
+        html = render_html(1, args.pages, args.listings_per_page).decode()
+        body = render_json(1, args.pages, args.listings_per_page)
+
+        def parse_html():
+            webdriver_scraper._page_parser.parse(html)
+
+        def parse_json():
+            api_scraper._page_parser.parse_search_results(json.loads(body))
+
+        for name, scraper, parse in (
+            ("webdriver", webdriver_scraper, parse_html),
+            ("script", script_scraper, None),  # parsed inside the browser
+            ("api", api_scraper, parse_json),
+        ):
+            parse_rate = (
+                f"{200 / min(timeit.repeat(parse, number=200, repeat=3)):>21.1f}"
+                if parse
+                else f"{'-':>21}"
+            )
+            try:
+                rate = f"{measure(scraper, brand, args.pages):>10.1f}"
+            except AssertionError:
+                rate = f"{'skipped':>10}"  # no browser available
+            print(f"{name:<10} {rate} {parse_rate}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import json
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# route handler: receives the request path and returns (status, content_type, body)
+Route = Callable[[str], tuple[int, str, bytes]]
+
+
+def load_fixture(name: str) -> bytes:
+    return (FIXTURES_DIR / name).read_bytes()
+
+
+@contextmanager
+def serve(routes: dict[str, Route], latency: float = 0.0) -> Iterator[str]:
+    """
+    Runs a threaded HTTP server on a free localhost port and yields its base url.
+
+    Requests are dispatched to the first route whose prefix matches the request path.
+    Every response is delayed by `latency` seconds to emulate a remote server.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if latency:
+                time.sleep(latency)
+            for prefix, route in routes.items():
+                if self.path.startswith(prefix):
+                    status, content_type, body = route(self.path)
+                    break
+            else:
+                status, content_type, body = 404, "application/json", b"{}"
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def json_route(payload: dict | list) -> Route:
+    body = json.dumps(payload).encode()
+    return lambda path: (200, "application/json", body)
@@ -0,0 +1,138 @@
+"""
+Compares bytes transferred and load time per search page with and without request blocking.
+
+By default pages are served by a local mock of the search page which, like olx.ba, pulls in
+a stylesheet, a web font, card images and an analytics script. Real search pages can be
+measured by passing `--url`. The blocked url patterns are taken from
+`infra/configs/local.yml`, the resource types to try blocking from `--resource-types`. The
+browser cache is disabled so every load transfers the page again. Needs a local Chrome or
+Chromium with chromedriver and is skipped when none can be started.
+
+Usage:
+    python -m benchmarks.page_weight --pages 10 [--url "https://olx.ba/pretraga?..."]
+        [--resource-types image font stylesheet media]
+"""
+
+import argparse
+import logging
+import statistics
+from dataclasses import dataclass
+
+import yaml
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+from benchmarks.mock_api import load_fixture, serve
+from infra.factory.logger import LoggerFactory
+from infra.factory.webdriver import RESOURCE_TYPE_PATTERNS, WebdriverFactory
+from infra.settings import PROJECT_ROOT
+
+CHROME_OPTIONS = ["--headless=new", "--no-sandbox", "--disable-dev-shm-usage"]
+
+STYLESHEET = (
+    b"@font-face{font-family:Inter;src:url(/fonts/inter.woff2) format('woff2')}"
+    b"body{font-family:Inter}" + b".card{display:flex;margin:0 auto;padding:4px}" * 2000
+)
+ASSETS = '<script src="/analytics/googletagmanager.com/gtm.js"></script></head>'
+
+# transfer sizes are 0 for blocked requests and for responses served from the cache
+_PAGE_WEIGHT_SCRIPT = """
+const [navigation] = performance.getEntriesByType("navigation");
+const resources = performance.getEntriesByType("resource");
+return {
+    bytes: resources.reduce((total, entry) => total + entry.transferSize,
+                            navigation ? navigation.transferSize : 0),
+    requests: resources.length + 1,
+    load_ms: navigation ? navigation.loadEventEnd - navigation.startTime : 0,
+};
+"""
+
+
+@dataclass
+class PageWeight:
+    bytes: int
+    requests: int
+    load_ms: float
+
+
+def measure_page_weight(driver: webdriver.Chrome) -> PageWeight:
+    """Returns the bytes transferred and the load time of the page loaded by the driver."""
+    result = driver.execute_script(_PAGE_WEIGHT_SCRIPT)
+    return PageWeight(
+        bytes=int(result["bytes"]),
+        requests=int(result["requests"]),
+        load_ms=float(result["load_ms"]),
+    )
+
+
+def mock_routes() -> dict:
+    page = load_fixture("search_page.html").decode()
+    page = page.replace("https://cdn.olx.ba", "").replace("</head>", ASSETS, 1)
+    return {
+        "/pretraga": lambda path: (200, "text/html; charset=utf-8", page.encode()),
+        "/_nuxt/app.css": lambda path: (200, "text/css", STYLESHEET),
+        "/_nuxt/": lambda path: (200, "application/javascript", b"void 0;" * 20000),
+        "/fonts/": lambda path: (200, "font/woff2", bytes(90_000)),
+        "/img/": lambda path: (200, "image/jpeg", bytes(25_000)),
+        "/analytics/": lambda path: (200, "application/javascript", b"void 0;" * 12000),
+    }
+
+
+def load_pages(factory: WebdriverFactory, url: str, pages: int) -> list[PageWeight]:
+    driver = factory.create()
+    try:
+        driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+        weights = []
+        for _ in range(pages):
+            driver.get(url)
+            weights.append(measure_page_weight(driver))
+        return weights
+    finally:
+        driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--url", default=None)
+    parser.add_argument(
+        "--resource-types",
+        nargs="*",
+        choices=list(RESOURCE_TYPE_PATTERNS),
+        default=list(RESOURCE_TYPE_PATTERNS),
+    )
+    args = parser.parse_args()
+
+    with open(PROJECT_ROOT / "infra" / "configs" / "local.yml") as file:
+        blocking = yaml.safe_load(file)["webdriver"]["blocking"]
+    logger_factory = LoggerFactory(format_str="%(message)s", log_level=logging.WARNING)
+
+    print(f"{'blocking':<11} {'KiB/page':>9} {'requests':>9} {'load ms':>8}")
+    with serve(mock_routes()) as base_url:
+        url = args.url or f"{base_url}/pretraga?category_id=18&brand=1&page=1"
+        for name, blocked_urls, resource_types in (
+            ("off", [], []),
+            ("urls", blocking["url_patterns"], []),
+            ("urls+types", blocking["url_patterns"], args.resource_types),
+        ):
+            factory = WebdriverFactory(
+                chrome_options=CHROME_OPTIONS,
+                use_stealth=False,
+                logger_factory=logger_factory,
+                blocked_urls=blocked_urls,
+                blocked_resource_types=resource_types,
+            )
+            try:
+                weights = load_pages(factory, url, args.pages)
+            except WebDriverException:
+                print(f"{name:<11} {'skipped':>9}")  # no browser available
+                continue
+            print(
+                f"{name:<11} {statistics.mean(w.bytes for w in weights) / 1024:>9.1f} "
+                f"{statistics.mean(w.requests for w in weights):>9.1f} "
+                f"{statistics.median(w.load_ms for w in weights):>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
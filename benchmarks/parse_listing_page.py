@@ -0,0 +1,106 @@
+"""
+Compares the single-tree listing page parser with the previous implementation of
+`ListingScraper._extract_listings` and `_get_next_page`, which parsed the page twice, serialized
+every card and the pagination with `.getall()`/`.get()` and parsed each of them again.
+
+Reports the parse time per page and the peak memory traced (by tracemalloc) while parsing a
+page. Pages default to the saved search page in `benchmarks/fixtures`; saved olx.ba search
+pages can be passed instead.
+
+Usage:
+    python -m benchmarks.parse_listing_page --iterations 200 [page.html ...]
+"""
+
+import argparse
+import timeit
+import tracemalloc
+from pathlib import Path
+
+from scrapy import Selector
+
+from benchmarks.mock_api import FIXTURES_DIR
+from infra.scraping.listing_page import ListingPageParser
+
+BASE_URL = "https://olx.ba"
+
+
+def legacy_extract_listings(page_source: str) -> list[tuple[str, str, str, str]]:
+    page_selector = Selector(text=page_source)
+    listing_cards = page_selector.xpath("//a[starts-with(@href, '/artikal/')]").getall()
+    listings = []
+    for card in listing_cards:
+        card_selector = Selector(text=card)
+        url_suffix = card_selector.xpath("//@href").get().strip()
+        listing_url = f"{BASE_URL}{url_suffix}"
+        title_selector = "//h1[contains(@class, 'main-heading')]/text()"
+        price_selector = (
+            "//div[contains(@class, 'price-wrap')]//span[contains(@class, 'smaller')]/text()"
+        )
+        listings.append(
+            (
+                listing_url.split("/")[-1],
+                listing_url,
+                card_selector.xpath(title_selector).get().strip(),
+                card_selector.xpath(price_selector).get().strip(),
+            )
+        )
+    return listings
+
+
+def legacy_get_next_page(page_source: str) -> str | None:
+    selector = Selector(text=page_source)
+    pagination_item = selector.xpath("//div[@class='olx-pagination-wrapper']").get()
+    if not pagination_item:
+        return None
+    next_page_selector = "normalize-space(//li[@class='active']/following-sibling::li[1]/text())"
+    return Selector(text=pagination_item).xpath(next_page_selector).get() or None
+
+
+def legacy_parse(page_source: str):
+    return legacy_extract_listings(page_source), legacy_get_next_page(page_source)
+
+
+def peak_kib(parse, page_source: str) -> float:
+    parse(page_source)  # warm up caches outside of the traced run
+    tracemalloc.start()
+    try:
+        parse(page_source)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("pages", nargs="*", type=Path)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    pages = args.pages or [FIXTURES_DIR / "search_page.html"]
+    page_parser = ListingPageParser(BASE_URL)
+
+    print(f"{'page':<24} {'implementation':<15} {'ms/page':>8} {'peak KiB':>9} {'speedup':>8}")
+    for path in pages:
+        page_source = path.read_text(encoding="utf-8")
+
+        page = page_parser.parse(page_source)
+        legacy_listings, legacy_next_page = legacy_parse(page_source)
+        assert [(x.id, x.url, x.title, x.price) for x in page.listings] == legacy_listings
+        assert page.next_page == legacy_next_page
+
+        timings = {}
+        for implementation, parse in (("legacy", legacy_parse), ("single-tree", page_parser.parse)):
+            elapsed = min(
+                timeit.repeat(lambda: parse(page_source), number=args.iterations, repeat=5)  # noqa: B023
+            )
+            timings[implementation] = elapsed / args.iterations * 1000
+            speedup = timings["legacy"] / timings[implementation]
+            print(
+                f"{path.name:<24} {implementation:<15} {timings[implementation]:>8.2f} "
+                f"{peak_kib(parse, page_source):>9.0f} {speedup:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
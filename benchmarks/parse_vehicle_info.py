@@ -0,0 +1,97 @@
+"""
+Compares the parse throughput of the compiled attribute extractor with the previous
+implementation of `VehicleScraper._parse_vehicle_info`, which rebuilt a label lookup for
+every response, looked up every known label in it and coerced values with the previous
+`get_attribute_value`.
+
+Payloads are derived from a recorded api response: `full` carries every attribute, `sparse`
+only the first few, like listings of older or less detailed vehicles.
+
+Usage:
+    python -m benchmarks.parse_vehicle_info --iterations 20000
+"""
+
+import argparse
+import json
+import logging
+import timeit
+
+from more_itertools import first
+
+from benchmarks.mock_api import load_fixture
+from infra.factory.logger import LoggerFactory
+from infra.scraping.vehicle_scraper import VEHICLE_ATTRIBUTES, VehicleScraper
+
+# label -> field pairs in the order the previous implementation looked them up
+LABELS = [(label, field) for label, (field, _) in VEHICLE_ATTRIBUTES._mappings.items()]
+
+
+def legacy_get_attribute_value(attribute: dict):
+    if not attribute:
+        return None
+    value = attribute.get("value")
+    dtype = attribute.get("type")
+    if not dtype or not value:
+        return value
+    if dtype == "number":
+        return str(value).strip()
+    elif dtype == "string":
+        if value.strip() in ("true", "false"):
+            return {"true": True, "false": False}.get(value.strip())
+    return value.strip()
+
+
+def legacy_parse_vehicle_info(vehicle_data: dict) -> dict:
+    attributes = vehicle_data.get("attributes") or {}
+    attributes = {attr["name"]: attr for attr in attributes}
+    result = {
+        "location": (first(vehicle_data.get("cities") or [], default=None) or {}).get("name"),
+        "state": vehicle_data.get("state"),
+        "brand": (vehicle_data.get("brand") or {}).get("name"),
+        "model": (vehicle_data.get("model") or {}).get("name"),
+        "image_url": first(vehicle_data.get("images") or [], default=None),
+    }
+    for label, field in LABELS:
+        result[field] = legacy_get_attribute_value(attributes.get(label) or {})
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--sparse-attributes", type=int, default=10)
+    args = parser.parse_args()
+
+    full = json.loads(load_fixture("vehicle_payload.json"))
+    payloads = {
+        "full": full,
+        "sparse": {**full, "attributes": full["attributes"][: args.sparse_attributes]},
+    }
+    scraper = VehicleScraper(
+        logger_factory=LoggerFactory(format_str="%(message)s", log_level=logging.WARNING),
+        http_client_factory=None,
+    )
+
+    print(f"{'payload':<8} {'implementation':<15} {'parses/sec':>12} {'speedup':>8}")
+    for name, payload in payloads.items():
+        # both implementations agree on every field present in the payload
+        compiled = scraper._parse_vehicle_info(payload)
+        legacy = legacy_parse_vehicle_info(payload)
+        assert compiled == {k: v for k, v in legacy.items() if k in compiled}
+        assert all(v is None for k, v in legacy.items() if k not in compiled)
+
+        rates = {}
+        for implementation, parse in (
+            ("legacy", legacy_parse_vehicle_info),
+            ("compiled", scraper._parse_vehicle_info),
+        ):
+            elapsed = min(
+                timeit.repeat(lambda: parse(payload), number=args.iterations, repeat=5)  # noqa: B023
+            )
+            rates[implementation] = args.iterations / elapsed
+            speedup = rates[implementation] / rates["legacy"]
+            print(f"{name:<8} {implementation:<15} {rates[implementation]:>12.0f} {speedup:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Compares the per-page wait of the listing scraper's readiness strategies and page load
+strategies: how long a search page takes from being requested until it can be read.
+
+Pages are served by a local mock of the search page whose card images and analytics script
+are slow to load, like third party content on olx.ba. Listings are checked to match across
+all strategies. Needs a local Chrome or Chromium with chromedriver and is skipped when none
+can be started.
+
+Usage:
+    python -m benchmarks.readiness --pages 10 --asset-latency 0.5
+"""
+
+import argparse
+import logging
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+from benchmarks.mock_api import load_fixture, serve
+from infra.factory.logger import LoggerFactory
+from infra.factory.webdriver import WebdriverFactory
+from infra.scraping.listing_scraper import ListingScraper
+
+CHROME_OPTIONS = ["--headless=new", "--no-sandbox", "--disable-dev-shm-usage"]
+ASSETS = '<script src="/analytics/gtm.js"></script></head>'
+
+STRATEGIES = [
+    ("normal", "load"),
+    ("eager", "load"),
+    ("eager", "cards"),
+    ("eager", "pagination"),
+    ("eager", "network_idle"),
+]
+
+
+def mock_routes(asset_latency: float) -> dict:
+    page = load_fixture("search_page.html").decode()
+    page = page.replace("https://cdn.olx.ba", "").replace("</head>", ASSETS, 1)
+
+    def slow(content_type: str, body: bytes):
+        def route(path: str):
+            time.sleep(asset_latency)
+            return 200, content_type, body
+
+        return route
+
+    return {
+        "/pretraga": lambda path: (200, "text/html; charset=utf-8", page.encode()),
+        "/img/": slow("image/jpeg", bytes(25_000)),
+        "/analytics/": slow("application/javascript", b"void 0;"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--asset-latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    logger_factory = LoggerFactory(format_str="%(message)s", log_level=logging.WARNING)
+
+    print(f"{'page load':<10} {'readiness':<13} {'mean ms':>8} {'p95 ms':>8} {'listings':>9}")
+    expected = None
+    with serve(mock_routes(args.asset_latency)) as base_url:
+        url = f"{base_url}/pretraga?category_id=18&brand=1&page=1"
+        for page_load_strategy, readiness in STRATEGIES:
+            scraper = ListingScraper(
+                logger_factory=logger_factory,
+                webdriver_factory=WebdriverFactory(
+                    chrome_options=CHROME_OPTIONS,
+                    use_stealth=False,
+                    logger_factory=logger_factory,
+                    page_load_strategy=page_load_strategy,
+                ),
+                base_url=base_url,
+                readiness=readiness,
+            )
+            try:
+                driver = scraper._webdriver_factory.create()
+            except WebDriverException:
+                print(f"{page_load_strategy:<10} {readiness:<13} {'skipped':>8}")  # no browser
+                continue
+            try:
+                listings = [scraper._get_page(url, driver).listings for _ in range(args.pages)]
+            finally:
+                driver.quit()
+            ids = [[listing.id for listing in page] for page in listings]
+            expected = expected or ids[0]
+            assert all(page == expected for page in ids), "listings differ between strategies"
+            waits = scraper.page_waits
+            print(
+                f"{page_load_strategy:<10} {readiness:<13} {waits.mean_seconds * 1000:>8.1f} "
+                f"{waits.p95_seconds * 1000:>8.1f} {len(expected):>9}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Compares insert and read throughput of a shared SQLite database file with the default
+connection settings and with the tuned PRAGMA profile of `DatabaseSettings.sqlite`, while
+writers and the dashboard use the database at the same time.
+
+Writer processes insert batches of listings (like the listing tasks of the pipeline) while
+reader processes run the paginated listing search of the dashboard, for a fixed duration.
+Failed operations ("database is locked") are counted and skipped.
+
+Usage:
+    python -m benchmarks.sqlite_profile --seconds 10 --writers 2 --readers 2
+"""
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+from more_itertools import chunked
+from sqlalchemy.exc import OperationalError
+
+from benchmarks.bulk_insert import make_listings
+from infra.db.models.base import Base
+from infra.db.repositories.listings import SqlAlchemyListingRepository
+from infra.db.service import DatabaseService
+from infra.settings import SqliteSettings
+
+PROFILES = {
+    "default": {},
+    "tuned": SqliteSettings().model_dump(),
+}
+
+
+def write(url: str, pragmas: dict, seconds: float, batch_size: int, worker: int, results):
+    repo = SqlAlchemyListingRepository(DatabaseService(url, sqlite_pragmas=pragmas))
+    rows = errors = 0
+    deadline = time.monotonic() + seconds
+    batch = make_listings(batch_size)
+    for listing in batch:
+        listing.run_id = f"writer-{worker}"
+    while time.monotonic() < deadline:
+        try:
+            rows += repo.add_many(batch)
+        except OperationalError:
+            errors += 1
+    results.put(("write", rows, errors))
+
+
+def read(url: str, pragmas: dict, seconds: float, worker: int, results):
+    repo = SqlAlchemyListingRepository(DatabaseService(url, sqlite_pragmas=pragmas))
+    queries = errors = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        try:
+            repo.search(title="Car 1", offset=(queries % 10) * 50, limit=50)
+            repo.get_listings_per_run()
+            queries += 1
+        except OperationalError:
+            errors += 1
+    results.put(("read", queries, errors))
+
+
+def run_profile(name: str, pragmas: dict, args, directory: Path) -> dict:
+    url = f"sqlite:///{directory / name}.db"
+    db_service = DatabaseService(url, sqlite_pragmas=pragmas)
+    Base.metadata.create_all(db_service.engine)
+    # the dashboard reads a database that already holds a few runs
+    repo = SqlAlchemyListingRepository(db_service)
+    for batch in chunked(make_listings(args.seed_rows), 5000):
+        repo.add_many(batch)
+    db_service.engine.dispose()
+
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(
+            target=write, args=(url, pragmas, args.seconds, args.batch_size, idx, results)
+        )
+        for idx in range(args.writers)
+    ] + [
+        multiprocessing.Process(target=read, args=(url, pragmas, args.seconds, idx, results))
+        for idx in range(args.readers)
+    ]
+    for process in processes:
+        process.start()
+    totals = {"write": [0, 0], "read": [0, 0]}
+    for _ in processes:
+        kind, count, errors = results.get()
+        totals[kind][0] += count
+        totals[kind][1] += errors
+    for process in processes:
+        process.join()
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--seed-rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(
+        f"{'profile':<8} {'rows/sec':>9} {'write errors':>13} {'queries/sec':>12} "
+        f"{'read errors':>12}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for name, pragmas in PROFILES.items():
+            totals = run_profile(name, pragmas, args, Path(directory))
+            rows, write_errors = totals["write"]
+            queries, read_errors = totals["read"]
+            print(
+                f"{name:<8} {rows / args.seconds:>9.0f} {write_errors:>13} "
+                f"{queries / args.seconds:>12.1f} {read_errors:>12}"
+            )
+
+
+if __name__ == "__main__":
+    main()
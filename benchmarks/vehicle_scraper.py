@@ -0,0 +1,90 @@
+"""
+Compares vehicles/sec of the sequential and concurrent vehicle scraping engines.
+
+Both engines run against a local mock of the `/api/listings/{id}` endpoint that answers
+with a recorded payload after a fixed latency. The http clients are created without a rate
+limiter so that the numbers reflect the engines alone.
+
+Usage:
+    python -m benchmarks.vehicle_scraper --listings 200 --latency 0.05
+"""
+
+import argparse
+import logging
+import time
+
+from benchmarks.mock_api import load_fixture, serve
+from core.entities.listing import Listing
+from infra.factory.clients.http import ClientType, HttpClientFactory
+from infra.factory.logger import LoggerFactory
+from infra.scraping.async_vehicle_scraper import AsyncVehicleScraper
+from infra.scraping.vehicle_scraper import VehicleScraper
+
+
+class NoCookieProvider:
+    def provide(self, url: str) -> list[dict]:
+        return []
+
+    def invalidate(self, url: str) -> None:
+        pass
+
+
+def make_listings(n: int) -> list[Listing]:
+    return [
+        Listing(id=str(idx), url=f"https://olx.ba/artikal/{idx}", title="Car", price="1 KM")
+        for idx in range(n)
+    ]
+
+
+def measure(scraper: VehicleScraper, listings: list[Listing]) -> float:
+    start = time.perf_counter()
+    scraped = sum(1 for vehicle in scraper.run(listings) if vehicle is not None)
+    elapsed = time.perf_counter() - start
+    assert scraped == len(listings), f"expected {len(listings)} vehicles, got {scraped}"
+    return scraped / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--listings", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    payload = load_fixture("vehicle_payload.json")
+    listings = make_listings(args.listings)
+    logger_factory = LoggerFactory(format_str="%(message)s", log_level=logging.WARNING)
+
+    routes = {"/api/listings/": lambda path: (200, "application/json", payload)}
+    with serve(routes, latency=args.latency) as base_url:
+        http_client_factory = HttpClientFactory(
+            url=base_url,
+            headers={},
+            logger_factory=logger_factory,
+            cookie_provider=NoCookieProvider(),
+            client_type=ClientType.REQUESTS,
+        )
+
+        sequential = VehicleScraper(
+            logger_factory=logger_factory,
+            http_client_factory=http_client_factory,
+            reinit_session_every=args.listings + 1,
+            base_url=base_url,
+        )
+        print(f"{'engine':<12} {'concurrency':>11} {'vehicles/sec':>13}")
+        print(f"{'sequential':<12} {1:>11} {measure(sequential, listings):>13.1f}")
+
+        for concurrency in args.concurrency:
+            concurrent = AsyncVehicleScraper(
+                logger_factory=logger_factory,
+                http_client_factory=http_client_factory,
+                reinit_session_every=args.listings + 1,
+                concurrency=concurrency,
+                base_url=base_url,
+            )
+            rate = measure(concurrent, listings)
+            print(f"{'concurrent':<12} {concurrency:>11} {rate:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
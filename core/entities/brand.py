@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -11,3 +11,11 @@ class Brand:
         self.id = self.id.strip()
         self.name = self.name.strip()
         self.slug = self.slug.strip()
+
+
+@dataclass
+class BrandShard:
+    """A group of brands scraped by a single task, with the number of pages it should load."""
+
+    brands: list[Brand] = field(default_factory=list)
+    expected_pages: int = 0
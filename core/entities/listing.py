@@ -1,5 +1,7 @@
 import datetime
-from dataclasses import dataclass, fields
+from dataclasses import dataclass, field, fields
+
+from core.entities.price import Price
 
 
 @dataclass
@@ -10,6 +12,11 @@ class Listing:
     price: str
     visited_at: datetime.datetime | None = None
     run_id: str | None = None
+    brand_id: str | None = None
+
+    # parsed from the price
+    price_amount: int | None = field(default=None, init=False)
+    price_on_request: bool = field(default=False, init=False)
 
     def __post_init__(self):
         self.id = self.id.strip()
@@ -18,12 +25,16 @@ class Listing:
         self.price = self.price.strip()
         if self.run_id:
             self.run_id = self.run_id.strip()
+        if self.brand_id:
+            self.brand_id = self.brand_id.strip()
         if isinstance(self.visited_at, str):
             self.visited_at = datetime.datetime.fromisoformat(self.visited_at)
+        price = Price.parse(self.price)
+        self.price_amount, self.price_on_request = price.amount, price.on_request
 
     @classmethod
     def from_dict(cls, data: dict) -> "Listing":
-        field_names = {f.name for f in fields(cls)}
+        field_names = {f.name for f in fields(cls) if f.init}
         _d = {k: v for k, v in data.items() if k in field_names}
         return cls(**_d)
 
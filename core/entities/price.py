@@ -0,0 +1,32 @@
+import re
+from dataclasses import dataclass
+
+# shown instead of the price of listings without one
+PRICE_ON_REQUEST = "Na upit"
+
+_AMOUNT = re.compile(r"\d[\d.,\s]*")
+# cents after the last separator, e.g. "25.000,50 KM" (thousands are grouped by three)
+_CENTS = re.compile(r"[.,]\d{1,2}$")
+
+
+@dataclass(frozen=True)
+class Price:
+    """The amount of a displayed price, e.g. 25000 for "25.000 KM" or "25,000 KM"."""
+
+    amount: int | None = None
+    on_request: bool = False
+
+    @classmethod
+    def parse(cls, text: str | None) -> "Price":
+        """
+        Parses a price as shown on olx.ba. Cents are dropped. Prices on request and texts
+        without a number have no amount.
+        """
+        text = (text or "").strip()
+        if text.casefold() == PRICE_ON_REQUEST.casefold():
+            return cls(on_request=True)
+        match = _AMOUNT.search(text)
+        if match is None:
+            return cls()
+        digits = _CENTS.sub("", match.group().strip())
+        return cls(amount=int(re.sub(r"\D", "", digits)))
@@ -0,0 +1,20 @@
+import datetime
+from dataclasses import dataclass
+from enum import StrEnum
+
+from core.entities.listing import Listing
+
+
+class RefreshReason(StrEnum):
+    NEW = "new"
+    PRICE_CHANGED = "price_changed"
+    STALE = "stale"
+
+
+@dataclass
+class RefreshCandidate:
+    """A listing whose vehicle details have to be (re)scraped."""
+
+    listing: Listing
+    reason: RefreshReason
+    last_visited_at: datetime.datetime | None = None
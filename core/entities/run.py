@@ -23,6 +23,8 @@ class Run:
     vehicles_scraped: int = 0
     errors_count: int = 0
     last_error_message: str | None = None
+    request_rate: float | None = None
+    request_error_ratio: float | None = None
 
     def fail(self, error_message: str):
         self.status = RunStatus.FAILED
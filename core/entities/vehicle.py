@@ -1,5 +1,73 @@
 import datetime
-from dataclasses import dataclass, fields
+from collections.abc import Iterable
+from dataclasses import dataclass, field, fields
+
+from core.entities.price import Price
+
+# equipment flags packed into `Vehicle.features_mask`, bit i standing for FEATURES[i]; stored
+# masks depend on the positions, so new flags are only ever appended
+FEATURES = (
+    "registered",
+    "metallic",
+    "alloy_wheels",
+    "digital_air_conditioning",
+    "steering_wheel_controls",
+    "navigation",
+    "touch_screen",
+    "heads_up_display",
+    "usb_port",
+    "cruise_control",
+    "bluetooth",
+    "car_play",
+    "rain_sensor",
+    "park_assist",
+    "automatic_light_sensor",
+    "blind_spot_sensor",
+    "start_stop_system",
+    "hill_assist",
+    "seat_memory",
+    "seat_massage",
+    "seat_heating",
+    "seat_cooling",
+    "electric_windows",
+    "electric_seat_adjustment",
+    "armrest",
+    "panoramic_roof",
+    "sunroof",
+    "fog_lights",
+    "electric_mirrors",
+    "alarm",
+    "central_lock",
+    "remote_unlock",
+    "airbag",
+    "abs",
+    "electronic_stability",
+    "dpf_fap_filter",
+    "power_steering",
+    "turbo",
+    "isofix",
+    "tow_hook",
+    "customs_cleared",
+    "foreign_license_plates",
+    "on_lease",
+    "service_history",
+    "damaged",
+    "disabled_accessible",
+    "oldtimer",
+)
+
+# stored flags are read back as text
+_FLAG_VALUES = {"1": True, "true": True, "0": False, "false": False}
+
+
+def feature_mask(features: Iterable[str]) -> int:
+    """Returns the mask with the bits of the given equipment flags set."""
+    mask = 0
+    for feature in features:
+        if feature not in FEATURES:
+            raise ValueError(f"Unknown vehicle feature: {feature}")
+        mask |= 1 << FEATURES.index(feature)
+    return mask
 
 
 @dataclass
@@ -11,6 +79,10 @@ class Vehicle:
     price: str
     last_visited_at: datetime.datetime | None = None
 
+    # parsed from the price
+    price_amount: int | None = field(default=None, init=False)
+    price_on_request: bool = field(default=False, init=False)
+
     # basic vehicle information
     location: str | None = None
     state: str | None = None
@@ -99,11 +171,15 @@ class Vehicle:
     disabled_accessible: bool | None = None
     oldtimer: bool | None = None
 
+    # packed boolean fields: the flags that are set and the flags that are known at all
+    features_mask: int = field(default=0, init=False)
+    features_known: int = field(default=0, init=False)
+
     def __post_init__(self):
-        for field in fields(self):
-            value = getattr(self, field.name)
+        for f in fields(self):
+            value = getattr(self, f.name)
             if isinstance(value, str):
-                setattr(self, field.name, value.strip())
+                setattr(self, f.name, value.strip())
         if isinstance(self.build_year, str):
             self.build_year = int(self.build_year)
         if isinstance(self.engine_power, str):
@@ -118,10 +194,20 @@ class Vehicle:
             self.published_at = datetime.datetime.fromisoformat(self.published_at)
         if isinstance(self.last_visited_at, str):
             self.last_visited_at = datetime.datetime.fromisoformat(self.last_visited_at)
+        price = Price.parse(self.price)
+        self.price_amount, self.price_on_request = price.amount, price.on_request
+        self.features_mask = self.features_known = 0
+        for bit, feature in enumerate(FEATURES):
+            value = getattr(self, feature)
+            if isinstance(value, str):
+                value = _FLAG_VALUES.get(value.lower())
+            if value is not None:
+                self.features_known |= 1 << bit
+                self.features_mask |= bool(value) << bit
 
     @classmethod
     def from_dict(cls, data: dict) -> "Vehicle":
-        field_names = {f.name for f in fields(cls)}
+        field_names = {f.name for f in fields(cls) if f.init}
         _d = {k: v for k, v in data.items() if k in field_names}
         return cls(**_d)
 
@@ -0,0 +1,19 @@
+import datetime
+from dataclasses import dataclass
+
+
+@dataclass
+class BrandWatermark:
+    """The newest listing stored by the last complete listing crawl of a brand."""
+
+    brand_id: str
+    listing_id: str
+    run_id: str | None = None
+    updated_at: datetime.datetime | None = None
+
+    def covers(self, listing_id: str) -> bool:
+        """Whether the listing was published at or before the watermark (ids are sequential)."""
+        try:
+            return int(listing_id) <= int(self.listing_id)
+        except ValueError:
+            return False
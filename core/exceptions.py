@@ -4,3 +4,24 @@ class PageNotFoundError(Exception):
     def __init__(self, url: str):
         self.message = f"Page not found: {url}"
         super().__init__(self.message)
+
+
+class SessionRejectedError(Exception):
+    """Raised when the api rejects the session of an http client (401/403)."""
+
+    def __init__(self, url: str, status_code: int):
+        self.status_code = status_code
+        self.message = f"Session rejected ({status_code}): {url}"
+        super().__init__(self.message)
+
+
+class IncompleteCrawlError(Exception):
+    """
+    Raised by a listing scraper after the listings of the pages it could scrape, when the
+    crawl of a brand stopped before its last page.
+    """
+
+    def __init__(self, brand_id: str, reason: str):
+        self.brand_id = brand_id
+        self.message = f"Crawl of brand_id={brand_id} is incomplete: {reason}"
+        super().__init__(self.message)
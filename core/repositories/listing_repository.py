@@ -2,11 +2,14 @@ import datetime
 from typing import Protocol
 
 from core.entities.listing import Listing
+from core.entities.refresh import RefreshCandidate
 
 
 class ListingRepository(Protocol):
     def add(self, listing: Listing) -> Listing: ...
 
+    def add_many(self, listings: list[Listing]) -> int: ...
+
     def exists(self, id: str) -> bool: ...
 
     def find_latest(self, id: str) -> Listing | None: ...
@@ -17,6 +20,10 @@ class ListingRepository(Protocol):
 
     def find_without_vehicle_by_run_id(self, run_id: str) -> list[Listing]: ...
 
+    def find_refresh_candidates(
+        self, run_id: str, stale_before: datetime.datetime
+    ) -> list[RefreshCandidate]: ...
+
     def search_with_run_id(self, run_id: str) -> list[Listing]: ...
 
     def search(
@@ -32,4 +39,8 @@ class ListingRepository(Protocol):
         limit: int = 10,
     ) -> tuple[list[Listing], int]: ...
 
+    def find_recent_run_ids(self, limit: int = 5) -> list[str]: ...
+
+    def count_by_brand(self, run_ids: list[str]) -> dict[str, int]: ...
+
     def get_unique_run_ids(self) -> list[str]: ...
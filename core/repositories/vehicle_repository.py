@@ -1,4 +1,5 @@
 import datetime
+from collections.abc import Iterable
 from typing import Protocol
 
 from core.entities.vehicle import Vehicle
@@ -7,6 +8,12 @@ from core.entities.vehicle import Vehicle
 class VehicleRepository(Protocol):
     def add(self, vehicle: Vehicle) -> Vehicle: ...
 
+    def add_many(self, vehicles: list[Vehicle]) -> int: ...
+
+    def upsert_many(self, vehicles: list[Vehicle]) -> int: ...
+
+    def update(self, vehicle: Vehicle) -> Vehicle: ...
+
     def exists(self, id: str) -> bool: ...
 
     def get(self, id: str) -> Vehicle: ...
@@ -20,6 +27,8 @@ class VehicleRepository(Protocol):
         min_date: datetime.datetime | None = None,
         max_date: datetime.datetime | None = None,
         brand: str | None = None,
+        features: Iterable[str] | None = None,
+        without_features: Iterable[str] | None = None,
         offset: int = 0,
         limit: int = 10,
     ) -> tuple[list[Vehicle], int]: ...
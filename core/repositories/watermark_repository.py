@@ -0,0 +1,9 @@
+from typing import Protocol
+
+from core.entities.watermark import BrandWatermark
+
+
+class WatermarkRepository(Protocol):
+    def get(self, brand_id: str) -> BrandWatermark | None: ...
+
+    def save(self, watermark: BrandWatermark) -> BrandWatermark: ...
@@ -1,5 +1,9 @@
+import datetime
+
 from core.entities.listing import Listing
+from core.entities.refresh import RefreshCandidate
 from core.repositories.listing_repository import ListingRepository
+from core.services.refresh_policy import RefreshPolicy
 
 
 class ListingService:
@@ -13,9 +17,29 @@ class ListingService:
     def insert_listing(self, listing: Listing) -> Listing:
         return self.repo.add(listing)
 
+    def insert_listings(self, listings: list[Listing]) -> int:
+        """Inserts a batch of listings in one transaction, returns the number inserted."""
+        return self.repo.add_many(listings)
+
     def find_latest(self, listing_id: str) -> Listing | None:
         return self.repo.find_latest(listing_id)
 
     def search_last_ingested_listings(self) -> list[Listing]:
         latest_run_id = self.repo.find_latest_run()
         return self.repo.find_without_vehicle_by_run_id(latest_run_id)
+
+    def find_listings_to_scrape(
+        self, run_id: str, policy: RefreshPolicy, now: datetime.datetime | None = None
+    ) -> list[RefreshCandidate]:
+        """Selects the listings of a run whose vehicle details should be (re)scraped."""
+        now = now or datetime.datetime.now()
+        candidates = self.repo.find_refresh_candidates(run_id, policy.stale_before(now))
+        return policy.select(candidates)
+
+    def get_brand_volumes(self, lookback_runs: int = 5) -> dict[str, float]:
+        """Returns the average number of listings per run of every brand over the recent runs."""
+        run_ids = self.repo.find_recent_run_ids(lookback_runs)
+        if not run_ids:
+            return {}
+        counts = self.repo.count_by_brand(run_ids)
+        return {brand_id: count / len(run_ids) for brand_id, count in counts.items()}
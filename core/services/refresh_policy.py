@@ -0,0 +1,39 @@
+import datetime
+
+from core.entities.refresh import RefreshCandidate, RefreshReason
+
+
+class RefreshPolicy:
+    """
+    Decides which listings get their vehicle details scraped in a run.
+
+    Listings without a vehicle come first, followed by listings whose price changed since the
+    vehicle was last visited and finally vehicles not visited for longer than `ttl`, oldest
+    first. At most `budget` listings are selected per run (no limit when `None`).
+    """
+
+    PRIORITIES = {
+        RefreshReason.NEW: 0,
+        RefreshReason.PRICE_CHANGED: 1,
+        RefreshReason.STALE: 2,
+    }
+
+    def __init__(self, ttl: datetime.timedelta, budget: int | None = None):
+        if budget is not None and budget < 0:
+            raise ValueError(f"budget must not be negative, got {budget}")
+        self.ttl = ttl
+        self.budget = budget
+
+    def stale_before(self, now: datetime.datetime) -> datetime.datetime:
+        return now - self.ttl
+
+    def select(self, candidates: list[RefreshCandidate]) -> list[RefreshCandidate]:
+        ordered = sorted(
+            candidates,
+            key=lambda c: (
+                self.PRIORITIES[c.reason],
+                c.last_visited_at is not None,
+                c.last_visited_at or datetime.datetime.min,
+            ),
+        )
+        return ordered if self.budget is None else ordered[: self.budget]
@@ -1,4 +1,5 @@
 import datetime
+from collections.abc import Iterable
 
 from core.entities.run import Run
 from core.repositories.run_repository import RunRepository
@@ -35,6 +36,31 @@ class RunService:
 
         return self.repo.update(run)
 
+    def record_pacing(self, run_id: str, request_rate: float, error_ratio: float) -> Run:
+        """Records the latest request rate and error ratio reached by the pacing controller."""
+        run = self.repo.get(run_id)
+        if not run:
+            raise ValueError(f"Run {run_id} not found")
+
+        run.request_rate = request_rate
+        run.request_error_ratio = error_ratio
+        return self.repo.update(run)
+
+    def sort_by_start(self, run_ids: Iterable[str]) -> list[str]:
+        """Orders run ids by the start of their runs, oldest first. Unknown runs come first."""
+        runs = {run_id: self.repo.get(run_id) for run_id in run_ids}
+        unknown = [run_id for run_id, run in runs.items() if run is None]
+        known = sorted((run for run in runs.values() if run), key=lambda run: run.started_at)
+        return unknown + [run.id for run in known]
+
+    def get_last_request_rate(self, lookback: int = 10) -> float | None:
+        """Returns the request rate recorded by the most recent of the last `lookback` runs."""
+        runs, _ = self.repo.search(limit=lookback)
+        for run in runs:
+            if run.request_rate is not None:
+                return run.request_rate
+        return None
+
     def fail_run(self, run_id: str, error_message: str) -> Run:
         """Marks a run as failed."""
         run = self.repo.get(run_id)
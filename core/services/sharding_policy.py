@@ -0,0 +1,49 @@
+import heapq
+import math
+
+from core.entities.brand import Brand, BrandShard
+
+
+class ShardingPolicy:
+    """
+    Splits brands into shards of similar size, so every task scrapes about the same number of
+    search pages.
+
+    A brand is expected to load one page per `listings_per_page` listings it had per run
+    recently, and at least one page (also when it has no history). The number of shards is
+    chosen so that a shard loads about `pages_per_shard` pages, with at most `max_shards`
+    shards. Brands are assigned largest first, each to the currently smallest shard
+    (longest-processing-time-first).
+    """
+
+    def __init__(
+        self, listings_per_page: int = 40, pages_per_shard: int = 50, max_shards: int = 16
+    ):
+        if listings_per_page < 1 or pages_per_shard < 1 or max_shards < 1:
+            raise ValueError("listings_per_page, pages_per_shard and max_shards must be positive")
+        self.listings_per_page = listings_per_page
+        self.pages_per_shard = pages_per_shard
+        self.max_shards = max_shards
+
+    def expected_pages(self, volume: float) -> int:
+        return max(1, math.ceil(volume / self.listings_per_page))
+
+    def shard(self, brands: list[Brand], volumes: dict[str, float]) -> list[BrandShard]:
+        """Groups brands into shards using their listings per run (`volumes`, by brand id)."""
+        if not brands:
+            return []
+        pages = {brand.id: self.expected_pages(volumes.get(brand.id, 0)) for brand in brands}
+        num_shards = min(
+            self.max_shards,
+            len(brands),
+            max(1, math.ceil(sum(pages.values()) / self.pages_per_shard)),
+        )
+
+        shards = [BrandShard() for _ in range(num_shards)]
+        heap = [(0, idx) for idx in range(num_shards)]
+        for brand in sorted(brands, key=lambda b: (-pages[b.id], b.id)):
+            load, idx = heapq.heappop(heap)
+            shards[idx].brands.append(brand)
+            shards[idx].expected_pages += pages[brand.id]
+            heapq.heappush(heap, (load + pages[brand.id], idx))
+        return sorted(shards, key=lambda shard: -shard.expected_pages)
@@ -13,6 +13,20 @@ class VehicleService:
     def insert_vehicle(self, vehicle: Vehicle) -> Vehicle:
         return self.repo.add(vehicle)
 
+    def save_vehicle(self, vehicle: Vehicle) -> Vehicle:
+        """Inserts the vehicle or overwrites the stored one with the same id."""
+        if self.vehicle_exists(vehicle.id):
+            return self.repo.update(vehicle)
+        return self.repo.add(vehicle)
+
+    def save_vehicles(self, vehicles: list[Vehicle]) -> int:
+        """
+        Inserts the vehicles or overwrites the stored ones with the same id, in one statement.
+        Of vehicles sharing an id the last one is saved. Returns the number of vehicles saved.
+        """
+        by_id = {vehicle.id: vehicle for vehicle in vehicles}
+        return self.repo.upsert_many(list(by_id.values()))
+
     def vehicle_exists(self, id: str) -> bool:
         return self.repo.get(id) is not None
 
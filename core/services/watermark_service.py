@@ -0,0 +1,32 @@
+import datetime
+from collections.abc import Iterable
+
+from core.entities.watermark import BrandWatermark
+from core.repositories.watermark_repository import WatermarkRepository
+
+
+class WatermarkService:
+    def __init__(self, repo: WatermarkRepository):
+        self.repo = repo
+
+    def get_watermark(self, brand_id: str) -> BrandWatermark | None:
+        return self.repo.get(brand_id)
+
+    def advance(
+        self, brand_id: str, listing_ids: Iterable[str], run_id: str | None = None
+    ) -> BrandWatermark | None:
+        """
+        Moves the watermark of a brand up to the newest of the given listings, which should be
+        all listings stored by a complete crawl of the brand. The watermark never moves back.
+        """
+        newest = max((int(id) for id in listing_ids if id.isdigit()), default=None)
+        current = self.repo.get(brand_id)
+        if newest is None or current is not None and current.covers(str(newest)):
+            return current
+        watermark = BrandWatermark(
+            brand_id=brand_id,
+            listing_id=str(newest),
+            run_id=run_id,
+            updated_at=datetime.datetime.now(),
+        )
+        return self.repo.save(watermark)
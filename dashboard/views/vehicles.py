@@ -3,6 +3,7 @@ from dataclasses import asdict
 import pandas as pd
 import streamlit as st
 
+from core.entities.vehicle import FEATURES
 from dashboard.components.charts import render_new_vehicles_per_run_chart
 from dashboard.components.export import render_export_sidebar
 from dashboard.components.pagination import render_pagination, render_pagination_controls
@@ -46,6 +47,9 @@ def render_vehicles_view(container: Container) -> None:
             selected_brand = st.selectbox("Brand", brands, key="v_brand")
             date_range = st.date_input("Last Visited Range", value=[], key="v_date_range")
             min_date, max_date = parse_date_range(date_range)
+        features = st.multiselect(
+            "Equipment", FEATURES, format_func=format_column_name, key="v_features"
+        )
 
     page_size = st.sidebar.selectbox(
         "📏 Vehicles Page Size",
@@ -63,6 +67,7 @@ def render_vehicles_view(container: Container) -> None:
         "brand": None if selected_brand == "All" else selected_brand,
         "min_date": min_date,
         "max_date": max_date,
+        "features": features,
     }
 
     # pagination setup
@@ -81,6 +86,7 @@ def render_vehicles_view(container: Container) -> None:
 
     # display table
     df = pd.DataFrame([asdict(v) for v in vehicles])
+    df = df.drop(columns=["features_mask", "features_known"])  # shown as the flags themselves
     df.columns = list(map(format_column_name, df.columns.tolist()))
     current_page = st.session_state.get("vehicles_page", 1)
     st.write(f"Showing {len(vehicles)} of {total_count} vehicles (Page {current_page})")
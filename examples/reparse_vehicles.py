@@ -0,0 +1,48 @@
+"""
+Rebuilds vehicles from archived api responses and writes them to the database, without
+any network access. Useful after adding a vehicle field or fixing a parser bug.
+
+Usage:
+    python -m examples.reparse_vehicles [RUN_ID ...]  # all archived runs by default
+
+Runs are replayed in the order they started, vehicles visited after a run are kept.
+"""
+
+import argparse
+
+from more_itertools import chunked
+
+from infra.containers import Container
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("run_ids", nargs="*")
+    args = parser.parse_args()
+
+    container = Container.create_and_patch()
+    container.init_db()
+    logger = container.logger_factory().create("reparse_vehicles")
+    response_archive = container.response_archive()
+    if response_archive is None:
+        raise SystemExit("No archive configured (scrapers.vehicle_scraper.archive_dir)")
+    vehicle_scraper = container.vehicle_scraper()
+    vehicle_service = container.vehicle_service()
+
+    batch_size = container.config.database.write_batch_size()
+
+    # oldest runs first, so newer responses are replayed last
+    run_ids = container.run_service().sort_by_start(args.run_ids or response_archive.run_ids())
+    for run_id in run_ids:
+        success = 0
+        failed = 0
+        # one upsert per batch, stored vehicles visited later than the archive are kept
+        for batch in chunked(vehicle_scraper.reparse(run_id), batch_size):
+            vehicles = [vehicle for vehicle in batch if vehicle is not None]
+            failed += len(batch) - len(vehicles)
+            success += vehicle_service.save_vehicles(vehicles)
+        logger.info(f"Reparsed run {run_id}: {success} vehicles, {failed} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,35 @@
+from datetime import timedelta
+
 from dependency_injector import containers, providers
 
 from core.services.brand_service import BrandService
 from core.services.listing_service import ListingService
+from core.services.refresh_policy import RefreshPolicy
 from core.services.run_service import RunService
+from core.services.sharding_policy import ShardingPolicy
 from core.services.vehicle_service import VehicleService
+from core.services.watermark_service import WatermarkService
 from infra.db.models.base import Base
 from infra.db.repositories.listings import SqlAlchemyListingRepository
 from infra.db.repositories.runs import SqlAlchemyRunRepository
 from infra.db.repositories.vehicles import SqlAlchemyVehicleRepository
+from infra.db.repositories.watermarks import SqlAlchemyWatermarkRepository
 from infra.db.service import DatabaseService
 from infra.factory.clients.http import ClientType, HttpClientFactory
 from infra.factory.logger import LoggerFactory
+from infra.factory.providers.caching_cookie_provider import CachingCookieProvider
+from infra.factory.providers.http_cookie_provider import HttpCookieProvider
 from infra.factory.providers.webdriver_cookie_provider import WebdriverCookieProvider
 from infra.factory.webdriver import WebdriverFactory
+from infra.factory.webdriver_pool import WebdriverPool
 from infra.io.file_service import LocalFileService
+from infra.io.response_archive import ResponseArchive
+from infra.io.write_behind import WriteBehindBuffer
+from infra.scraping.api_listing_scraper import ApiListingScraper
+from infra.scraping.async_vehicle_scraper import AsyncVehicleScraper
 from infra.scraping.listing_scraper import ListingScraper
 from infra.scraping.vehicle_scraper import VehicleScraper
+from infra.utils.rate_limiter import AimdRateLimiter, HostRateLimiter
 
 
 def init_database(db_service):
@@ -23,6 +37,25 @@ def init_database(db_service):
     return db_service
 
 
+def create_response_archive(basedir, logger_factory):
+    # archiving is disabled when no directory is configured
+    if not basedir:
+        return None
+    return ResponseArchive(basedir=basedir, logger_factory=logger_factory)
+
+
+def init_webdriver_pool(webdriver_factory, logger_factory, size, max_pages, max_rss_mb):
+    pool = WebdriverPool(
+        webdriver_factory=webdriver_factory,
+        logger_factory=logger_factory,
+        size=size,
+        max_pages=max_pages,
+        max_rss_mb=max_rss_mb,
+    )
+    yield pool
+    pool.close()
+
+
 class Container(containers.DeclarativeContainer):
     config = providers.Configuration()
 
@@ -31,6 +64,11 @@ class Container(containers.DeclarativeContainer):
         DatabaseService,
         connection_string=config.database.url,
         echo=config.database.echo,
+        sqlite_pragmas=config.database.sqlite,
+        pool_size=config.database.pool.size,
+        max_overflow=config.database.pool.max_overflow,
+        pool_recycle=config.database.pool.recycle_seconds,
+        pool_pre_ping=config.database.pool.pre_ping,
     )
     init_db = providers.Resource(init_database, db_service=db_service)
 
@@ -47,6 +85,10 @@ class Container(containers.DeclarativeContainer):
         SqlAlchemyRunRepository,
         db_service=db_service,
     )
+    watermark_repository = providers.Singleton(
+        SqlAlchemyWatermarkRepository,
+        db_service=db_service,
+    )
 
     # factories
     logger_factory = providers.Singleton(
@@ -63,10 +105,71 @@ class Container(containers.DeclarativeContainer):
         timeout_seconds=config.webdriver.timeout_seconds,
         chrome_binary_path=config.webdriver.chrome_binary_path,
         chromedriver_path=config.webdriver.chromedriver_path,
+        blocked_urls=config.webdriver.blocking.url_patterns,
+        blocked_resource_types=config.webdriver.blocking.resource_types,
+        performance_logging=config.scrapers.listing_scraper.extraction.as_(
+            lambda extraction: extraction == "network"
+        ),
+        page_load_strategy=config.webdriver.page_load_strategy,
     )
-    cookie_provider = providers.Singleton(
-        WebdriverCookieProvider,
+    webdriver_pool = providers.Resource(
+        init_webdriver_pool,
         webdriver_factory=webdriver_factory,
+        logger_factory=logger_factory,
+        size=config.webdriver.pool.size,
+        max_pages=config.webdriver.pool.max_pages,
+        max_rss_mb=config.webdriver.pool.max_rss_mb,
+    )
+    rate_limiter = providers.Selector(
+        config.rate_limit.strategy,
+        fixed=providers.Singleton(
+            HostRateLimiter,
+            requests_per_second=config.rate_limit.requests_per_second,
+            burst=config.rate_limit.burst,
+            jitter=config.rate_limit.jitter,
+        ),
+        aimd=providers.Singleton(
+            AimdRateLimiter,
+            requests_per_second=config.rate_limit.requests_per_second,
+            logger_factory=logger_factory,
+            burst=config.rate_limit.burst,
+            jitter=config.rate_limit.jitter,
+            min_requests_per_second=config.rate_limit.min_requests_per_second,
+            max_requests_per_second=config.rate_limit.max_requests_per_second,
+            increase_step=config.rate_limit.increase_step,
+            decrease_factor=config.rate_limit.decrease_factor,
+        ),
+    )
+    # cookies are bootstrapped by a browser that loads the site like a visitor would, without
+    # blocked requests
+    cookie_webdriver_factory = providers.Singleton(
+        WebdriverFactory,
+        chrome_options=config.webdriver.chrome_options,
+        use_stealth=config.webdriver.use_stealth,
+        logger_factory=logger_factory,
+        timeout_seconds=config.webdriver.timeout_seconds,
+        chrome_binary_path=config.webdriver.chrome_binary_path,
+        chromedriver_path=config.webdriver.chromedriver_path,
+    )
+    webdriver_cookie_provider = providers.Singleton(
+        WebdriverCookieProvider,
+        webdriver_factory=cookie_webdriver_factory,
+    )
+    cookie_provider = providers.Singleton(
+        CachingCookieProvider,
+        provider=providers.Selector(
+            config.http.cookie_provider,
+            webdriver=webdriver_cookie_provider,
+            http=providers.Singleton(
+                HttpCookieProvider,
+                headers=config.http.headers,
+                logger_factory=logger_factory,
+                fallback=webdriver_cookie_provider,
+            ),
+        ),
+        logger_factory=logger_factory,
+        path=config.http.cookie_cache.path,
+        ttl=config.http.cookie_cache.ttl_seconds,
     )
     http_client_factory = providers.Singleton(
         HttpClientFactory,
@@ -75,6 +178,7 @@ class Container(containers.DeclarativeContainer):
         logger_factory=logger_factory,
         cookie_provider=cookie_provider,
         client_type=config.http.client_type.as_(lambda x: ClientType(x)),
+        rate_limiter=rate_limiter,
     )
 
     # services
@@ -103,29 +207,85 @@ class Container(containers.DeclarativeContainer):
         VehicleService,
         repo=vehicle_repository,
     )
+    refresh_policy = providers.Singleton(
+        RefreshPolicy,
+        ttl=config.scrapers.vehicle_scraper.refresh.ttl_days.as_(lambda days: timedelta(days=days)),
+        budget=config.scrapers.vehicle_scraper.refresh.budget,
+    )
+    sharding_policy = providers.Singleton(
+        ShardingPolicy,
+        listings_per_page=config.scrapers.listing_scraper.sharding.listings_per_page,
+        pages_per_shard=config.scrapers.listing_scraper.sharding.pages_per_shard,
+        max_shards=config.scrapers.listing_scraper.sharding.max_shards,
+    )
     run_service = providers.Singleton(
         RunService,
         repo=run_repository,
     )
+    watermark_service = providers.Singleton(
+        WatermarkService,
+        repo=watermark_repository,
+    )
 
-    # scrapers
-    listing_scraper = providers.Singleton(
-        ListingScraper,
+    # writes of the pipeline, a new buffer for every call
+    write_behind_buffer = providers.Factory(
+        WriteBehindBuffer,
         logger_factory=logger_factory,
-        webdriver_factory=webdriver_factory,
-        created_gte=config.scrapers.listing_scraper.created_gte,
-        min_req_delay=config.scrapers.listing_scraper.min_req_delay,
-        max_req_delay=config.scrapers.listing_scraper.max_req_delay,
-        timeout=config.scrapers.listing_scraper.timeout,
+        batch_size=config.database.write_batch_size,
+        flush_interval=config.database.write_flush_interval,
+        max_pending=config.database.write_max_pending,
     )
-    vehicle_scraper = providers.Singleton(
-        VehicleScraper,
+
+    # scrapers
+    response_archive = providers.Singleton(
+        create_response_archive,
+        basedir=config.scrapers.vehicle_scraper.archive_dir,
         logger_factory=logger_factory,
-        http_client_factory=http_client_factory,
-        min_req_delay=config.scrapers.vehicle_scraper.min_req_delay,
-        max_req_delay=config.scrapers.vehicle_scraper.max_req_delay,
-        timeout=config.scrapers.vehicle_scraper.timeout,
-        reinit_session_every=config.scrapers.vehicle_scraper.reinit_session_every,
+    )
+    listing_scraper = providers.Selector(
+        config.scrapers.listing_scraper.engine,
+        webdriver=providers.Singleton(
+            ListingScraper,
+            logger_factory=logger_factory,
+            webdriver_factory=webdriver_factory,
+            created_gte=config.scrapers.listing_scraper.created_gte,
+            timeout=config.scrapers.listing_scraper.timeout,
+            rate_limiter=rate_limiter,
+            webdriver_pool=webdriver_pool,
+            incremental=config.scrapers.listing_scraper.incremental,
+            page_concurrency=config.scrapers.listing_scraper.page_concurrency,
+            extraction=config.scrapers.listing_scraper.extraction,
+            readiness=config.scrapers.listing_scraper.readiness,
+        ),
+        api=providers.Singleton(
+            ApiListingScraper,
+            logger_factory=logger_factory,
+            http_client_factory=http_client_factory,
+            created_gte=config.scrapers.listing_scraper.created_gte,
+            timeout=config.scrapers.listing_scraper.timeout,
+            incremental=config.scrapers.listing_scraper.incremental,
+        ),
+    )
+    vehicle_scraper = providers.Selector(
+        config.scrapers.vehicle_scraper.engine,
+        sequential=providers.Singleton(
+            VehicleScraper,
+            logger_factory=logger_factory,
+            http_client_factory=http_client_factory,
+            timeout=config.scrapers.vehicle_scraper.timeout,
+            reinit_session_every=config.scrapers.vehicle_scraper.reinit_session_every,
+            response_archive=response_archive,
+            max_session_refreshes=config.scrapers.vehicle_scraper.max_session_refreshes,
+        ),
+        concurrent=providers.Singleton(
+            AsyncVehicleScraper,
+            logger_factory=logger_factory,
+            http_client_factory=http_client_factory,
+            timeout=config.scrapers.vehicle_scraper.timeout,
+            reinit_session_every=config.scrapers.vehicle_scraper.reinit_session_every,
+            concurrency=config.scrapers.vehicle_scraper.concurrency,
+            response_archive=response_archive,
+        ),
     )
 
     @classmethod
@@ -1,5 +1,6 @@
 from .listing import ListingModel
 from .run import RunModel
 from .vehicle import VehicleModel
+from .watermark import BrandWatermarkModel
 
-__all__ = ["ListingModel", "RunModel", "VehicleModel"]
+__all__ = ["BrandWatermarkModel", "ListingModel", "RunModel", "VehicleModel"]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Boolean, Column, Index, Integer, String, false
 from sqlalchemy.orm import relationship
 
 from infra.db.models.base import Base, SQLiteSafeDateTime
@@ -6,17 +6,30 @@ from infra.db.models.base import Base, SQLiteSafeDateTime
 
 class ListingModel(Base):
     __tablename__ = "listings"
+    __table_args__ = (
+        # listings of a run (vehicle stage, refresh candidates) and runs by time (dashboard)
+        Index("ix_listings_run_id_visited_at", "run_id", "visited_at"),
+        # latest visit of a listing, also serves lookups by listing id alone
+        Index("ix_listings_listing_id_visited_at", "listing_id", "visited_at"),
+        # most recent listings (latest run, listing search)
+        Index("ix_listings_visited_at", "visited_at"),
+        # price range filters
+        Index("ix_listings_price_amount", "price_amount"),
+    )
 
     # primary key
     id = Column(Integer, primary_key=True, autoincrement=True)
 
     # fields
-    listing_id = Column(String, index=True)
+    listing_id = Column(String)
     url = Column(String, nullable=False)
     title = Column(String, nullable=False)
     price = Column(String, nullable=False)
+    price_amount = Column(Integer, nullable=True)
+    price_on_request = Column(Boolean, nullable=False, default=False, server_default=false())
     visited_at = Column(SQLiteSafeDateTime, nullable=True)
     run_id = Column(String, nullable=True)
+    brand_id = Column(String, nullable=True, index=True)
 
     # relationships
     vehicle = relationship(
@@ -1,6 +1,6 @@
 from datetime import UTC, datetime
 
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Float, Integer, String
 
 from core.entities.run import RunStatus
 from infra.db.models.base import Base, SQLiteSafeDateTime
@@ -17,3 +17,5 @@ class RunModel(Base):
     vehicles_scraped = Column(Integer, default=0)
     errors_count = Column(Integer, default=0)
     last_error_message = Column(String, nullable=True)
+    request_rate = Column(Float, nullable=True)
+    request_error_ratio = Column(Float, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import BigInteger, Boolean, Column, Index, Integer, String, false
 from sqlalchemy.orm import relationship
 
 from infra.db.models.base import Base, SQLiteSafeDateTime
@@ -6,6 +6,16 @@ from infra.db.models.base import Base, SQLiteSafeDateTime
 
 class VehicleModel(Base):
     __tablename__ = "vehicles"
+    __table_args__ = (
+        # vehicle search of a brand, most recently visited first, and the list of brands
+        Index("ix_vehicles_brand_last_visited_at", "brand", "last_visited_at"),
+        # vehicle search without a brand
+        Index("ix_vehicles_last_visited_at", "last_visited_at"),
+        # price range filters
+        Index("ix_vehicles_price_amount", "price_amount"),
+        # equipment filters scan the narrow index instead of the wide rows
+        Index("ix_vehicles_features", "features_mask", "features_known"),
+    )
 
     # primary key
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -15,6 +25,8 @@ class VehicleModel(Base):
     url = Column(String, nullable=False)
     title = Column(String, nullable=False)
     price = Column(String, nullable=False)
+    price_amount = Column(Integer, nullable=True)
+    price_on_request = Column(Boolean, nullable=False, default=False, server_default=false())
     last_visited_at = Column(SQLiteSafeDateTime, nullable=True)
 
     # basic vehicle information
@@ -105,6 +117,10 @@ class VehicleModel(Base):
     disabled_accessible = Column(String, nullable=True)
     oldtimer = Column(String, nullable=True)
 
+    # packed boolean fields (see core.entities.vehicle.FEATURES)
+    features_mask = Column(BigInteger, nullable=False, default=0, server_default="0")
+    features_known = Column(BigInteger, nullable=False, default=0, server_default="0")
+
     # relationships
     listings = relationship(
         "ListingModel",
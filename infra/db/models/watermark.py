@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String
+
+from infra.db.models.base import Base, SQLiteSafeDateTime
+
+
+class BrandWatermarkModel(Base):
+    __tablename__ = "brand_watermarks"
+
+    brand_id = Column(String, primary_key=True)
+    listing_id = Column(String, nullable=False)
+    run_id = Column(String, nullable=True)
+    updated_at = Column(SQLiteSafeDateTime, nullable=True)
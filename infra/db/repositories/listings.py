@@ -1,8 +1,9 @@
 import datetime
 
-from sqlalchemy import Integer, cast, func, select
+from sqlalchemy import func, insert, or_, select
 
 from core.entities.listing import Listing
+from core.entities.refresh import RefreshCandidate, RefreshReason
 from core.repositories.listing_repository import ListingRepository
 from infra.db.models.listing import ListingModel
 from infra.db.models.vehicle import VehicleModel
@@ -21,17 +22,24 @@ class SqlAlchemyListingRepository(ListingRepository):
             price=orm.price,
             visited_at=orm.visited_at,
             run_id=orm.run_id,
+            brand_id=orm.brand_id,
         )
 
     def _convert_entity_to_orm(self, entity: Listing):
-        return ListingModel(
-            listing_id=entity.id,
-            url=entity.url,
-            title=entity.title,
-            price=entity.price,
-            visited_at=entity.visited_at,
-            run_id=entity.run_id,
-        )
+        return ListingModel(**self._convert_entity_to_row(entity))
+
+    def _convert_entity_to_row(self, entity: Listing) -> dict:
+        return {
+            "listing_id": entity.id,
+            "url": entity.url,
+            "title": entity.title,
+            "price": entity.price,
+            "price_amount": entity.price_amount,
+            "price_on_request": entity.price_on_request,
+            "visited_at": entity.visited_at,
+            "run_id": entity.run_id,
+            "brand_id": entity.brand_id,
+        }
 
     def add(self, listing: Listing) -> Listing:
         with self.db_service.create_session() as session:
@@ -41,6 +49,19 @@ class SqlAlchemyListingRepository(ListingRepository):
             session.refresh(record)
             return self._convert_orm_to_entity(record)
 
+    def add_many(self, listings: list[Listing]) -> int:
+        """
+        Inserts the listings with a single executemany in one transaction, without reading
+        them back. Either all or none of them are stored. Returns the number of listings stored.
+        """
+        if not listings:
+            return 0
+        rows = [self._convert_entity_to_row(listing) for listing in listings]
+        with self.db_service.create_session() as session:
+            session.execute(insert(ListingModel), rows)
+            session.commit()
+        return len(rows)
+
     def exists(self, id: str) -> bool:
         with self.db_service.create_session() as session:
             query = select(ListingModel).filter_by(listing_id=id)
@@ -84,6 +105,49 @@ class SqlAlchemyListingRepository(ListingRepository):
             result = session.execute(query).scalars().all()
             return [self._convert_orm_to_entity(orm) for orm in result]
 
+    def find_refresh_candidates(
+        self, run_id: str, stale_before: datetime.datetime
+    ) -> list[RefreshCandidate]:
+        """
+        Finds listings of the given run that have no vehicle yet, whose price differs from the
+        price stored with their vehicle or whose vehicle was last visited before `stale_before`.
+        """
+        with self.db_service.create_session() as session:
+            query = (
+                select(
+                    ListingModel,
+                    VehicleModel.listing_id,
+                    VehicleModel.price,
+                    VehicleModel.last_visited_at,
+                )
+                .outerjoin(VehicleModel, VehicleModel.listing_id == ListingModel.listing_id)
+                .filter(ListingModel.run_id == run_id)
+                .filter(
+                    or_(
+                        VehicleModel.listing_id.is_(None),
+                        VehicleModel.price != ListingModel.price,
+                        VehicleModel.last_visited_at.is_(None),
+                        VehicleModel.last_visited_at < stale_before,
+                    )
+                )
+            )
+            candidates = {}
+            for orm, vehicle_id, vehicle_price, last_visited_at in session.execute(query).all():
+                if orm.listing_id in candidates:
+                    continue
+                if vehicle_id is None:
+                    reason = RefreshReason.NEW
+                elif vehicle_price != orm.price:
+                    reason = RefreshReason.PRICE_CHANGED
+                else:
+                    reason = RefreshReason.STALE
+                candidates[orm.listing_id] = RefreshCandidate(
+                    listing=self._convert_orm_to_entity(orm),
+                    reason=reason,
+                    last_visited_at=last_visited_at,
+                )
+            return list(candidates.values())
+
     def search_with_run_id(self, run_id: str) -> list[Listing]:
         """Returns a list of listings found for a given run_id."""
         with self.db_service.create_session() as session:
@@ -117,20 +181,10 @@ class SqlAlchemyListingRepository(ListingRepository):
             if max_date:
                 query = query.filter(ListingModel.visited_at <= max_date)
 
-            if min_price is not None or max_price is not None:
-                price_clean = func.trim(
-                    func.replace(func.replace(ListingModel.price, "KM", ""), ".", "")
-                )
-                price_int = cast(price_clean, Integer)
-
-                query = query.filter(ListingModel.price.is_not(None))
-                query = query.filter(ListingModel.price != "")
-                query = query.filter(ListingModel.price != "Na upit")
-
-                if min_price is not None:
-                    query = query.filter(price_int >= min_price)
-                if max_price is not None:
-                    query = query.filter(price_int <= max_price)
+            if min_price is not None:
+                query = query.filter(ListingModel.price_amount >= min_price)
+            if max_price is not None:
+                query = query.filter(ListingModel.price_amount <= max_price)
 
             # count results
             count_query = select(func.count()).select_from(query.subquery())
@@ -143,6 +197,29 @@ class SqlAlchemyListingRepository(ListingRepository):
             entities = [self._convert_orm_to_entity(orm) for orm in result]
             return entities, total_count
 
+    def find_recent_run_ids(self, limit: int = 5) -> list[str]:
+        """Returns the ids of the runs that inserted listings most recently."""
+        with self.db_service.create_session() as session:
+            query = (
+                select(ListingModel.run_id)
+                .filter(ListingModel.run_id.is_not(None))
+                .group_by(ListingModel.run_id)
+                .order_by(func.max(ListingModel.visited_at).desc())
+                .limit(limit)
+            )
+            return list(session.execute(query).scalars().all())
+
+    def count_by_brand(self, run_ids: list[str]) -> dict[str, int]:
+        """Counts the listings inserted by the given runs, per brand."""
+        with self.db_service.create_session() as session:
+            query = (
+                select(ListingModel.brand_id, func.count(ListingModel.id))
+                .filter(ListingModel.run_id.in_(run_ids))
+                .filter(ListingModel.brand_id.is_not(None))
+                .group_by(ListingModel.brand_id)
+            )
+            return dict(session.execute(query).all())
+
     def get_unique_run_ids(self) -> list[str]:
         with self.db_service.create_session() as session:
             query = select(ListingModel.run_id).distinct().order_by(ListingModel.run_id.desc())
@@ -22,6 +22,8 @@ class SqlAlchemyRunRepository(RunRepository):
             vehicles_scraped=orm.vehicles_scraped,
             errors_count=orm.errors_count,
             last_error_message=orm.last_error_message,
+            request_rate=orm.request_rate,
+            request_error_ratio=orm.request_error_ratio,
         )
 
     def _convert_entity_to_orm(self, entity: Run) -> RunModel:
@@ -34,6 +36,8 @@ class SqlAlchemyRunRepository(RunRepository):
             vehicles_scraped=entity.vehicles_scraped,
             errors_count=entity.errors_count,
             last_error_message=entity.last_error_message,
+            request_rate=entity.request_rate,
+            request_error_ratio=entity.request_error_ratio,
         )
 
     def add(self, run: Run) -> Run:
@@ -54,6 +58,8 @@ class SqlAlchemyRunRepository(RunRepository):
                 record.vehicles_scraped = run.vehicles_scraped
                 record.errors_count = run.errors_count
                 record.last_error_message = run.last_error_message
+                record.request_rate = run.request_rate
+                record.request_error_ratio = run.request_error_ratio
                 session.commit()
                 session.refresh(record)
                 return self._convert_orm_to_entity(record)
@@ -1,9 +1,12 @@
 import datetime
+from collections.abc import Iterable
 from dataclasses import asdict
 
-from sqlalchemy import Integer, cast, func, inspect, select
+from sqlalchemy import and_, func, insert, inspect, or_, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
-from core.entities.vehicle import Vehicle
+from core.entities.vehicle import Vehicle, feature_mask
 from core.repositories.vehicle_repository import VehicleRepository
 from infra.db.models.listing import ListingModel
 from infra.db.models.vehicle import VehicleModel
@@ -23,9 +26,12 @@ class SqlAlchemyVehicleRepository(VehicleRepository):
         return Vehicle.from_dict(data)
 
     def _convert_entity_to_orm(self, entity: Vehicle) -> VehicleModel:
+        return VehicleModel(**self._convert_entity_to_row(entity))
+
+    def _convert_entity_to_row(self, entity: Vehicle) -> dict:
         data = asdict(entity)
         data["listing_id"] = data.pop("id", None)
-        return VehicleModel(**data)
+        return data
 
     def add(self, vehicle: Vehicle) -> Vehicle:
         with self.db_service.create_session() as session:
@@ -35,6 +41,79 @@ class SqlAlchemyVehicleRepository(VehicleRepository):
             session.refresh(record)
             return self._convert_orm_to_entity(record)
 
+    def add_many(self, vehicles: list[Vehicle]) -> int:
+        """
+        Inserts the vehicles with a single executemany in one transaction, without reading
+        them back. Either all or none of them are stored. Returns the number of vehicles stored.
+        """
+        if not vehicles:
+            return 0
+        rows = [self._convert_entity_to_row(vehicle) for vehicle in vehicles]
+        with self.db_service.create_session() as session:
+            session.execute(insert(VehicleModel), rows)
+            session.commit()
+        return len(rows)
+
+    def upsert_many(self, vehicles: list[Vehicle]) -> int:
+        """
+        Inserts the vehicles or overwrites the stored vehicles with the same listing id, with
+        a single `INSERT ... ON CONFLICT (listing_id) DO UPDATE` executemany in one transaction.
+        Stored vehicles are only written when at least one of their columns differs and they
+        were not visited after the given vehicle, so replaying older data (e.g. archived
+        responses) never overwrites newer vehicles. Returns the number of vehicles given.
+        """
+        if not vehicles:
+            return 0
+        rows = [self._convert_entity_to_row(vehicle) for vehicle in vehicles]
+        with self.db_service.create_session() as session:
+            session.execute(self._upsert_statement(session.get_bind().dialect.name), rows)
+            session.commit()
+        return len(rows)
+
+    @staticmethod
+    def _upsert_statement(dialect: str):
+        if dialect == "sqlite":
+            statement = sqlite_insert(VehicleModel)
+        elif dialect == "postgresql":
+            statement = postgresql_insert(VehicleModel)
+        else:
+            raise NotImplementedError(f"Upserts are not supported on {dialect}")
+        table = VehicleModel.__table__
+        columns = [
+            column.name for column in table.columns if column.name not in ("id", "listing_id")
+        ]
+        return statement.on_conflict_do_update(
+            index_elements=[table.c.listing_id],
+            set_={column: statement.excluded[column] for column in columns},
+            where=and_(
+                or_(
+                    table.c.last_visited_at.is_(None),
+                    statement.excluded.last_visited_at.is_(None),
+                    table.c.last_visited_at <= statement.excluded.last_visited_at,
+                ),
+                or_(
+                    *(
+                        table.c[column].is_distinct_from(statement.excluded[column])
+                        for column in columns
+                    )
+                ),
+            ),
+        )
+
+    def update(self, vehicle: Vehicle) -> Vehicle:
+        with self.db_service.create_session() as session:
+            query = select(VehicleModel).filter_by(listing_id=vehicle.id)
+            record = session.execute(query).scalars().first()
+            if record:
+                data = asdict(vehicle)
+                data.pop("id", None)
+                for key, value in data.items():
+                    setattr(record, key, value)
+                session.commit()
+                session.refresh(record)
+                return self._convert_orm_to_entity(record)
+            raise ValueError(f"Vehicle with id {vehicle.id} not found")
+
     def get(self, id: str) -> Vehicle | None:
         with self.db_service.create_session() as session:
             query = select(VehicleModel).filter_by(listing_id=id)
@@ -50,9 +129,15 @@ class SqlAlchemyVehicleRepository(VehicleRepository):
         min_date: datetime.datetime | None = None,
         max_date: datetime.datetime | None = None,
         brand: str | None = None,
+        features: Iterable[str] | None = None,
+        without_features: Iterable[str] | None = None,
         offset: int = 0,
         limit: int = 10,
     ) -> tuple[list[Vehicle], int]:
+        """
+        Vehicles having all of `features` and known to lack all of `without_features` are
+        matched with bitwise predicates on the packed equipment flags.
+        """
         with self.db_service.create_session() as session:
             query = select(VehicleModel)
 
@@ -68,20 +153,18 @@ class SqlAlchemyVehicleRepository(VehicleRepository):
             if max_date:
                 query = query.filter(VehicleModel.last_visited_at <= max_date)
 
-            if min_price is not None or max_price is not None:
-                price_clean = func.trim(
-                    func.replace(func.replace(VehicleModel.price, "KM", ""), ".", "")
-                )
-                price_int = cast(price_clean, Integer)
-
-                query = query.filter(VehicleModel.price.is_not(None))
-                query = query.filter(VehicleModel.price != "")
-                query = query.filter(VehicleModel.price != "Na upit")
-
-                if min_price is not None:
-                    query = query.filter(price_int >= min_price)
-                if max_price is not None:
-                    query = query.filter(price_int <= max_price)
+            if min_price is not None:
+                query = query.filter(VehicleModel.price_amount >= min_price)
+            if max_price is not None:
+                query = query.filter(VehicleModel.price_amount <= max_price)
+
+            if features:
+                mask = feature_mask(features)
+                query = query.filter(VehicleModel.features_mask.op("&")(mask) == mask)
+            if without_features:
+                mask = feature_mask(without_features)
+                query = query.filter(VehicleModel.features_known.op("&")(mask) == mask)
+                query = query.filter(VehicleModel.features_mask.op("&")(mask) == 0)
 
             # count results
             count_query = select(func.count()).select_from(query.subquery())
@@ -0,0 +1,37 @@
+from core.entities.watermark import BrandWatermark
+from core.repositories.watermark_repository import WatermarkRepository
+from infra.db.models.watermark import BrandWatermarkModel
+from infra.db.service import DatabaseService
+
+
+class SqlAlchemyWatermarkRepository(WatermarkRepository):
+    def __init__(self, db_service: DatabaseService):
+        self.db_service = db_service
+
+    def _convert_orm_to_entity(self, orm: BrandWatermarkModel) -> BrandWatermark:
+        return BrandWatermark(
+            brand_id=orm.brand_id,
+            listing_id=orm.listing_id,
+            run_id=orm.run_id,
+            updated_at=orm.updated_at,
+        )
+
+    def get(self, brand_id: str) -> BrandWatermark | None:
+        with self.db_service.create_session() as session:
+            result = session.get(BrandWatermarkModel, brand_id)
+            if result:
+                return self._convert_orm_to_entity(result)
+            return None
+
+    def save(self, watermark: BrandWatermark) -> BrandWatermark:
+        with self.db_service.create_session() as session:
+            record = session.get(BrandWatermarkModel, watermark.brand_id)
+            if record is None:
+                record = BrandWatermarkModel(brand_id=watermark.brand_id)
+                session.add(record)
+            record.listing_id = watermark.listing_id
+            record.run_id = watermark.run_id
+            record.updated_at = watermark.updated_at
+            session.commit()
+            session.refresh(record)
+            return self._convert_orm_to_entity(record)
@@ -1,15 +1,54 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 
 class DatabaseService:
-    def __init__(self, connection_string: str, echo: bool = False):
-        self.engine = create_engine(connection_string, echo=echo, future=True)
+    """
+    Creates the engine and sessions of the database.
+
+    On SQLite every new connection runs `PRAGMA <name> = <value>` for each of the given
+    `sqlite_pragmas` (e.g. `{"journal_mode": "wal", "busy_timeout": 5000}`), pragmas set to
+    None are left at their default. The `pool_*` options configure the connection pool of
+    server databases and are ignored on SQLite.
+    """
+
+    def __init__(
+        self,
+        connection_string: str,
+        echo: bool = False,
+        sqlite_pragmas: dict[str, str | int | None] | None = None,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_recycle: int = -1,
+        pool_pre_ping: bool = False,
+    ):
+        engine_options = {}
+        if not connection_string.startswith("sqlite"):
+            engine_options = {
+                "pool_size": pool_size,
+                "max_overflow": max_overflow,
+                "pool_recycle": pool_recycle,
+                "pool_pre_ping": pool_pre_ping,
+            }
+        self.engine = create_engine(connection_string, echo=echo, future=True, **engine_options)
         self.session_local = sessionmaker(bind=self.engine, autoflush=False, future=True)
+        self.sqlite_pragmas = {
+            name: value for name, value in (sqlite_pragmas or {}).items() if value is not None
+        }
+        if self.engine.dialect.name == "sqlite" and self.sqlite_pragmas:
+            event.listen(self.engine, "connect", self._set_sqlite_pragmas)
 
     def create_session(self):
         return self.session_local()
 
+    def _set_sqlite_pragmas(self, dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in self.sqlite_pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
     def create_all_tables(self, base):
         # for sqlite, ensure the directory exists
         if self.engine.url.drivername == "sqlite":
@@ -5,7 +5,8 @@ import requests
 
 from infra.factory.logger import LoggerFactory
 from infra.interfaces.cookie_provider import CookieProvider
-from infra.interfaces.http import HttpClient
+from infra.interfaces.http import AsyncHttpClient, HttpClient
+from infra.utils.rate_limiter import HostRateLimiter
 
 
 class ClientType(Enum):
@@ -13,6 +14,65 @@ class ClientType(Enum):
     HTTPX = "httpx"
 
 
+class RateLimitedSession(requests.Session):
+    """
+    A requests.Session that takes a token from the rate limiter before every request and
+    reports the outcome (status code, timeout or connection error) back to it.
+    """
+
+    def __init__(self, rate_limiter: HostRateLimiter):
+        super().__init__()
+        self._rate_limiter = rate_limiter
+
+    def request(self, method, url, *args, **kwargs):
+        self._rate_limiter.acquire(url)
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except (requests.Timeout, requests.ConnectionError):
+            self._rate_limiter.record_failure(url)
+            raise
+        self._rate_limiter.record_response(url, response.status_code)
+        return response
+
+
+class RateLimitedClient(httpx.Client):
+    """An httpx.Client that goes through the rate limiter, see `RateLimitedSession`."""
+
+    def __init__(self, rate_limiter: HostRateLimiter, **kwargs):
+        super().__init__(**kwargs)
+        self._rate_limiter = rate_limiter
+
+    def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        url = str(request.url)
+        self._rate_limiter.acquire(url)
+        try:
+            response = super().send(request, **kwargs)
+        except httpx.TransportError:
+            self._rate_limiter.record_failure(url)
+            raise
+        self._rate_limiter.record_response(url, response.status_code)
+        return response
+
+
+class RateLimitedAsyncClient(httpx.AsyncClient):
+    """An httpx.AsyncClient that goes through the rate limiter, see `RateLimitedSession`."""
+
+    def __init__(self, rate_limiter: HostRateLimiter, **kwargs):
+        super().__init__(**kwargs)
+        self._rate_limiter = rate_limiter
+
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        url = str(request.url)
+        await self._rate_limiter.acquire_async(url)
+        try:
+            response = await super().send(request, **kwargs)
+        except httpx.TransportError:
+            self._rate_limiter.record_failure(url)
+            raise
+        self._rate_limiter.record_response(url, response.status_code)
+        return response
+
+
 class HttpClientFactory:
     def __init__(
         self,
@@ -21,12 +81,14 @@ class HttpClientFactory:
         logger_factory: LoggerFactory,
         cookie_provider: CookieProvider,
         client_type: ClientType = ClientType.REQUESTS,
+        rate_limiter: HostRateLimiter | None = None,
     ):
         self._url = url
         self._logger = logger_factory.create(__name__)
         self._cookie_provider = cookie_provider
         self._headers = headers
         self._client_type = client_type
+        self._rate_limiter = rate_limiter
 
     def create(self) -> HttpClient:
         cookies = self._cookie_provider.provide(self._url)
@@ -35,15 +97,43 @@ class HttpClientFactory:
         else:  # by default returns a requests.Session object
             return self._create_requests_session(self._headers, cookies)
 
+    def invalidate_cookies(self) -> None:
+        """Discards the cookies shared by the clients, e.g. after the api rejected them."""
+        self._cookie_provider.invalidate(self._url)
+
+    def create_async(self, max_connections: int = 100) -> AsyncHttpClient:
+        """
+        Creates an `httpx.AsyncClient` sharing headers and cookies with the sync clients.
+        Async clients are always backed by httpx, regardless of the configured `client_type`.
+        """
+        cookies = self._cookie_provider.provide(self._url)
+        kwargs = {
+            "headers": self._headers,
+            "cookies": {cookie["name"]: cookie["value"] for cookie in cookies},
+            "limits": httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        }
+        if self._rate_limiter:
+            return RateLimitedAsyncClient(self._rate_limiter, **kwargs)
+        return httpx.AsyncClient(**kwargs)
+
     def _create_requests_session(self, headers: dict, cookies: list[dict]) -> requests.Session:
-        session = requests.Session()
+        if self._rate_limiter:
+            session = RateLimitedSession(self._rate_limiter)
+        else:
+            session = requests.Session()
         session.headers.update(headers)
         for cookie in cookies:
             session.cookies.set(cookie["name"], cookie["value"])
         return session
 
     def _create_httpx_client(self, headers: dict, cookies: list[dict]) -> httpx.Client:
-        return httpx.Client(
-            headers=headers,
-            cookies={cookie["name"]: cookie["value"] for cookie in cookies},
-        )
+        kwargs = {
+            "headers": headers,
+            "cookies": {cookie["name"]: cookie["value"] for cookie in cookies},
+        }
+        if self._rate_limiter:
+            return RateLimitedClient(self._rate_limiter, **kwargs)
+        return httpx.Client(**kwargs)
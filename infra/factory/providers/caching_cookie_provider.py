@@ -0,0 +1,93 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from infra.factory.logger import LoggerFactory
+from infra.interfaces.cookie_provider import CookieProvider
+
+
+class CachingCookieProvider(CookieProvider):
+    """
+    Caches the cookies of another provider, so a browser is only started when there are no
+    cookies for the url yet, they have expired or they were invalidated.
+
+    Cookies are kept until the earliest cookie expiry, but not longer than `ttl` seconds. When
+    `path` is given the cache is persisted as a JSON file, which lets tasks and processes
+    reuse each other's cookies. The file is replaced atomically, so concurrent readers never
+    see a partially written cache.
+    """
+
+    def __init__(
+        self,
+        provider: CookieProvider,
+        logger_factory: LoggerFactory,
+        path: str | None = None,
+        ttl: float = 3600.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._provider = provider
+        self._logger = logger_factory.create(self.__class__.__name__)
+        self._path = Path(path) if path else None
+        self._ttl = ttl
+        self._clock = clock
+        self._entries: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def provide(self, url: str) -> list[dict]:
+        with self._lock:
+            entry = self._load().get(url)
+            if entry and entry["expires_at"] > self._clock():
+                self._logger.debug(f"Reusing cached cookies for {url}")
+                return entry["cookies"]
+
+            self._logger.info(f"Retrieving fresh cookies for {url}")
+            cookies = self._provider.provide(url)
+            entries = self._load()
+            entries[url] = {"expires_at": self._expires_at(cookies), "cookies": cookies}
+            self._save(entries)
+            return cookies
+
+    def invalidate(self, url: str) -> None:
+        with self._lock:
+            entries = self._load()
+            if entries.pop(url, None) is not None:
+                self._logger.info(f"Invalidated cached cookies for {url}")
+                self._save(entries)
+        self._provider.invalidate(url)
+
+    def _expires_at(self, cookies: list[dict]) -> float:
+        expiries = [cookie["expiry"] for cookie in cookies if cookie.get("expiry") is not None]
+        return min([self._clock() + self._ttl, *expiries])
+
+    def _load(self) -> dict[str, dict]:
+        if self._path is None:
+            return self._entries
+        try:
+            with self._path.open(encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as err:
+            self._logger.warning(f"Ignoring unreadable cookie cache {self._path}: {err}")
+            return {}
+
+    def _save(self, entries: dict[str, dict]) -> None:
+        if self._path is None:
+            self._entries = entries
+            return
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._path.parent, prefix=f".{self._path.name}.")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as file:
+                    json.dump(entries, file)
+                os.replace(tmp_path, self._path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as err:
+            self._logger.warning(f"Failed to write cookie cache {self._path}: {err}")
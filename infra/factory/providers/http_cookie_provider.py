@@ -0,0 +1,60 @@
+import threading
+
+import requests
+
+from infra.factory.logger import LoggerFactory
+from infra.interfaces.cookie_provider import CookieProvider
+
+
+class HttpCookieProvider(CookieProvider):
+    """
+    Implements CookieProvider with a plain HTTP GET request, without starting a browser.
+
+    The session cookies set by the server are returned as they are. Once they get rejected
+    (see `invalidate`), cookies for that url are provided by the `fallback` provider, usually
+    a `WebdriverCookieProvider`.
+    """
+
+    def __init__(
+        self,
+        headers: dict,
+        logger_factory: LoggerFactory,
+        fallback: CookieProvider,
+        timeout: float = 10.0,
+    ) -> None:
+        self._headers = headers
+        self._logger = logger_factory.create(self.__class__.__name__)
+        self._fallback = fallback
+        self._timeout = timeout
+        self._fallback_urls: set[str] = set()
+        self._lock = threading.Lock()
+
+    def provide(self, url: str) -> list[dict]:
+        with self._lock:
+            use_fallback = url in self._fallback_urls
+        if use_fallback:
+            return self._fallback.provide(url)
+
+        try:
+            with requests.Session() as session:
+                session.headers.update(self._headers)
+                response = session.get(url, timeout=self._timeout)
+                response.raise_for_status()
+                cookies = []
+                for cookie in session.cookies:
+                    provide_cookie = {"name": cookie.name, "value": cookie.value}
+                    if cookie.expires is not None:
+                        provide_cookie["expiry"] = cookie.expires
+                    cookies.append(provide_cookie)
+                return cookies
+        except requests.RequestException as err:
+            self._logger.warning(f"Failed to retrieve cookies from {url}: {err}, falling back")
+            return self._fallback.provide(url)
+
+    def invalidate(self, url: str) -> None:
+        with self._lock:
+            if url not in self._fallback_urls:
+                self._logger.info(f"Cookies from {url} were rejected, falling back")
+                self._fallback_urls.add(url)
+                return
+        self._fallback.invalidate(url)
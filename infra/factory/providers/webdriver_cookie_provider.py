@@ -13,9 +13,16 @@ class WebdriverCookieProvider(CookieProvider):
         try:
             driver.get(url)
             retrieved_cookies = driver.get_cookies()
-            provide_cookies = [
-                {"name": cookie["name"], "value": cookie["value"]} for cookie in retrieved_cookies
-            ]
+            provide_cookies = []
+            for cookie in retrieved_cookies:
+                provide_cookie = {"name": cookie["name"], "value": cookie["value"]}
+                if cookie.get("expiry") is not None:
+                    provide_cookie["expiry"] = cookie["expiry"]
+                provide_cookies.append(provide_cookie)
             return provide_cookies
         finally:
             driver.quit()
+
+    def invalidate(self, url: str) -> None:
+        # every call to `provide` starts a new browser session, there is nothing to discard
+        pass
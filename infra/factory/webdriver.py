@@ -7,6 +7,26 @@ from selenium_stealth import stealth
 from infra.factory.logger import LoggerFactory
 from infra.utils.timeout import timeout
 
+# url patterns blocked for a resource type. Chrome can only block requests by url pattern
+# without intercepting every request, so resource types are matched by file extension.
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*"],
+    "font": ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"],
+    "stylesheet": ["*.css*"],
+    "media": ["*.mp4*", "*.webm*", "*.ogg*", "*.mp3*", "*.m3u8*"],
+}
+
+
+def blocked_url_patterns(url_patterns: list[str], resource_types: list[str]) -> list[str]:
+    """Returns the url patterns to block for the given patterns and resource types."""
+    unknown = set(resource_types) - RESOURCE_TYPE_PATTERNS.keys()
+    if unknown:
+        raise ValueError(f"Unknown resource types: {sorted(unknown)}")
+    patterns = list(url_patterns)
+    for resource_type in resource_types:
+        patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+    return list(dict.fromkeys(patterns))
+
 
 class WebdriverFactory:
     def __init__(
@@ -17,12 +37,19 @@ class WebdriverFactory:
         timeout_seconds: int = 30,
         chrome_binary_path: str = None,
         chromedriver_path: str = None,
+        blocked_urls: list[str] | None = None,
+        blocked_resource_types: list[str] | None = None,
+        performance_logging: bool = False,
+        page_load_strategy: str = "normal",
     ):
         self._chrome_options = chrome_options
         self._use_stealth = use_stealth
         self._timeout_seconds = timeout_seconds
         self._chrome_binary_path = chrome_binary_path
         self._chromedriver_path = chromedriver_path
+        self._blocked_urls = blocked_url_patterns(blocked_urls or [], blocked_resource_types or [])
+        self._performance_logging = performance_logging
+        self._page_load_strategy = page_load_strategy
         self._logger = logger_factory.create(__name__)
 
     def create(self) -> webdriver.Chrome:
@@ -37,6 +64,13 @@ class WebdriverFactory:
                 for option in self._chrome_options:
                     chrome_options.add_argument(option)
 
+                # "eager" returns from get() once the document is parsed
+                chrome_options.page_load_strategy = self._page_load_strategy
+
+                # Log network events so responses fetched by pages can be read back
+                if self._performance_logging:
+                    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
                 # Create service with ChromeDriver path if configured
                 service = None
                 if self._chromedriver_path:
@@ -54,6 +88,8 @@ class WebdriverFactory:
                         renderer="Intel Iris OpenGL Engine",
                         fix_hairline=True,
                     )
+                if self._blocked_urls:
+                    self._block_requests(driver)
                 return driver
         except TimeoutError:
             self._logger.error(
@@ -66,3 +102,9 @@ class WebdriverFactory:
         except Exception as e:
             self._logger.error(f"An unexpected error occurred: {str(e)}")
             raise
+
+    def _block_requests(self, driver: webdriver.Chrome) -> None:
+        # requests matching a pattern fail before they are sent, for every page of the driver
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self._blocked_urls})
+        self._logger.debug(f"Blocking requests to {len(self._blocked_urls)} url patterns")
@@ -0,0 +1,165 @@
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+from infra.factory.logger import LoggerFactory
+from infra.factory.webdriver import WebdriverFactory
+
+
+def process_tree_rss(pid: int) -> int | None:
+    """
+    Returns the resident memory (in bytes) of a process and all of its descendants, read from
+    /proc. Returns `None` when /proc is not available or the process does not exist.
+    """
+    total = 0
+    pending = [pid]
+    seen = set()
+    try:
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            try:
+                with open(f"/proc/{current}/statm") as file:
+                    total += int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+                for task in os.listdir(f"/proc/{current}/task"):
+                    with open(f"/proc/{current}/task/{task}/children") as file:
+                        pending.extend(int(child) for child in file.read().split())
+            except (FileNotFoundError, ProcessLookupError):
+                if current == pid:
+                    return None
+                continue  # the process exited in the meantime
+    except (OSError, ValueError):
+        return None
+    return total
+
+
+class WebdriverPool:
+    """
+    Keeps up to `size` browsers alive so they can be reused across brands.
+
+    Browsers are leased with `lease` and handed back with `release`. A leased browser is
+    health-checked first and replaced when it does not respond. Browsers are recycled (quit and
+    replaced on the next lease) after loading `max_pages` pages or when the memory of their
+    process tree exceeds `max_rss_mb`.
+    """
+
+    def __init__(
+        self,
+        webdriver_factory: WebdriverFactory,
+        logger_factory: LoggerFactory,
+        size: int = 1,
+        max_pages: int | None = 200,
+        max_rss_mb: float | None = None,
+    ):
+        if size < 1:
+            raise ValueError(f"size must be at least 1, got {size}")
+        self._webdriver_factory = webdriver_factory
+        self._logger = logger_factory.create(self.__class__.__name__)
+        self._size = size
+        self._max_pages = max_pages
+        self._max_rss_mb = max_rss_mb
+        self._idle: list[webdriver.Chrome] = []
+        self._pages: dict[int, int] = {}
+        self._leased = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def lease(self, timeout: float | None = None) -> webdriver.Chrome:
+        """Returns a healthy browser, waiting up to `timeout` seconds for a free one."""
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: self._closed or self._idle or self._leased < self._size, timeout
+            ):
+                raise TimeoutError(f"No browser became available within {timeout} seconds")
+            if self._closed:
+                raise RuntimeError("Webdriver pool is closed")
+            driver = self._idle.pop() if self._idle else None
+            self._leased += 1
+
+        try:
+            if driver is not None and not self._is_healthy(driver):
+                self._logger.warning("Replacing unresponsive browser ...")
+                self._quit(driver)
+                driver = None
+            if driver is None:
+                driver = self._webdriver_factory.create()
+                self._pages[id(driver)] = 0
+            return driver
+        except BaseException:
+            with self._condition:
+                self._leased -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, driver: webdriver.Chrome, broken: bool = False) -> None:
+        """Hands a leased browser back, recycling it when it is broken or worn out."""
+        recycle = broken or self._closed or self._is_worn_out(driver)
+        if recycle:
+            self._quit(driver)
+        with self._condition:
+            self._leased -= 1
+            if not recycle:
+                self._idle.append(driver)
+            self._condition.notify()
+
+    @contextmanager
+    def leased(self, timeout: float | None = None) -> Iterator[webdriver.Chrome]:
+        driver = self.lease(timeout)
+        broken = False
+        try:
+            yield driver
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            self.release(driver, broken=broken)
+
+    def record_page(self, driver: webdriver.Chrome) -> None:
+        """Counts a page loaded by a leased browser."""
+        self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+
+    def close(self) -> None:
+        """Quits idle browsers. Leased browsers are quit when they are released."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for driver in idle:
+            self._quit(driver)
+
+    def _is_healthy(self, driver: webdriver.Chrome) -> bool:
+        try:
+            return driver.execute_script("return 1") == 1
+        except WebDriverException:
+            return False
+
+    def _is_worn_out(self, driver: webdriver.Chrome) -> bool:
+        pages = self._pages.get(id(driver), 0)
+        if self._max_pages is not None and pages >= self._max_pages:
+            self._logger.info(f"Recycling browser after {pages} pages")
+            return True
+        if self._max_rss_mb is not None:
+            rss = self._rss(driver)
+            if rss is not None and rss > self._max_rss_mb * 1024 * 1024:
+                self._logger.info(f"Recycling browser using {rss / 1024 / 1024:.0f} MB")
+                return True
+        return False
+
+    @staticmethod
+    def _rss(driver: webdriver.Chrome) -> int | None:
+        process = getattr(getattr(driver, "service", None), "process", None)
+        pid = getattr(process, "pid", None)
+        return process_tree_rss(pid) if pid else None
+
+    def _quit(self, driver: webdriver.Chrome) -> None:
+        self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as err:
+            self._logger.warning(f"Failed to quit browser: {err}")
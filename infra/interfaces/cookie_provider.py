@@ -12,6 +12,17 @@ class CookieProvider(Protocol):
             url: The URL to provide cookies from
 
         Returns:
-            List of cookie dictionaries with 'name' and 'value' keys
+            List of cookie dictionaries with 'name' and 'value' keys and an optional
+            'expiry' key (unix timestamp in seconds)
+        """
+        ...
+
+    def invalidate(self, url: str) -> None:
+        """
+        Discards cookies previously provided for the given URL, e.g. after the server
+        rejected them. The next call to `provide` returns fresh cookies.
+
+        Args:
+            url: The URL the cookies were provided for
         """
         ...
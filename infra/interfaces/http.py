@@ -61,3 +61,27 @@ class HttpClient(Protocol):
     def request(self, method: str, url: str, **kwargs: Any) -> Any: ...
 
     def close(self) -> None: ...
+
+
+class AsyncHttpClient(Protocol):
+    """Protocol for asynchronous HTTP clients (httpx.AsyncClient, etc.)"""
+
+    headers: Any  # Header dict-like object
+
+    async def get(
+        self,
+        url: str,
+        *,
+        params: dict | None = None,
+        headers: dict | None = None,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> Any: ...
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> Any: ...
+
+    async def aclose(self) -> None: ...
+
+    async def __aenter__(self) -> "AsyncHttpClient": ...
+
+    async def __aexit__(self, *args: Any) -> None: ...
@@ -0,0 +1,90 @@
+import gzip
+import json
+import zlib
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO
+
+from core.entities.listing import Listing
+from infra.factory.logger import LoggerFactory
+
+
+@dataclass
+class ArchivedResponse:
+    listing: Listing
+    payload: dict
+
+
+class ResponseArchiveWriter:
+    """
+    Appends api responses to the archives of their runs. Archive files are opened on first
+    use and stay open until the writer is closed.
+    """
+
+    def __init__(self, archive: "ResponseArchive"):
+        self._archive = archive
+        self._files: dict[str, IO[bytes]] = {}
+
+    def write(self, listing: Listing, payload: dict) -> None:
+        run_id = listing.run_id or ResponseArchive.UNKNOWN_RUN_ID
+        file = self._files.get(run_id)
+        if file is None:
+            path = self._archive.path(run_id)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            file = self._files[run_id] = gzip.open(path, "ab")
+        record = {"listing": asdict(listing), "payload": payload}
+        file.write(json.dumps(record, ensure_ascii=False, default=str).encode("utf-8") + b"\n")
+
+    def close(self) -> None:
+        for file in self._files.values():
+            file.close()
+        self._files.clear()
+
+    def __enter__(self) -> "ResponseArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class ResponseArchive:
+    """
+    Append-only archive of raw api responses, stored as gzip compressed JSON lines with one
+    file per run (`<basedir>/<run_id>.jsonl.gz`).
+
+    Every writer session appends a new gzip member to the file, so archives can be extended by
+    later sessions of the same run. Reading stops at a member cut short by a crash.
+    """
+
+    UNKNOWN_RUN_ID = "unknown"
+
+    def __init__(self, basedir: str, logger_factory: LoggerFactory):
+        self._basedir = Path(basedir)
+        self._logger = logger_factory.create(self.__class__.__name__)
+
+    def path(self, run_id: str) -> Path:
+        return self._basedir / f"{run_id}.jsonl.gz"
+
+    def run_ids(self) -> list[str]:
+        """Ids of the archived runs, by name (not by time, run ids are random)."""
+        return sorted(
+            path.name.removesuffix(".jsonl.gz") for path in self._basedir.glob("*.jsonl.gz")
+        )
+
+    def writer(self) -> ResponseArchiveWriter:
+        return ResponseArchiveWriter(self)
+
+    def read(self, run_id: str) -> Iterator[ArchivedResponse]:
+        path = self.path(run_id)
+        try:
+            with gzip.open(path, "rb") as file:
+                for line in file:
+                    if not line.endswith(b"\n"):
+                        break  # unfinished record
+                    record = json.loads(line)
+                    yield ArchivedResponse(
+                        listing=Listing.from_dict(record["listing"]), payload=record["payload"]
+                    )
+        except (EOFError, gzip.BadGzipFile, zlib.error) as err:
+            self._logger.warning(f"Archive {path} ends with a truncated record: {err}")
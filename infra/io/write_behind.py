@@ -0,0 +1,140 @@
+import threading
+import time
+from collections.abc import Callable
+from queue import Empty, Queue
+from typing import Any, Generic, TypeVar
+
+from infra.factory.logger import LoggerFactory
+
+T = TypeVar("T")
+
+# queue markers, asking the writer thread to write what it holds or to stop
+_FLUSH = object()
+_CLOSE = object()
+
+
+class WriteBehindBuffer(Generic[T]):
+    """
+    Writes entities on a background thread, so scraping and database commits overlap instead
+    of taking turns.
+
+    Entities `put` into the buffer are written with `write_batch` once `batch_size` of them
+    were collected or the oldest of them waited `flush_interval` seconds. When a batch fails,
+    its entities are written one by one with `write_one`, so a single bad entity does not take
+    the batch with it. Written batches are passed to `on_written` and every entity that could
+    not be written to `on_failed`, both called on the writer thread.
+
+    At most `max_pending` entities wait to be written: `put` blocks while the buffer is full.
+    Used as a context manager, the buffer writes everything still pending when the block
+    exits, also when it exits with an error.
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[list[T]], Any],
+        write_one: Callable[[T], Any],
+        logger_factory: LoggerFactory,
+        batch_size: int = 500,
+        flush_interval: float = 5.0,
+        max_pending: int = 2000,
+        on_written: Callable[[list[T]], None] | None = None,
+        on_failed: Callable[[T, Exception], None] | None = None,
+    ):
+        self._write_batch = write_batch
+        self._write_one = write_one
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._on_written = on_written
+        self._on_failed = on_failed
+        self._queue: Queue = Queue(maxsize=max_pending)
+        self._written = 0
+        self._failed = 0
+        self._closed = False
+        self._logger = logger_factory.create(self.__class__.__name__)
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    @property
+    def written(self) -> int:
+        return self._written
+
+    @property
+    def failed(self) -> int:
+        return self._failed
+
+    def put(self, item: T) -> None:
+        if self._closed:
+            raise RuntimeError("Write-behind buffer is closed")
+        self._queue.put(item)
+
+    def flush(self) -> None:
+        """Blocks until every entity put so far was written (or failed)."""
+        self._queue.put(_FLUSH)
+        self._queue.join()
+
+    def close(self) -> None:
+        """Writes the pending entities and stops the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_CLOSE)
+        self._thread.join()
+        self._logger.debug(f"Closed after writing {self._written}, failing {self._failed}")
+
+    def __enter__(self) -> "WriteBehindBuffer[T]":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        batch: list[T] = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except Empty:
+                item = None  # the oldest entity of the batch waited long enough
+            else:
+                if item is not _FLUSH and item is not _CLOSE:
+                    batch.append(item)
+                    deadline = deadline or time.monotonic() + self._flush_interval
+                    if len(batch) < self._batch_size:
+                        continue
+
+            if batch:
+                self._write(batch)
+                for _ in batch:
+                    self._queue.task_done()
+                batch, deadline = [], None
+            if item is _FLUSH or item is _CLOSE:
+                self._queue.task_done()
+            if item is _CLOSE:
+                return
+
+    def _write(self, batch: list[T]) -> None:
+        try:
+            self._write_batch(batch)
+            self._written += len(batch)
+            self._notify(self._on_written, batch)
+            return
+        except Exception as err:
+            self._logger.warning(f"Failed to write {len(batch)} entities at once: {err}")
+
+        for item in batch:
+            try:
+                self._write_one(item)
+                self._written += 1
+                self._notify(self._on_written, [item])
+            except Exception as err:
+                self._failed += 1
+                self._notify(self._on_failed, item, err)
+
+    def _notify(self, callback: Callable | None, *args) -> None:
+        if callback is None:
+            return
+        try:
+            callback(*args)
+        except Exception as err:
+            self._logger.error(f"Write-behind callback failed: {err}", exc_info=True)
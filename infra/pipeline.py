@@ -0,0 +1,71 @@
+"""
+Steps of the pipeline tasks that do not depend on Airflow, used by `airflow/dags/pipeline.py`.
+"""
+
+from core.exceptions import IncompleteCrawlError
+
+
+def report_write_failure(kind, run_id, run_service, logger):
+    """
+    Returns a callback for failed writes of a write-behind buffer that logs the entity
+    and counts it as an error of the run.
+    """
+
+    def on_failed(entity, err):
+        logger.error(f"Failed to insert {kind}.id={entity.id}: {err}", exc_info=True)
+        run_service.update_metrics(run_id, num_errors=1)
+
+    return on_failed
+
+
+def process_brand(
+    brand,
+    run_id,
+    listing_scraper,
+    listing_service,
+    run_service,
+    watermark_service,
+    logger,
+    write_buffer,
+):
+    """
+    Scrapes the listings of a single brand and stores them through a write-behind buffer
+    created by `write_buffer`, so listings are written while the next pages are scraped.
+    The watermark of the brand is only advanced after a finished crawl.
+    """
+    logger.info(f"Processing brand: {brand.slug}")
+    watermark = watermark_service.get_watermark(brand.id)
+    inserted_ids = []
+    complete = True
+
+    with write_buffer(
+        write_batch=listing_service.insert_listings,
+        write_one=listing_service.insert_listing,
+        on_written=lambda listings: inserted_ids.extend(listing.id for listing in listings),
+        on_failed=report_write_failure("listing", run_id, run_service, logger),
+    ) as buffer:
+        try:
+            for listing in listing_scraper.run(brand, watermark=watermark):
+                listing.run_id = run_id
+                listing.brand_id = brand.id
+                buffer.put(listing)
+        except IncompleteCrawlError as err:
+            # the listings of the scraped pages are still stored
+            logger.warning(f"{err}, keeping the watermark")
+            run_service.update_metrics(run_id, num_errors=1)
+            complete = False
+
+    success_listings = buffer.written
+    failed_listings = buffer.failed
+    logger.info(f"Completed {brand.name}: {success_listings} listings")
+    run_service.update_metrics(run_id, num_listings=success_listings)
+    # only a finished crawl that stored every listing may move the watermark, pages it did
+    # not scrape would otherwise end up below the watermark and be skipped for good
+    if complete and not failed_listings:
+        watermark_service.advance(brand.id, inserted_ids, run_id)
+
+    return {
+        "success_listings": success_listings,
+        "failed_listings": failed_listings,
+        "complete": complete,
+    }
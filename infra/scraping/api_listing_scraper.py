@@ -0,0 +1,127 @@
+from collections.abc import Generator
+
+from backoff import expo, on_exception
+
+from core.entities.brand import Brand
+from core.entities.listing import Listing
+from core.entities.watermark import BrandWatermark
+from core.exceptions import IncompleteCrawlError, PageNotFoundError
+from infra.factory.clients.http import HttpClientFactory
+from infra.factory.logger import LoggerFactory
+from infra.interfaces.http import HttpClient
+from infra.scraping.base import Scraper
+from infra.scraping.listing_page import ListingPageParser
+from infra.scraping.listing_scraper import NEWEST_FIRST
+
+
+class ApiListingScraper(Scraper):
+    """
+    Listing scraper backed by the JSON search endpoint (`/api/search`) instead of rendered
+    search pages. It takes the same query parameters as the search page and yields the same
+    listings, page by page.
+
+    Search results are parsed by `ListingPageParser.parse_search_results`.
+    """
+
+    def __init__(
+        self,
+        logger_factory: LoggerFactory,
+        http_client_factory: HttpClientFactory,
+        created_gte: str = "-7+days",
+        timeout: float = 10.0,
+        base_url: str = "https://olx.ba",
+        incremental: bool = False,
+    ):
+        super().__init__(logger_factory)
+        self._http_client_factory = http_client_factory
+        self._base_url = base_url.rstrip("/")
+        self._timeout = timeout
+        self._created_gte = created_gte
+        self._incremental = incremental
+        self._page_parser = ListingPageParser(self._base_url)
+
+    @property
+    def scraper_id(self) -> str:
+        return "api_listing_scraper"
+
+    def run(
+        self, brand: Brand, watermark: BrandWatermark | None = None
+    ) -> Generator[Listing, None, None]:
+        """
+        Yields the listings of a brand, page by page. A page that is not found ends the
+        crawl. Raises `IncompleteCrawlError` after the listings of the scraped pages when any
+        other page could not be scraped.
+        """
+        try:
+            http_client = self._http_client_factory.create()
+            yield from self.scrape_listings(http_client, brand, watermark)
+        except IncompleteCrawlError:
+            raise
+        except Exception as err:
+            self._logger.error(
+                f"Unexpected error occurred during scraping brand_id={brand.id}: {err}"
+            )
+            raise IncompleteCrawlError(brand.id, str(err)) from err
+
+    def scrape_listings(
+        self,
+        http_client: HttpClient,
+        brand: Brand,
+        watermark: BrandWatermark | None = None,
+    ) -> Generator[Listing, None, None]:
+        next_page = 1
+        url_template = (
+            "{base_url}/api/search?attr=&attr_encoded=1&category_id=18&"
+            "brand={brand_id}&models=0&brands={brand_id}&page={page}&created_gte={created_gte}"
+        )
+        if self._incremental:
+            url_template += NEWEST_FIRST
+        while next_page:
+            url = url_template.format(
+                base_url=self._base_url,
+                brand_id=brand.id,
+                page=next_page,
+                created_gte=self._created_gte,
+            )
+            self._logger.info(f"Scraping listings from: {url}")
+            try:
+                page = self._page_parser.parse_search_results(
+                    self._get_search_results(url, http_client)
+                )
+                if self._reached_watermark(page.listings, watermark):
+                    self._logger.info(
+                        f"Reached watermark listing_id={watermark.listing_id} "
+                        f"of brand_id={brand.id}, stopping"
+                    )
+                    break
+                yield from page.listings
+                next_page = int(page.next_page) if page.next_page else None
+            except PageNotFoundError as err:
+                self._logger.info(f"{err}")
+                next_page = None
+            except Exception as err:
+                self._logger.error(
+                    f"Unexpected error occurred during scraping listings from url={url}: {err}"
+                )
+                raise IncompleteCrawlError(brand.id, f"url={url}: {err}") from err
+        self._logger.debug(f"No more pages left. Last page url: {url}")
+
+    @on_exception(
+        expo,
+        Exception,
+        max_tries=3,
+        max_time=60,
+        giveup=lambda e: isinstance(e, PageNotFoundError),
+    )
+    def _get_search_results(self, url: str, http_client: HttpClient) -> dict:
+        # requests are paced by the rate limiter of the http client
+        response = http_client.get(url, timeout=self._timeout)
+        if response.status_code == 404:
+            raise PageNotFoundError(url)
+        response.raise_for_status()
+        return response.json()
+
+    def _reached_watermark(self, listings: list[Listing], watermark: BrandWatermark | None) -> bool:
+        if not self._incremental or watermark is None or not listings:
+            return False
+        return all(watermark.covers(listing.id) for listing in listings)
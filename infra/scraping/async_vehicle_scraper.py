@@ -0,0 +1,153 @@
+import asyncio
+from collections.abc import AsyncGenerator, Generator
+
+from backoff import expo, on_exception
+from more_itertools import chunked
+
+from core.entities.listing import Listing
+from core.entities.vehicle import Vehicle
+from core.exceptions import SessionRejectedError
+from infra.factory.clients.http import HttpClientFactory
+from infra.factory.logger import LoggerFactory
+from infra.interfaces.http import AsyncHttpClient
+from infra.io.response_archive import ResponseArchive
+from infra.scraping.vehicle_scraper import VehicleScraper
+
+
+class AsyncVehicleScraper(VehicleScraper):
+    """
+    Vehicle scraper that keeps up to `concurrency` API requests in flight.
+
+    Listings are processed in sessions of `reinit_session_every` listings, each backed by a
+    fresh async http client. The request rate ceiling is enforced by the rate limiter of the
+    http clients. Vehicles are yielded in completion order, failed listings yield `None` just
+    like in the sequential scraper. Listings rejected by the api (401/403) are retried once in
+    a new session with fresh cookies.
+    """
+
+    def __init__(
+        self,
+        logger_factory: LoggerFactory,
+        http_client_factory: HttpClientFactory,
+        timeout: float = 10.0,
+        reinit_session_every: int = 500,
+        concurrency: int = 4,
+        base_url: str = "https://olx.ba",
+        response_archive: ResponseArchive | None = None,
+    ):
+        super().__init__(
+            logger_factory=logger_factory,
+            http_client_factory=http_client_factory,
+            timeout=timeout,
+            reinit_session_every=reinit_session_every,
+            base_url=base_url,
+            response_archive=response_archive,
+        )
+        self._concurrency = concurrency
+
+    @property
+    def scraper_id(self) -> str:
+        return "async_vehicle_scraper"
+
+    def run(self, listings: list[Listing]) -> Generator[Vehicle, None, None]:
+        loop = asyncio.new_event_loop()
+        vehicles = self._scrape(listings)
+        try:
+            while True:
+                try:
+                    vehicle = loop.run_until_complete(anext(vehicles))
+                except StopAsyncIteration:
+                    break
+                yield vehicle
+        except Exception as err:
+            self._logger.error(f"Unexpected error occurred during vehicle info scraping: {err}")
+        finally:
+            loop.run_until_complete(vehicles.aclose())
+            loop.close()
+            self._close_archive()
+
+    async def _scrape(self, listings: list[Listing]) -> AsyncGenerator[Vehicle | None, None]:
+        semaphore = asyncio.Semaphore(self._concurrency)
+        for session_listings in chunked(listings, self._reinit_session_every):
+            rejected: list[Listing] = []
+            async for vehicle in self._scrape_session(session_listings, semaphore, rejected):
+                yield vehicle
+            if rejected:
+                self._logger.warning(
+                    f"Session rejected for {len(rejected)} listings, refreshing cookies ..."
+                )
+                self._http_client_factory.invalidate_cookies()
+                async for vehicle in self._scrape_session(rejected, semaphore):
+                    yield vehicle
+
+    async def _scrape_session(
+        self,
+        listings: list[Listing],
+        semaphore: asyncio.Semaphore,
+        rejected: list[Listing] | None = None,
+    ) -> AsyncGenerator[Vehicle | None, None]:
+        """
+        Scrapes listings with a single http client. When `rejected` is given, listings whose
+        requests were rejected are collected there instead of being yielded as failures.
+        """
+        self._logger.info("Init async http client session ...")
+        async with self._http_client_factory.create_async(self._concurrency) as client:
+            tasks = [
+                asyncio.create_task(self._scrape_listing(listing, client, semaphore))
+                for listing in listings
+            ]
+            try:
+                for task in asyncio.as_completed(tasks):
+                    listing, vehicle, session_rejected = await task
+                    if session_rejected and rejected is not None:
+                        rejected.append(listing)
+                    else:
+                        yield vehicle
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _scrape_listing(
+        self,
+        listing: Listing,
+        http_client: AsyncHttpClient,
+        semaphore: asyncio.Semaphore,
+    ) -> tuple[Listing, Vehicle | None, bool]:
+        """Returns the listing, its vehicle and whether the api rejected the session."""
+        async with semaphore:
+            try:
+                vehicle = await self._get_vehicle_info_async(listing, http_client)
+                if vehicle is None:
+                    self._logger.info(
+                        f"Failed to extract vehicle details for listing: {listing.id}"
+                    )
+                return listing, vehicle, False
+            except SessionRejectedError as err:
+                self._logger.warning(f"{err} (listing.id={listing.id})")
+                return listing, None, True
+            except Exception as err:
+                self._logger.error(
+                    f"Unexpected error occurred during scraping listing.id={listing.id}: {err}"
+                )
+                return listing, None, False
+
+    @on_exception(
+        expo,
+        Exception,
+        max_tries=3,
+        max_time=60,
+        giveup=lambda e: isinstance(e, SessionRejectedError),
+    )
+    async def _get_vehicle_info_async(
+        self, listing: Listing, http_client: AsyncHttpClient
+    ) -> Vehicle | None:
+        request_url = self._get_request_url(listing)
+        self._logger.debug(f"Retrieving vehicle info from {request_url}")
+        response = await http_client.get(request_url, timeout=self._timeout)
+        self._check_session(request_url, response.status_code)
+        if not response.is_success:
+            return None
+        vehicle_data = response.json()
+        self._archive_response(listing, vehicle_data)
+        return self._build_vehicle(listing, vehicle_data)
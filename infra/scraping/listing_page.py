@@ -0,0 +1,192 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from lxml import etree
+
+from core.entities.listing import Listing
+from core.entities.price import PRICE_ON_REQUEST
+
+_HTML_PARSER = etree.HTMLParser(encoding="utf-8", recover=True)
+
+# compiled once, evaluated against a single tree per page
+_CARDS = etree.XPath("//a[starts-with(@href, '/artikal/')]")
+_CARD_TITLE = etree.XPath("(.//h1[contains(@class, 'main-heading')]/text())[1]")
+_CARD_PRICE = etree.XPath(
+    "(.//div[contains(@class, 'price-wrap')]//span[contains(@class, 'smaller')]/text())[1]"
+)
+_PAGINATION = etree.XPath("(//div[@class='olx-pagination-wrapper'])[1]")
+_NEXT_PAGE = etree.XPath("normalize-space(.//li[@class='active']/following-sibling::li[1]/text())")
+_PAGE_NUMBERS = etree.XPath(".//li/text()")
+
+# texts of the pages shown for missing or empty search results
+NOT_FOUND_PATTERNS = (
+    "Oprostite, ne možemo pronaći ovu stranicu",
+    "Nema rezultata za traženi pojam",
+)
+
+# Runs inside the loaded page and returns the same fields as the XPaths above (cards as
+# {href, title, price}, the next and the last page) plus whether the page is a not found page,
+# so the html never leaves the browser. Takes the not found patterns as its only argument.
+EXTRACT_PAGE_SCRIPT = """
+const patterns = arguments[0];
+const firstText = (elements) => {
+    for (const element of elements) {
+        const node = [...element.childNodes].find((child) => child.nodeType === Node.TEXT_NODE);
+        if (node) return node.textContent;
+    }
+    return null;
+};
+const notFound = patterns.some((p) => document.documentElement.textContent.includes(p));
+const cards = [...document.querySelectorAll("a[href^='/artikal/']")].map((card) => ({
+    href: card.getAttribute("href"),
+    title: firstText(card.querySelectorAll("h1[class*='main-heading']")),
+    price: firstText(card.querySelectorAll("div[class*='price-wrap'] span[class*='smaller']")),
+}));
+const pagination = document.querySelector("div[class='olx-pagination-wrapper']");
+let nextPage = null;
+let lastPage = null;
+if (pagination) {
+    let next = pagination.querySelector("li[class='active']")?.nextElementSibling;
+    while (next && next.tagName !== "LI") next = next.nextElementSibling;
+    nextPage = next ? (firstText([next]) || "").trim().replace(/\\s+/g, " ") || null : null;
+    for (const item of pagination.querySelectorAll("li")) {
+        for (const child of item.childNodes) {
+            const text = child.nodeType === Node.TEXT_NODE ? child.textContent.trim() : "";
+            if (/^\\d+$/.test(text)) lastPage = Math.max(lastPage ?? 0, Number(text));
+        }
+    }
+}
+return {not_found: notFound, listings: cards, next_page: nextPage, last_page: lastPage};
+"""
+
+
+@dataclass
+class ListingPage:
+    listings: list[Listing] = field(default_factory=list)
+    next_page: str | None = None
+    last_page: int | None = None
+
+
+class ListingPageParser:
+    """
+    Extracts the listing cards and the next page token of a search results page.
+
+    The page is parsed into a single lxml tree and every lookup runs a precompiled XPath
+    against it, so neither the page nor its cards or pagination are serialized and parsed
+    again. Cards without a title or price are skipped. The last page is the highest page
+    number shown by the pagination.
+    """
+
+    def __init__(self, base_url: str = "https://olx.ba"):
+        self._base_url = base_url.rstrip("/")
+
+    def parse(self, page_source: str) -> ListingPage:
+        root = self._parse_tree(page_source)
+        if root is None:
+            return ListingPage()
+        pagination = _PAGINATION(root)
+        return ListingPage(
+            listings=self._extract_listings(root),
+            next_page=self._extract_next_page(pagination),
+            last_page=self._extract_last_page(pagination),
+        )
+
+    def parse_script_result(self, result: dict) -> ListingPage:
+        """Builds the page from the result of `EXTRACT_PAGE_SCRIPT`."""
+        visited_at = datetime.now()
+        listings = []
+        for card in result.get("listings") or []:
+            if card.get("title") is None or card.get("price") is None:
+                continue
+            listing_url = f"{self._base_url}{card['href'].strip()}"
+            listings.append(
+                Listing(
+                    id=listing_url.split("/")[-1],
+                    url=listing_url,
+                    title=card["title"].strip(),
+                    price=card["price"].strip(),
+                    visited_at=visited_at,
+                )
+            )
+        return ListingPage(
+            listings=listings,
+            next_page=result.get("next_page") or None,
+            last_page=result.get("last_page"),
+        )
+
+    def parse_search_results(self, search_results: dict) -> ListingPage:
+        """
+        Builds the page from a response of the json search endpoint (`/api/search`). Every
+        result is expected to carry an `id`, a `title` and either a `display_price` (e.g.
+        "25.000 KM") or a numeric `price`. The `meta` object tells the current and the last
+        page.
+        """
+        visited_at = datetime.now()
+        listings = []
+        for item in search_results.get("data") or []:
+            listing_id = str(item["id"])
+            listings.append(
+                Listing(
+                    id=listing_id,
+                    url=f"{self._base_url}/artikal/{listing_id}",
+                    title=item.get("title") or "",
+                    price=self._format_price(item),
+                    visited_at=visited_at,
+                )
+            )
+        meta = search_results.get("meta") or {}
+        current_page = meta.get("current_page")
+        last_page = meta.get("last_page")
+        next_page = None
+        if listings and current_page is not None and last_page is not None:
+            next_page = str(current_page + 1) if current_page < last_page else None
+        return ListingPage(listings=listings, next_page=next_page, last_page=last_page)
+
+    @staticmethod
+    def _format_price(item: dict) -> str:
+        if item.get("display_price"):
+            return str(item["display_price"])
+        price = item.get("price")
+        if not price:
+            return PRICE_ON_REQUEST
+        # same format as the search page, e.g. 25.000 KM
+        return f"{int(price):,} KM".replace(",", ".")
+
+    @staticmethod
+    def _parse_tree(page_source: str) -> etree._Element | None:
+        if not page_source:
+            return None
+        return etree.fromstring(page_source.encode("utf-8"), parser=_HTML_PARSER)
+
+    def _extract_listings(self, root: etree._Element) -> list[Listing]:
+        visited_at = datetime.now()
+        listings = []
+        for card in _CARDS(root):
+            title = _CARD_TITLE(card)
+            price = _CARD_PRICE(card)
+            if not title or not price:
+                continue
+            listing_url = f"{self._base_url}{card.get('href').strip()}"
+            listings.append(
+                Listing(
+                    id=listing_url.split("/")[-1],
+                    url=listing_url,
+                    title=title[0].strip(),
+                    price=price[0].strip(),
+                    visited_at=visited_at,
+                )
+            )
+        return listings
+
+    @staticmethod
+    def _extract_next_page(pagination: list[etree._Element]) -> str | None:
+        if not pagination:
+            return None
+        return _NEXT_PAGE(pagination[0]) or None
+
+    @staticmethod
+    def _extract_last_page(pagination: list[etree._Element]) -> int | None:
+        if not pagination:
+            return None
+        pages = [int(text) for text in _PAGE_NUMBERS(pagination[0]) if text.strip().isdigit()]
+        return max(pages, default=None)
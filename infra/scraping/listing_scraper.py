@@ -1,20 +1,43 @@
-import random
+import base64
+import json
 import time
 from collections.abc import Generator
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from queue import Queue
+from typing import Literal
 
 from backoff import expo, on_exception
-from scrapy import Selector
 from selenium import webdriver
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.support.ui import WebDriverWait
 
 from core.entities.brand import Brand
 from core.entities.listing import Listing
-from core.exceptions import PageNotFoundError
+from core.entities.watermark import BrandWatermark
+from core.exceptions import IncompleteCrawlError, PageNotFoundError
 from infra.factory.logger import LoggerFactory
 from infra.factory.webdriver import WebdriverFactory
+from infra.factory.webdriver_pool import WebdriverPool
 from infra.scraping.base import Scraper
+from infra.scraping.listing_page import (
+    EXTRACT_PAGE_SCRIPT,
+    NOT_FOUND_PATTERNS,
+    ListingPage,
+    ListingPageParser,
+)
+from infra.scraping.readiness import (
+    READINESS_SCRIPTS,
+    PageWaitRecorder,
+    PageWaits,
+    Readiness,
+)
+from infra.utils.rate_limiter import HostRateLimiter
+
+# query parameters sorting the search results by newest first (used by incremental crawls)
+NEWEST_FIRST = "&sort_by=date&sort_order=desc"
+
+# path of the json endpoint the search page fetches its results from
+SEARCH_API_PATH = "/api/search"
 
 
 class ListingScraper(Scraper):
@@ -23,63 +46,258 @@ class ListingScraper(Scraper):
         logger_factory: LoggerFactory,
         webdriver_factory: WebdriverFactory,
         created_gte: str = "-7+days",
-        min_req_delay: float = 1.0,
-        max_req_delay: float = 3.0,
         timeout: float = 10.0,
+        rate_limiter: HostRateLimiter | None = None,
+        base_url: str = "https://olx.ba",
+        webdriver_pool: WebdriverPool | None = None,
+        incremental: bool = False,
+        page_concurrency: int = 1,
+        extraction: Literal["html", "script", "network"] = "html",
+        readiness: Readiness = "load",
     ):
         super().__init__(logger_factory)
         self._webdriver_factory = webdriver_factory
-        self._min_req_delay = min_req_delay
-        self._max_req_delay = max_req_delay
+        self._webdriver_pool = webdriver_pool
+        self._rate_limiter = rate_limiter
+        self._base_url = base_url.rstrip("/")
         self._timeout = timeout
         self._created_gte = created_gte
+        self._incremental = incremental
+        self._page_concurrency = page_concurrency
+        self._extraction = extraction
+        self._readiness = readiness
+        self._page_waits = PageWaitRecorder()
+        self._page_parser = ListingPageParser(self._base_url)
 
     @property
     def scraper_id(self) -> str:
         return "listing_scraper"
 
-    def run(self, brand: Brand) -> Generator[Listing, None, None]:
+    @property
+    def page_waits(self) -> PageWaits:
+        """How long pages took from being requested until they were ready, over all runs."""
+        return self._page_waits.summary()
+
+    def run(
+        self, brand: Brand, watermark: BrandWatermark | None = None
+    ) -> Generator[Listing, None, None]:
+        """
+        Yields the listings of a brand, see `scrape_listings`. Raises `IncompleteCrawlError`
+        after the listings of the scraped pages when the crawl stopped before its last page.
+        """
         driver = None
+        broken = False
         try:
-            driver = self._webdriver_factory.create()
-            yield from self.scrape_listings(driver, brand)
+            if self._webdriver_pool:
+                driver = self._webdriver_pool.lease()
+            else:
+                driver = self._webdriver_factory.create()
+            yield from self.scrape_listings(driver, brand, watermark)
+        except IncompleteCrawlError as err:
+            # the crawl may have stopped because the leased browser died
+            broken = self._breaks_driver(err.__cause__)
+            raise
         except Exception as err:
+            broken = isinstance(err, WebDriverException)
             self._logger.error(
                 f"Unexpected error occurred during scraping brand_id={brand.id}: {err}"
             )
+            raise IncompleteCrawlError(brand.id, str(err)) from err
         finally:
             if driver:
-                driver.quit()
+                self._return_driver(driver, broken=broken)
+            if self._rate_limiter:
+                state = self._rate_limiter.state(self._base_url)
+                self._logger.info(
+                    f"Pacing state after brand_id={brand.id}: rate={state.rate:.3f} req/s, "
+                    f"error_ratio={state.error_ratio:.2%} over last {state.requests} requests"
+                )
+            waits = self.page_waits
+            self._logger.info(
+                f"Page waits after brand_id={brand.id} ({self._readiness}): {waits.pages} pages, "
+                f"mean={waits.mean_seconds:.3f}s, p95={waits.p95_seconds:.3f}s, "
+                f"total={waits.total_seconds:.1f}s"
+            )
 
     def scrape_listings(
         self,
         driver: webdriver.Chrome,
         brand: Brand,
+        watermark: BrandWatermark | None = None,
     ) -> Generator[Listing, None, None]:
+        """
+        Yields the listings of every result page of a brand, each listing once. In incremental
+        mode results are sorted by newest first and paging stops at the first page holding only
+        listings covered by the brand's `watermark`.
+
+        With a `page_concurrency` above 1, the pages following the first one are fetched by up
+        to `page_concurrency` browsers at once and their listings are yielded in completion
+        order. Incremental crawls with a watermark are always paged one after another.
+
+        A page that is not found ends the crawl. Any other page that cannot be scraped stops
+        it with an `IncompleteCrawlError`, raised after the listings of the other pages.
+        """
+        seen: set[str] = set()
+        concurrent = self._page_concurrency > 1 and not (self._incremental and watermark)
         next_page = "1"
-        url_template = (
-            "https://olx.ba/pretraga?attr=&attr_encoded=1&category_id=18&"
-            "brand={brand_id}&models=0&brands={brand_id}&page={page}&created_gte={created_gte}"
-        )
         while next_page:
-            url = url_template.format(
-                brand_id=brand.id, page=next_page, created_gte=self._created_gte
-            )
+            url = self._get_page_url(brand, next_page)
             self._logger.info(f"Scraping listings from: {url}")
             try:
-                self._logger.debug(f"Retrieving page source: {url}")
-                page_source = self._get_page_source(url, driver)
-                self._logger.debug(f"Extracting listings: {url}")
-                page_listings = self._extract_listings(page_source)
-                yield from page_listings
-                self._logger.debug(f"Retrieving next page: {url}")
-                next_page = self._get_next_page(page_source)
+                self._logger.debug(f"Retrieving page: {url}")
+                page = self._get_page(url, driver)
+                if self._reached_watermark(page.listings, watermark):
+                    self._logger.info(
+                        f"Reached watermark listing_id={watermark.listing_id} "
+                        f"of brand_id={brand.id}, stopping"
+                    )
+                    break
+                yield from self._unseen(page.listings, seen)
+                if concurrent and page.next_page and page.last_page:
+                    remaining = range(int(page.next_page), page.last_page + 1)
+                    next_page = None
+                    yield from self._scrape_pages(driver, brand, remaining, seen)
+                else:
+                    next_page = page.next_page
+            except PageNotFoundError as err:
+                self._logger.info(f"{err}")
+                next_page = None
+            except IncompleteCrawlError:
+                raise
             except Exception as err:
                 self._logger.error(
                     f"Unexpected error occurred during scraping listings from url={url}: {err}"
                 )
+                raise IncompleteCrawlError(brand.id, f"url={url}: {err}") from err
         self._logger.debug(f"No more pages left. Last page url: {url}")
 
+    def _get_page_url(self, brand: Brand, page: str | int) -> str:
+        url = (
+            f"{self._base_url}/pretraga?attr=&attr_encoded=1&category_id=18&"
+            f"brand={brand.id}&models=0&brands={brand.id}&page={page}&created_gte={self._created_gte}"
+        )
+        return url + NEWEST_FIRST if self._incremental else url
+
+    @staticmethod
+    def _unseen(listings: list[Listing], seen: set[str]) -> Generator[Listing, None, None]:
+        # results shift between pages while new listings are published
+        for listing in listings:
+            if listing.id not in seen:
+                seen.add(listing.id)
+                yield listing
+
+    def _scrape_pages(
+        self,
+        driver: webdriver.Chrome,
+        brand: Brand,
+        pages: range,
+        seen: set[str],
+    ) -> Generator[Listing, None, None]:
+        """
+        Fetches pages concurrently with the given driver and browsers borrowed for the
+        duration of the call. Requests of all browsers share the rate limiter. Pages that
+        are not found are skipped, any other failed page raises an `IncompleteCrawlError`
+        once the listings of the other pages were yielded.
+        """
+        borrowed = self._borrow_drivers(min(self._page_concurrency, len(pages)) - 1)
+        drivers: Queue[webdriver.Chrome] = Queue()
+        for available in [driver, *borrowed]:
+            drivers.put(available)
+        # errors that broke a browser, by id of the browser
+        broken: dict[int, Exception] = {}
+        failed: list[int] = []
+
+        def fetch(page: int) -> list[Listing]:
+            page_driver = drivers.get()
+            url = self._get_page_url(brand, page)
+            try:
+                self._logger.info(f"Scraping listings from: {url}")
+                return self._get_page(url, page_driver).listings
+            except PageNotFoundError as err:
+                self._logger.info(f"{err}")
+                return []
+            except Exception as err:
+                failed.append(page)
+                if self._breaks_driver(err):
+                    broken[id(page_driver)] = err
+                self._logger.error(
+                    f"Unexpected error occurred during scraping listings from url={url}: {err}"
+                )
+                return []
+            finally:
+                drivers.put(page_driver)
+
+        self._logger.info(
+            f"Fetching {len(pages)} pages of brand_id={brand.id} "
+            f"with {len(borrowed) + 1} browsers ..."
+        )
+        executor = ThreadPoolExecutor(
+            max_workers=len(borrowed) + 1, thread_name_prefix=self.scraper_id
+        )
+        try:
+            futures = [executor.submit(fetch, page) for page in pages]
+            for future in as_completed(futures):
+                yield from self._unseen(future.result(), seen)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            for borrowed_driver in borrowed:
+                self._return_driver(borrowed_driver, broken=id(borrowed_driver) in broken)
+        if failed:
+            # the given driver is returned by the caller, which checks the cause
+            raise IncompleteCrawlError(
+                brand.id, f"failed to scrape pages {sorted(failed)}"
+            ) from broken.get(id(driver))
+
+    @staticmethod
+    def _breaks_driver(err: BaseException | None) -> bool:
+        """Whether the browser that raised the error can no longer be used, e.g. it crashed."""
+        return isinstance(err, WebDriverException) and not isinstance(err, TimeoutException)
+
+    def _borrow_drivers(self, count: int) -> list[webdriver.Chrome]:
+        drivers = []
+        for _ in range(count):
+            try:
+                if self._webdriver_pool:
+                    # only idle browsers or free pool slots, never wait for other scrapers
+                    drivers.append(self._webdriver_pool.lease(timeout=0))
+                else:
+                    drivers.append(self._webdriver_factory.create())
+            except Exception as err:
+                self._logger.warning(f"Could not get another browser: {err!r}")
+                break
+        return drivers
+
+    def _return_driver(self, driver: webdriver.Chrome, broken: bool = False) -> None:
+        if self._webdriver_pool:
+            self._webdriver_pool.release(driver, broken=broken)
+        else:
+            driver.quit()
+
+    def _get_page(self, url: str, driver: webdriver.Chrome) -> ListingPage:
+        if self._extraction == "script":
+            return self._page_parser.parse_script_result(self._get_script_result(url, driver))
+        if self._extraction == "network":
+            return self._get_captured_page(url, driver)
+        return self._page_parser.parse(self._get_page_source(url, driver))
+
+    def _load_page(self, url: str, driver: webdriver.Chrome) -> None:
+        if self._rate_limiter:
+            waited = self._rate_limiter.acquire(url)
+            self._logger.debug(f"Waited {waited:.4f} seconds for a request slot.")
+        started = time.monotonic()
+        driver.get(url)
+        if self._webdriver_pool:
+            self._webdriver_pool.record_page(driver)
+        ready_script = READINESS_SCRIPTS[self._readiness]
+        WebDriverWait(driver, self._timeout).until(
+            lambda d: d.execute_script(ready_script, NOT_FOUND_PATTERNS)
+        )
+        waited = time.monotonic() - started
+        self._page_waits.record(waited)
+        self._logger.debug(f"Page ready ({self._readiness}) after {waited:.3f} seconds: {url}")
+        if self._rate_limiter:
+            self._rate_limiter.record_success(url)
+
     @on_exception(
         expo,
         Exception,
@@ -89,65 +307,115 @@ class ListingScraper(Scraper):
     )
     def _get_page_source(self, url: str, driver: webdriver.Chrome) -> str:
         try:
-            req_delay = random.uniform(self._min_req_delay, self._max_req_delay)
-            self._logger.debug(f"Sleeping before request for {req_delay:.4f} seconds.")
-            time.sleep(req_delay)
-            driver.get(url)
-            WebDriverWait(driver, self._timeout).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
+            self._load_page(url, driver)
+        except TimeoutException as err:
             if self._check_page_unk(driver.page_source):
-                raise PageNotFoundError(url)
-            return driver.page_source
+                raise PageNotFoundError(url) from err
+            if self._rate_limiter:
+                self._rate_limiter.record_failure(url)
+            raise err  # re-raise the error to continue backoff
+        page_source = driver.page_source
+        if self._check_page_unk(page_source):
+            raise PageNotFoundError(url)
+        return page_source
+
+    @on_exception(
+        expo,
+        Exception,
+        max_tries=3,
+        max_time=60,
+        giveup=lambda e: isinstance(e, PageNotFoundError),
+    )
+    def _get_script_result(self, url: str, driver: webdriver.Chrome) -> dict:
+        """Loads the page and extracts it inside the browser, see `EXTRACT_PAGE_SCRIPT`."""
+        try:
+            self._load_page(url, driver)
+        except TimeoutException as err:
+            if driver.execute_script(EXTRACT_PAGE_SCRIPT, NOT_FOUND_PATTERNS)["not_found"]:
+                raise PageNotFoundError(url) from err
+            if self._rate_limiter:
+                self._rate_limiter.record_failure(url)
+            raise err  # re-raise the error to continue backoff
+        result = driver.execute_script(EXTRACT_PAGE_SCRIPT, NOT_FOUND_PATTERNS)
+        if result["not_found"]:
+            raise PageNotFoundError(url)
+        return result
+
+    @on_exception(
+        expo,
+        Exception,
+        max_tries=3,
+        max_time=60,
+        giveup=lambda e: isinstance(e, PageNotFoundError),
+    )
+    def _get_captured_page(self, url: str, driver: webdriver.Chrome) -> ListingPage:
+        """
+        Loads the page and builds it from the json search results the front end fetched while
+        loading it, read from the performance log of the browser (see `performance_logging` of
+        the webdriver factory). Falls back to parsing the html when no search results with
+        listings were captured.
+        """
+        self._drain_performance_log(driver)
+        try:
+            self._load_page(url, driver)
         except TimeoutException as err:
             if self._check_page_unk(driver.page_source):
                 raise PageNotFoundError(url) from err
+            if self._rate_limiter:
+                self._rate_limiter.record_failure(url)
             raise err  # re-raise the error to continue backoff
+        search_results = self._capture_search_results(driver)
+        if search_results and search_results.get("data"):
+            return self._page_parser.parse_search_results(search_results)
+        self._logger.debug(f"No search results captured for {url}, parsing the page instead.")
+        page_source = driver.page_source
+        if self._check_page_unk(page_source):
+            raise PageNotFoundError(url)
+        return self._page_parser.parse(page_source)
 
-    def _check_page_unk(self, page_source: str) -> bool:
-        patterns_404 = [
-            "Oprostite, ne možemo pronaći ovu stranicu",
-            "Nema rezultata za traženi pojam",
+    def _drain_performance_log(self, driver: webdriver.Chrome) -> list[dict]:
+        """Returns the network events logged since the last call, dropping them from the log."""
+        try:
+            entries = driver.get_log("performance")
+        except WebDriverException as err:
+            self._logger.debug(f"Performance log is not available: {err}")
+            return []
+        events = []
+        for entry in entries:
+            try:
+                events.append(json.loads(entry["message"])["message"])
+            except (KeyError, TypeError, ValueError):
+                continue
+        return events
+
+    def _capture_search_results(self, driver: webdriver.Chrome) -> dict | None:
+        """Returns the body of the last json search response received by the page."""
+        responses = [
+            event["params"]
+            for event in self._drain_performance_log(driver)
+            if event.get("method") == "Network.responseReceived"
         ]
-        page_not_exists = any(p in page_source for p in patterns_404)
-        return page_not_exists
-
-    def _extract_listings(self, page_source: str) -> list[Listing]:
-        page_selector = Selector(text=page_source)
-        listings_selector = "//a[starts-with(@href, '/artikal/')]"
-        listing_cards = page_selector.xpath(listings_selector).getall()
-        listings = []
-        for card in listing_cards:
-            card_selector = Selector(text=card)
-            url_suffix = card_selector.xpath("//@href").get().strip()
-            listing_url = f"https://olx.ba{url_suffix}"
-            listing_id = listing_url.split("/")[-1]
-            title_selector = "//h1[contains(@class, 'main-heading')]/text()"
-            listing_title = card_selector.xpath(title_selector).get().strip()
-            price_selector = (
-                "//div[contains(@class, 'price-wrap')]//span[contains(@class, 'smaller')]/text()"
-            )
-            listing_price = card_selector.xpath(price_selector).get().strip()
-            listings.append(
-                Listing(
-                    id=listing_id,
-                    url=listing_url,
-                    title=listing_title,
-                    price=listing_price,
-                    visited_at=datetime.now(),
+        for params in reversed(responses):
+            response = params.get("response") or {}
+            if SEARCH_API_PATH not in response.get("url", ""):
+                continue
+            if "json" not in response.get("mimeType", ""):
+                continue
+            try:
+                body = driver.execute_cdp_cmd(
+                    "Network.getResponseBody", {"requestId": params["requestId"]}
                 )
-            )
-        return listings
-
-    def _get_next_page(self, page_source: str) -> str | None:
-        selector = Selector(text=page_source)
-        pagination_selector = "//div[@class='olx-pagination-wrapper']"
-        pagination_item = selector.xpath(pagination_selector).get()
-        if not pagination_item:
-            self._logger.debug("No pagination item found...")
-            return None
-        next_page_selector = (
-            "normalize-space(//li[@class='active']/following-sibling::li[1]/text())"
-        )
-        next_page = Selector(text=pagination_item).xpath(next_page_selector).get()
-        return next_page or None
+                if body.get("base64Encoded"):
+                    return json.loads(base64.b64decode(body["body"]))
+                return json.loads(body["body"])
+            except (WebDriverException, KeyError, TypeError, ValueError) as err:
+                self._logger.debug(f"Failed to read search response {response['url']}: {err}")
+        return None
+
+    def _reached_watermark(self, listings: list[Listing], watermark: BrandWatermark | None) -> bool:
+        if not self._incremental or watermark is None or not listings:
+            return False
+        return all(watermark.covers(listing.id) for listing in listings)
+
+    def _check_page_unk(self, page_source: str) -> bool:
+        return any(p in page_source for p in NOT_FOUND_PATTERNS)
@@ -0,0 +1,85 @@
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Literal
+
+# when a loaded search page can be read:
+#   load         - the page and all of its subresources are loaded (document.readyState)
+#   cards        - the document is parsed and holds listing cards
+#   pagination   - the pagination below the listing cards is rendered
+#   network_idle - the document is parsed and no response arrived for NETWORK_IDLE_MS
+# every condition is met by a loaded page and by a not found page, so none waits longer than
+# "load" does
+Readiness = Literal["load", "cards", "pagination", "network_idle"]
+
+NETWORK_IDLE_MS = 500
+
+# evaluated by the browser until they return true, take the not found patterns as argument
+_NOT_FOUND = """
+const notFound = () => document.body !== null
+    && arguments[0].some((p) => document.body.textContent.includes(p));
+if (document.readyState === "complete") return true;
+"""
+READINESS_SCRIPTS: dict[str, str] = {
+    "load": 'return document.readyState === "complete";',
+    "cards": _NOT_FOUND
+    + """
+return document.readyState !== "loading"
+    && (document.querySelector("a[href^='/artikal/']") !== null || notFound());
+""",
+    "pagination": _NOT_FOUND
+    + """
+return document.querySelector("div[class='olx-pagination-wrapper']") !== null || notFound();
+""",
+    # resource timing only lists finished requests, so a response still in flight does not
+    # keep the page from being idle
+    "network_idle": _NOT_FOUND
+    + f"""
+if (document.readyState === "loading") return false;
+const [navigation] = performance.getEntriesByType("navigation");
+const lastResponse = performance.getEntriesByType("resource").reduce(
+    (last, entry) => Math.max(last, entry.responseEnd), navigation ? navigation.responseEnd : 0
+);
+return performance.now() - lastResponse >= {NETWORK_IDLE_MS};
+""",
+}
+
+
+@dataclass
+class PageWaits:
+    pages: int
+    total_seconds: float
+    mean_seconds: float
+    p95_seconds: float
+
+
+class PageWaitRecorder:
+    """
+    Collects how long pages took from being requested until they were ready. Totals cover
+    every recorded page, the 95th percentile the last `window` pages. Safe to share between
+    threads.
+    """
+
+    def __init__(self, window: int = 10_000):
+        self._samples: deque[float] = deque(maxlen=window)
+        self._pages = 0
+        self._total = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self._pages += 1
+            self._total += seconds
+
+    def summary(self) -> PageWaits:
+        with self._lock:
+            samples = sorted(self._samples)
+            pages, total = self._pages, self._total
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))] if samples else 0.0
+        return PageWaits(
+            pages=pages,
+            total_seconds=total,
+            mean_seconds=total / pages if pages else 0.0,
+            p95_seconds=p95,
+        )
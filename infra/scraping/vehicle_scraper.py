@@ -1,5 +1,3 @@
-import random
-import time
 from collections.abc import Generator
 from dataclasses import asdict
 
@@ -8,11 +6,96 @@ from more_itertools import first
 
 from core.entities.listing import Listing
 from core.entities.vehicle import Vehicle
+from core.exceptions import SessionRejectedError
 from infra.factory.clients.http import HttpClientFactory
 from infra.factory.logger import LoggerFactory
 from infra.interfaces.http import HttpClient
+from infra.io.response_archive import ResponseArchive, ResponseArchiveWriter
 from infra.scraping.base import Scraper
-from infra.utils.parsing import get_attribute_value
+from infra.utils.parsing import AttributeExtractor, AttributeMapping
+
+# api attribute labels and the vehicle fields they are stored in
+VEHICLE_ATTRIBUTES = AttributeExtractor(
+    [
+        AttributeMapping("Gorivo", "fuel_type"),
+        AttributeMapping("Godište", "build_year"),
+        AttributeMapping("Kilometraža", "mileage"),
+        AttributeMapping("Kubikaža", "engine_volume"),
+        AttributeMapping("Snaga motora (KW)", "engine_power"),
+        AttributeMapping("Broj vrata", "num_doors"),
+        AttributeMapping("Transmisija", "transmission"),
+        AttributeMapping("Konjskih snaga", "horsepower"),
+        AttributeMapping("Masa/Težina (kg)", "weight_kg"),
+        AttributeMapping("Tip", "vehicle_type"),
+        AttributeMapping("Klimatizacija", "climate"),
+        AttributeMapping("Muzika/ozvučenje", "audio"),
+        AttributeMapping("Parking senzori", "parking_sensors"),
+        AttributeMapping("Parking kamera", "parking_camera"),
+        AttributeMapping("Pogon", "drivetrain"),
+        AttributeMapping("Godina prve registracije", "year_first_registered"),
+        AttributeMapping("Registrovan do", "registered_until"),
+        AttributeMapping("Boja", "color"),
+        AttributeMapping("Broj stepeni prijenosa", "gears"),
+        AttributeMapping("Posjeduje gume", "tyres"),
+        AttributeMapping("Emisioni standard", "emission"),
+        AttributeMapping("Vrsta enterijera", "interior"),
+        AttributeMapping("Rolo zavjese", "curtains"),
+        AttributeMapping("Svjetla", "lights"),
+        AttributeMapping("Sjedećih mjesta", "number_of_seats"),
+        AttributeMapping("Veličina felgi", "rim_size"),
+        AttributeMapping("Garancija", "warranty"),
+        AttributeMapping("Zaštita/Blokada", "security"),
+        AttributeMapping("Broj prethodnih vlasnika", "previous_owners"),
+        AttributeMapping("Datum objave", "published_at"),
+        AttributeMapping("Registrovan", "registered"),
+        AttributeMapping("Metalik", "metallic"),
+        AttributeMapping("Alu felge", "alloy_wheels"),
+        AttributeMapping("Digitalna klima", "digital_air_conditioning"),
+        AttributeMapping("Komande na volanu", "steering_wheel_controls"),
+        AttributeMapping("Navigacija", "navigation"),
+        AttributeMapping("Touch screen (ekran)", "touch_screen"),
+        AttributeMapping("Head up display", "heads_up_display"),
+        AttributeMapping("USB port", "usb_port"),
+        AttributeMapping("Tempomat", "cruise_control"),
+        AttributeMapping("Bluetooth", "bluetooth"),
+        AttributeMapping("Car play", "car_play"),
+        AttributeMapping("Senzor kiše", "rain_sensor"),
+        AttributeMapping("Park assist", "park_assist"),
+        AttributeMapping("Senzor auto. svjetla", "automatic_light_sensor"),
+        AttributeMapping("Senzor mrtvog ugla", "blind_spot_sensor"),
+        AttributeMapping("Start-Stop sistem", "start_stop_system"),
+        AttributeMapping("Hill assist", "hill_assist"),
+        AttributeMapping("Memorija sjedišta", "seat_memory"),
+        AttributeMapping("Masaža sjedišta", "seat_massage"),
+        AttributeMapping("Grijanje sjedišta", "seat_heating"),
+        AttributeMapping("Hlađenje sjedišta", "seat_cooling"),
+        AttributeMapping("El. podizači stakala", "electric_windows"),
+        AttributeMapping("El. pomjeranje sjedišta", "electric_seat_adjustment"),
+        AttributeMapping("Naslon za ruku", "armrest"),
+        AttributeMapping("Panorama krov", "panoramic_roof"),
+        AttributeMapping("Šiber", "sunroof"),
+        AttributeMapping("Maglenke", "fog_lights"),
+        AttributeMapping("Električni retrovizori", "electric_mirrors"),
+        AttributeMapping("Alarm", "alarm"),
+        AttributeMapping("Centralna brava", "central_lock"),
+        AttributeMapping("Daljinsko otključavanje", "remote_unlock"),
+        AttributeMapping("Airbag", "airbag"),
+        AttributeMapping("ABS", "abs"),
+        AttributeMapping("ESP", "electronic_stability"),
+        AttributeMapping("DPF/FAP filter", "dpf_fap_filter"),
+        AttributeMapping("Servo volan", "power_steering"),
+        AttributeMapping("Turbo", "turbo"),
+        AttributeMapping("ISOFIX", "isofix"),
+        AttributeMapping("Auto kuka", "tow_hook"),
+        AttributeMapping("Ocarinjen", "customs_cleared"),
+        AttributeMapping("Strane tablice", "foreign_license_plates"),
+        AttributeMapping("Na lizingu", "on_lease"),
+        AttributeMapping("Servisna knjiga", "service_history"),
+        AttributeMapping("Udaren", "damaged"),
+        AttributeMapping("Prilagođen invalidima", "disabled_accessible"),
+        AttributeMapping("Oldtimer", "oldtimer"),
+    ]
+)
 
 
 class VehicleScraper(Scraper):
@@ -20,32 +103,62 @@ class VehicleScraper(Scraper):
         self,
         logger_factory: LoggerFactory,
         http_client_factory: HttpClientFactory,
-        min_req_delay: float = 1.0,
-        max_req_delay: float = 3.0,
         timeout: float = 10.0,
         reinit_session_every: int = 500,
+        base_url: str = "https://olx.ba",
+        response_archive: ResponseArchive | None = None,
+        max_session_refreshes: int = 3,
     ):
         super().__init__(logger_factory)
         self._http_client_factory = http_client_factory
-        self._min_req_delay = min_req_delay
-        self._max_req_delay = max_req_delay
         self._timeout = timeout
         self._reinit_session_every = reinit_session_every
+        self._max_session_refreshes = max_session_refreshes
+        self._base_url = base_url.rstrip("/")
+        self._response_archive = response_archive
+        self._archive_writer: ResponseArchiveWriter | None = None
 
     @property
     def scraper_id(self) -> str:
         return "vehicle_scraper"
 
     def run(self, listings: list[Listing]) -> Generator[Vehicle, None, None]:
+        """
+        Yields the vehicle of every listing, `None` when it could not be scraped. A rejected
+        session gets fresh cookies once per listing. After `max_session_refreshes` refreshes
+        in a row that were still rejected, the site is taken to block the session and the
+        remaining listings are yielded as `None` without sending any requests.
+        """
         try:
             http_client = self._http_client_factory.create()
+            rejected_refreshes = 0
             for idx, listing in enumerate(listings, start=1):
                 vehicle = None
+                if rejected_refreshes >= self._max_session_refreshes:
+                    yield vehicle
+                    continue
                 try:
                     if idx % self._reinit_session_every == 0:
                         self._logger.info("Reinit http client session ...")
                         http_client = self._http_client_factory.create()
-                    vehicle = self._get_vehicle_info(listing, http_client)
+                    try:
+                        vehicle = self._get_vehicle_info(listing, http_client)
+                    except SessionRejectedError as err:
+                        self._logger.warning(f"{err}, refreshing cookies ...")
+                        self._http_client_factory.invalidate_cookies()
+                        http_client = self._http_client_factory.create()
+                        try:
+                            vehicle = self._get_vehicle_info(listing, http_client)
+                            rejected_refreshes = 0
+                        except SessionRejectedError:
+                            rejected_refreshes += 1
+                            if rejected_refreshes >= self._max_session_refreshes:
+                                self._logger.error(
+                                    f"Session still rejected after {rejected_refreshes} cookie "
+                                    f"refreshes in a row, skipping the remaining "
+                                    f"{len(listings) - idx} listings"
+                                )
+                            raise
                     if vehicle is None:
                         self._logger.info(
                             f"Failed to extract vehicle details for listing: {listing.id}"
@@ -57,121 +170,80 @@ class VehicleScraper(Scraper):
                 yield vehicle
         except Exception as err:
             self._logger.error(f"Unexpected error occurred during vehicle info scraping: {err}")
+        finally:
+            self._close_archive()
+
+    def reparse(self, run_id: str) -> Generator[Vehicle | None, None, None]:
+        """
+        Rebuilds vehicles from the api responses archived for the given run, without any
+        network access. Responses that can no longer be parsed yield `None`.
+        """
+        if self._response_archive is None:
+            raise ValueError("Reparsing requires a response archive")
+        for response in self._response_archive.read(run_id):
+            try:
+                yield self._build_vehicle(response.listing, response.payload)
+            except Exception as err:
+                self._logger.error(
+                    f"Failed to reparse listing.id={response.listing.id} of run {run_id}: {err}"
+                )
+                yield None
 
-    @on_exception(expo, Exception, max_tries=3, max_time=60)
+    @on_exception(
+        expo,
+        Exception,
+        max_tries=3,
+        max_time=60,
+        giveup=lambda e: isinstance(e, SessionRejectedError),
+    )
     def _get_vehicle_info(self, listing: Listing, http_client: HttpClient):
-        req_delay = random.uniform(self._min_req_delay, self._max_req_delay)
-        self._logger.debug(f"Sleeping before request for {req_delay:.4f} seconds.")
-        time.sleep(req_delay)
-        request_url = f"https://olx.ba/api/listings/{listing.id}"
+        # requests are paced by the rate limiter of the http client
+        request_url = self._get_request_url(listing)
         self._logger.debug(f"Retrieving vehicle info from {request_url}")
         response = http_client.get(request_url, timeout=self._timeout)
+        self._check_session(request_url, response.status_code)
         if not response.ok:
             return None
-        parsed_data = self._parse_vehicle_info(response.json())
+        vehicle_data = response.json()
+        self._archive_response(listing, vehicle_data)
+        return self._build_vehicle(listing, vehicle_data)
+
+    def _archive_response(self, listing: Listing, vehicle_data: dict) -> None:
+        if self._response_archive is None:
+            return
+        try:
+            if self._archive_writer is None:
+                self._archive_writer = self._response_archive.writer()
+            self._archive_writer.write(listing, vehicle_data)
+        except Exception as err:
+            self._logger.error(f"Failed to archive response of listing.id={listing.id}: {err}")
+
+    def _close_archive(self) -> None:
+        if self._archive_writer is not None:
+            self._archive_writer.close()
+            self._archive_writer = None
+
+    @staticmethod
+    def _check_session(url: str, status_code: int) -> None:
+        if status_code in (401, 403):
+            raise SessionRejectedError(url, status_code)
+
+    def _get_request_url(self, listing: Listing) -> str:
+        return f"{self._base_url}/api/listings/{listing.id}"
+
+    def _build_vehicle(self, listing: Listing, vehicle_data: dict) -> Vehicle:
+        parsed_data = self._parse_vehicle_info(vehicle_data)
         listing_data = asdict(listing)
         listing_data.pop("run_id", None)
         listing_data["last_visited_at"] = listing_data.pop("visited_at", None)
         return Vehicle.from_dict(listing_data | parsed_data)
 
     def _parse_vehicle_info(self, vehicle_data: dict) -> dict:
-        attributes = vehicle_data.get("attributes") or {}
-        attributes = {attr["name"]: attr for attr in attributes}
         return {
             "location": (first(vehicle_data.get("cities") or [], default=None) or {}).get("name"),
             "state": vehicle_data.get("state"),
             "brand": (vehicle_data.get("brand") or {}).get("name"),
             "model": (vehicle_data.get("model") or {}).get("name"),
-            "fuel_type": get_attribute_value(attributes.get("Gorivo") or {}),
-            "build_year": get_attribute_value(attributes.get("Godište") or {}),
-            "mileage": get_attribute_value(attributes.get("Kilometraža") or {}),
-            "engine_volume": get_attribute_value(attributes.get("Kubikaža") or {}),
-            "engine_power": get_attribute_value(attributes.get("Snaga motora (KW)") or {}),
-            "num_doors": get_attribute_value(attributes.get("Broj vrata") or {}),
-            "transmission": get_attribute_value(attributes.get("Transmisija") or {}),
             "image_url": first(vehicle_data.get("images") or [], default=None),
-            "horsepower": get_attribute_value(attributes.get("Konjskih snaga") or {}),
-            "weight_kg": get_attribute_value(attributes.get("Masa/Težina (kg)") or {}),
-            "vehicle_type": get_attribute_value(attributes.get("Tip") or {}),
-            "climate": get_attribute_value(attributes.get("Klimatizacija") or {}),
-            "audio": get_attribute_value(attributes.get("Muzika/ozvučenje") or {}),
-            "parking_sensors": get_attribute_value(attributes.get("Parking senzori") or {}),
-            "parking_camera": get_attribute_value(attributes.get("Parking kamera") or {}),
-            "drivetrain": get_attribute_value(attributes.get("Pogon") or {}),
-            "year_first_registered": get_attribute_value(
-                attributes.get("Godina prve registracije") or {}
-            ),
-            "registered_until": get_attribute_value(attributes.get("Registrovan do") or {}),
-            "color": get_attribute_value(attributes.get("Boja") or {}),
-            "gears": get_attribute_value(attributes.get("Broj stepeni prijenosa") or {}),
-            "tyres": get_attribute_value(attributes.get("Posjeduje gume") or {}),
-            "emission": get_attribute_value(attributes.get("Emisioni standard") or {}),
-            "interior": get_attribute_value(attributes.get("Vrsta enterijera") or {}),
-            "curtains": get_attribute_value(attributes.get("Rolo zavjese") or {}),
-            "lights": get_attribute_value(attributes.get("Svjetla") or {}),
-            "number_of_seats": get_attribute_value(attributes.get("Sjedećih mjesta") or {}),
-            "rim_size": get_attribute_value(attributes.get("Veličina felgi") or {}),
-            "warranty": get_attribute_value(attributes.get("Garancija") or {}),
-            "security": get_attribute_value(attributes.get("Zaštita/Blokada") or {}),
-            "previous_owners": get_attribute_value(
-                attributes.get("Broj prethodnih vlasnika") or {}
-            ),
-            "published_at": get_attribute_value(attributes.get("Datum objave") or {}),
-            "registered": get_attribute_value(attributes.get("Registrovan") or {}),
-            "metallic": get_attribute_value(attributes.get("Metalik") or {}),
-            "alloy_wheels": get_attribute_value(attributes.get("Alu felge") or {}),
-            "digital_air_conditioning": get_attribute_value(
-                attributes.get("Digitalna klima") or {}
-            ),
-            "steering_wheel_controls": get_attribute_value(
-                attributes.get("Komande na volanu") or {}
-            ),
-            "navigation": get_attribute_value(attributes.get("Navigacija") or {}),
-            "touch_screen": get_attribute_value(attributes.get("Touch screen (ekran)") or {}),
-            "heads_up_display": get_attribute_value(attributes.get("Head up display") or {}),
-            "usb_port": get_attribute_value(attributes.get("USB port") or {}),
-            "cruise_control": get_attribute_value(attributes.get("Tempomat") or {}),
-            "bluetooth": get_attribute_value(attributes.get("Bluetooth") or {}),
-            "car_play": get_attribute_value(attributes.get("Car play") or {}),
-            "rain_sensor": get_attribute_value(attributes.get("Senzor kiše") or {}),
-            "park_assist": get_attribute_value(attributes.get("Park assist") or {}),
-            "automatic_light_sensor": get_attribute_value(
-                attributes.get("Senzor auto. svjetla") or {}
-            ),
-            "blind_spot_sensor": get_attribute_value(attributes.get("Senzor mrtvog ugla") or {}),
-            "start_stop_system": get_attribute_value(attributes.get("Start-Stop sistem") or {}),
-            "hill_assist": get_attribute_value(attributes.get("Hill assist") or {}),
-            "seat_memory": get_attribute_value(attributes.get("Memorija sjedišta") or {}),
-            "seat_massage": get_attribute_value(attributes.get("Masaža sjedišta") or {}),
-            "seat_heating": get_attribute_value(attributes.get("Grijanje sjedišta") or {}),
-            "seat_cooling": get_attribute_value(attributes.get("Hlađenje sjedišta") or {}),
-            "electric_windows": get_attribute_value(attributes.get("El. podizači stakala") or {}),
-            "electric_seat_adjustment": get_attribute_value(
-                attributes.get("El. pomjeranje sjedišta") or {}
-            ),
-            "armrest": get_attribute_value(attributes.get("Naslon za ruku") or {}),
-            "panoramic_roof": get_attribute_value(attributes.get("Panorama krov") or {}),
-            "sunroof": get_attribute_value(attributes.get("Šiber") or {}),
-            "fog_lights": get_attribute_value(attributes.get("Maglenke") or {}),
-            "electric_mirrors": get_attribute_value(attributes.get("Električni retrovizori") or {}),
-            "alarm": get_attribute_value(attributes.get("Alarm") or {}),
-            "central_lock": get_attribute_value(attributes.get("Centralna brava") or {}),
-            "remote_unlock": get_attribute_value(attributes.get("Daljinsko otključavanje") or {}),
-            "airbag": get_attribute_value(attributes.get("Airbag") or {}),
-            "abs": get_attribute_value(attributes.get("ABS") or {}),
-            "electronic_stability": get_attribute_value(attributes.get("ESP") or {}),
-            "dpf_fap_filter": get_attribute_value(attributes.get("DPF/FAP filter") or {}),
-            "power_steering": get_attribute_value(attributes.get("Servo volan") or {}),
-            "turbo": get_attribute_value(attributes.get("Turbo") or {}),
-            "isofix": get_attribute_value(attributes.get("ISOFIX") or {}),
-            "tow_hook": get_attribute_value(attributes.get("Auto kuka") or {}),
-            "customs_cleared": get_attribute_value(attributes.get("Ocarinjen") or {}),
-            "foreign_license_plates": get_attribute_value(attributes.get("Strane tablice") or {}),
-            "on_lease": get_attribute_value(attributes.get("Na lizingu") or {}),
-            "service_history": get_attribute_value(attributes.get("Servisna knjiga") or {}),
-            "damaged": get_attribute_value(attributes.get("Udaren") or {}),
-            "disabled_accessible": get_attribute_value(
-                attributes.get("Prilagođen invalidima") or {}
-            ),
-            "oldtimer": get_attribute_value(attributes.get("Oldtimer") or {}),
+            **VEHICLE_ATTRIBUTES.extract(vehicle_data.get("attributes")),
         }
@@ -27,37 +27,122 @@ class ResourcesSettings(BaseModel):
     brands: Annotated[str | None, Field(default=None)]
 
 
+class WebdriverPoolSettings(BaseModel):
+    size: Annotated[int, Field(default=1, ge=1)]
+    max_pages: Annotated[int | None, Field(default=200, ge=1)]
+    max_rss_mb: Annotated[float | None, Field(default=1024.0, gt=0)]
+
+
+class RequestBlockingSettings(BaseModel):
+    url_patterns: Annotated[list[str], Field(default_factory=list)]
+    resource_types: Annotated[
+        list[Literal["image", "font", "stylesheet", "media"]], Field(default_factory=list)
+    ]
+
+
 class WebdriverSettings(BaseModel):
     chrome_binary_path: Annotated[str | None, Field(default=None)]
     chromedriver_path: Annotated[str | None, Field(default=None)]
     chrome_options: Annotated[list[str], Field(default_factory=list)]
     use_stealth: Annotated[bool, Field(default=True)]
     timeout_seconds: Annotated[int, Field(default=30)]
+    # "none" is not offered, get() would return before the requested document replaces the
+    # previous one and the readiness checks could pass against the previous page
+    page_load_strategy: Annotated[Literal["normal", "eager"], Field(default="normal")]
+    pool: Annotated[WebdriverPoolSettings, Field(default_factory=WebdriverPoolSettings)]
+    blocking: Annotated[RequestBlockingSettings, Field(default_factory=RequestBlockingSettings)]
+
+
+class SqliteSettings(BaseModel):
+    """PRAGMAs run on every new SQLite connection, None keeps the SQLite default."""
+
+    journal_mode: Annotated[
+        Literal["delete", "truncate", "persist", "memory", "wal", "off"] | None,
+        Field(default="wal"),
+    ]
+    synchronous: Annotated[
+        Literal["off", "normal", "full", "extra"] | None, Field(default="normal")
+    ]
+    mmap_size: Annotated[int | None, Field(default=268_435_456, ge=0)]
+    cache_size: Annotated[int | None, Field(default=-65_536)]
+    temp_store: Annotated[Literal["default", "file", "memory"] | None, Field(default="memory")]
+    busy_timeout: Annotated[int | None, Field(default=5000, ge=0)]
+
+
+class DatabasePoolSettings(BaseModel):
+    size: Annotated[int, Field(default=5, ge=1)]
+    max_overflow: Annotated[int, Field(default=10, ge=0)]
+    recycle_seconds: Annotated[int, Field(default=1800)]
+    pre_ping: Annotated[bool, Field(default=True)]
 
 
 class DatabaseSettings(BaseModel):
     url: Annotated[str | None, Field(default=None)]
     echo: Annotated[bool, Field(default=False)]
+    write_batch_size: Annotated[int, Field(default=500, ge=1)]
+    write_flush_interval: Annotated[float, Field(default=5.0, gt=0)]
+    write_max_pending: Annotated[int, Field(default=2000, ge=1)]
+    sqlite: Annotated[SqliteSettings, Field(default_factory=SqliteSettings)]
+    pool: Annotated[DatabasePoolSettings, Field(default_factory=DatabasePoolSettings)]
+
+
+class CookieCacheSettings(BaseModel):
+    path: Annotated[str | None, Field(default=None)]
+    ttl_seconds: Annotated[float, Field(default=1800.0, gt=0)]
 
 
 class HttpSettings(BaseModel):
     url: Annotated[str | None, Field(default=None)]
     client_type: Annotated[Literal["requests", "httpx"], Field(default="requests")]
     headers: Annotated[dict[str, str], Field(default_factory=dict)]
+    cookie_provider: Annotated[Literal["webdriver", "http"], Field(default="webdriver")]
+    cookie_cache: Annotated[CookieCacheSettings, Field(default_factory=CookieCacheSettings)]
+
+
+class RateLimitSettings(BaseModel):
+    strategy: Annotated[Literal["fixed", "aimd"], Field(default="aimd")]
+    requests_per_second: Annotated[float, Field(default=0.4, gt=0)]
+    burst: Annotated[int, Field(default=1, ge=1)]
+    jitter: Annotated[float, Field(default=0.0, ge=0)]
+    min_requests_per_second: Annotated[float, Field(default=0.1, gt=0)]
+    max_requests_per_second: Annotated[float, Field(default=2.0, gt=0)]
+    increase_step: Annotated[float, Field(default=0.02, ge=0)]
+    decrease_factor: Annotated[float, Field(default=0.5, gt=0, lt=1)]
+
+
+class ShardingSettings(BaseModel):
+    lookback_runs: Annotated[int, Field(default=5, ge=1)]
+    listings_per_page: Annotated[int, Field(default=40, ge=1)]
+    pages_per_shard: Annotated[int, Field(default=50, ge=1)]
+    max_shards: Annotated[int, Field(default=16, ge=1)]
 
 
 class ListingScraperSettings(BaseModel):
-    min_req_delay: Annotated[float, Field(default=1.0)]
-    max_req_delay: Annotated[float, Field(default=4.0)]
+    engine: Annotated[Literal["webdriver", "api"], Field(default="webdriver")]
     timeout: Annotated[float, Field(default=20.0)]
     created_gte: Annotated[Literal["-24+hours", "-7+days", "-30+days"], Field(default="-7+days")]
+    incremental: Annotated[bool, Field(default=False)]
+    page_concurrency: Annotated[int, Field(default=1, ge=1)]
+    extraction: Annotated[Literal["html", "script", "network"], Field(default="html")]
+    readiness: Annotated[
+        Literal["load", "cards", "pagination", "network_idle"], Field(default="load")
+    ]
+    sharding: Annotated[ShardingSettings, Field(default_factory=ShardingSettings)]
+
+
+class RefreshSettings(BaseModel):
+    ttl_days: Annotated[float, Field(default=30.0, gt=0)]
+    budget: Annotated[int | None, Field(default=None, ge=0)]
 
 
 class VehicleScraperSettings(BaseModel):
-    min_req_delay: Annotated[float, Field(default=1.0)]
-    max_req_delay: Annotated[float, Field(default=4.0)]
+    engine: Annotated[Literal["sequential", "concurrent"], Field(default="sequential")]
     timeout: Annotated[float, Field(default=20.0)]
     reinit_session_every: Annotated[int, Field(default=500)]
+    max_session_refreshes: Annotated[int, Field(default=3, ge=1)]
+    concurrency: Annotated[int, Field(default=4, ge=1)]
+    archive_dir: Annotated[str | None, Field(default=None)]
+    refresh: Annotated[RefreshSettings, Field(default_factory=RefreshSettings)]
 
 
 class ScrapersSettings(BaseModel):
@@ -111,6 +196,7 @@ class Settings(BaseSettings):
     resources: Annotated[ResourcesSettings, Field()]
     webdriver: Annotated[WebdriverSettings, Field()]
     http: Annotated[HttpSettings, Field()]
+    rate_limit: Annotated[RateLimitSettings, Field(default_factory=RateLimitSettings)]
     database: Annotated[DatabaseSettings, Field()]
     scrapers: Annotated[ScrapersSettings, Field()]
 
@@ -1,4 +1,6 @@
-from typing import TypedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any, TypedDict
 
 
 class VehicleAttribute(TypedDict):
@@ -6,6 +8,9 @@ class VehicleAttribute(TypedDict):
     type: str
 
 
+_BOOLEAN_VALUES = {"true": True, "false": False}
+
+
 def get_attribute_value(attribute: VehicleAttribute):
     if not attribute:
         return None
@@ -15,7 +20,47 @@ def get_attribute_value(attribute: VehicleAttribute):
         return value
     if dtype == "number":
         return str(value).strip()
-    elif dtype == "string":
-        if value.strip() in ("true", "false"):
-            return {"true": True, "false": False}.get(value.strip())
-    return value.strip()
+    value = value.strip()
+    if dtype == "string":
+        return _BOOLEAN_VALUES.get(value, value)
+    return value
+
+
+@dataclass(frozen=True)
+class AttributeMapping:
+    """Maps an api attribute (by its label) to a vehicle field."""
+
+    label: str
+    field: str
+    coerce: Callable[[VehicleAttribute], Any] = get_attribute_value
+
+
+class AttributeExtractor:
+    """
+    Extracts vehicle fields from the `attributes` array of an api response.
+
+    The mapping table is compiled once into a label lookup, so every response is handled in
+    a single pass over its attributes. Only fields of attributes present in the response are
+    returned.
+    """
+
+    def __init__(self, mappings: Iterable[AttributeMapping]):
+        self._mappings: dict[str, tuple[str, Callable[[VehicleAttribute], Any]]] = {}
+        for mapping in mappings:
+            if mapping.label in self._mappings:
+                raise ValueError(f"Duplicate attribute label: {mapping.label}")
+            self._mappings[mapping.label] = (mapping.field, mapping.coerce)
+
+    @property
+    def fields(self) -> list[str]:
+        return [field for field, _ in self._mappings.values()]
+
+    def extract(self, attributes: list[dict] | None) -> dict:
+        result = {}
+        lookup = self._mappings.get
+        for attribute in attributes or ():
+            mapping = lookup(attribute.get("name"))
+            if mapping is not None:
+                field, coerce = mapping
+                result[field] = coerce(attribute)
+        return result
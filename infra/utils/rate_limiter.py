@@ -0,0 +1,250 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from infra.factory.logger import LoggerFactory
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens are refilled at `rate` tokens per second up to `burst` tokens. Every request takes
+    one token; when the bucket is empty the token is reserved ahead of time and the caller
+    waits until it is refilled, so concurrent callers are queued instead of bursting together.
+    `jitter` adds up to that many seconds of random delay to requests that had to wait.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        jitter: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        if burst < 1:
+            raise ValueError(f"burst must be at least 1, got {burst}")
+        self._rate = rate
+        self._burst = burst
+        self._jitter = jitter
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def burst(self) -> int:
+        return self._burst
+
+    def set_rate(self, rate: float) -> None:
+        """Changes the refill rate. Tokens accumulated so far are kept."""
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        with self._lock:
+            self._refill()
+            self._rate = rate
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated_at
+        self._tokens = min(self._burst, self._tokens + elapsed * self._rate)
+        self._updated_at = now
+
+    def reserve(self) -> float:
+        """Takes a token and returns the number of seconds to wait before it may be used."""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            wait = -self._tokens / self._rate
+        if self._jitter:
+            wait += random.uniform(0, self._jitter)
+        return wait
+
+    def acquire(self) -> float:
+        """Blocks until a token is available. Returns the time spent waiting."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """Awaits until a token is available. Returns the time spent waiting."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+@dataclass
+class PacingState:
+    rate: float
+    error_ratio: float
+    requests: int
+
+
+def is_throttling_status(status_code: int) -> bool:
+    """Whether the status code tells us to slow down (rate limited or server overloaded)."""
+    return status_code == 429 or status_code >= 500
+
+
+class HostRateLimiter:
+    """
+    Keeps a separate token bucket per host, so every host gets its own request budget of
+    `requests_per_second` with bursts of up to `burst` requests.
+
+    Request outcomes reported through `record_success`/`record_failure` are kept for the last
+    `window` requests of every host and summarized by `state`.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float,
+        burst: int = 1,
+        jitter: float = 0.0,
+        window: int = 100,
+    ):
+        self._requests_per_second = requests_per_second
+        self._burst = burst
+        self._jitter = jitter
+        self._window = window
+        self._buckets: dict[str, TokenBucket] = {}
+        self._outcomes: dict[str, deque[bool]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlsplit(url).hostname or url
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = self._host(url)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self._requests_per_second, self._burst, self._jitter)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url: str) -> float:
+        return self.bucket(url).acquire()
+
+    async def acquire_async(self, url: str) -> float:
+        return await self.bucket(url).acquire_async()
+
+    def set_rate(self, url: str, rate: float) -> None:
+        self.bucket(url).set_rate(rate)
+
+    def record_success(self, url: str) -> None:
+        self._record(url, failed=False)
+
+    def record_failure(self, url: str) -> None:
+        self._record(url, failed=True)
+
+    def record_response(self, url: str, status_code: int) -> None:
+        if is_throttling_status(status_code):
+            self.record_failure(url)
+        else:
+            self.record_success(url)
+
+    def state(self, url: str) -> PacingState:
+        rate = self.bucket(url).rate
+        with self._lock:
+            outcomes = list(self._outcomes.get(self._host(url), ()))
+        error_ratio = sum(outcomes) / len(outcomes) if outcomes else 0.0
+        return PacingState(rate=rate, error_ratio=error_ratio, requests=len(outcomes))
+
+    def _record(self, url: str, failed: bool) -> None:
+        host = self._host(url)
+        with self._lock:
+            outcomes = self._outcomes.setdefault(host, deque(maxlen=self._window))
+            outcomes.append(failed)
+
+
+class AimdRateLimiter(HostRateLimiter):
+    """
+    Host rate limiter that adapts the request rate to server responses (additive increase,
+    multiplicative decrease).
+
+    Every successful request raises the rate of its host by `increase_step` requests/sec, up to
+    `max_requests_per_second`. Throttling responses (429/5xx) and timeouts multiply the rate by
+    `decrease_factor`, down to `min_requests_per_second`. Failures that arrive within one
+    request interval of the last decrease are attributed to the same congestion event and do
+    not lower the rate again.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float,
+        logger_factory: LoggerFactory,
+        burst: int = 1,
+        jitter: float = 0.0,
+        window: int = 100,
+        min_requests_per_second: float = 0.1,
+        max_requests_per_second: float = 2.0,
+        increase_step: float = 0.02,
+        decrease_factor: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not 0 < decrease_factor < 1:
+            raise ValueError(f"decrease_factor must be in (0, 1), got {decrease_factor}")
+        if not 0 < min_requests_per_second <= max_requests_per_second:
+            raise ValueError("min_requests_per_second must be in (0, max_requests_per_second]")
+        super().__init__(
+            requests_per_second=self._clamp(
+                requests_per_second, min_requests_per_second, max_requests_per_second
+            ),
+            burst=burst,
+            jitter=jitter,
+            window=window,
+        )
+        self._logger = logger_factory.create(self.__class__.__name__)
+        self._min_rate = min_requests_per_second
+        self._max_rate = max_requests_per_second
+        self._increase_step = increase_step
+        self._decrease_factor = decrease_factor
+        self._clock = clock
+        self._last_decrease_at: dict[str, float] = {}
+
+    @staticmethod
+    def _clamp(rate: float, min_rate: float, max_rate: float) -> float:
+        return max(min_rate, min(max_rate, rate))
+
+    def set_rate(self, url: str, rate: float) -> None:
+        super().set_rate(url, self._clamp(rate, self._min_rate, self._max_rate))
+
+    def record_success(self, url: str) -> None:
+        super().record_success(url)
+        bucket = self.bucket(url)
+        rate = bucket.rate
+        if rate < self._max_rate:
+            bucket.set_rate(min(self._max_rate, rate + self._increase_step))
+
+    def record_failure(self, url: str) -> None:
+        super().record_failure(url)
+        host = self._host(url)
+        bucket = self.bucket(url)
+        now = self._clock()
+        with self._lock:
+            last_decrease_at = self._last_decrease_at.get(host)
+            if last_decrease_at is not None and now - last_decrease_at < 1 / bucket.rate:
+                return
+            self._last_decrease_at[host] = now
+        rate = max(self._min_rate, bucket.rate * self._decrease_factor)
+        bucket.set_rate(rate)
+        state = self.state(url)
+        self._logger.info(
+            f"Backing off {host}: rate={rate:.3f} req/s, "
+            f"error_ratio={state.error_ratio:.2%} over last {state.requests} requests"
+        )
@@ -0,0 +1,44 @@
+"""add run pacing columns
+
+Revision ID: 3f1a9c2d7b64
+Revises:
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1a9c2d7b64"
+down_revision: str | Sequence[str] | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+COLUMNS = ("request_rate", "request_error_ratio")
+
+
+def _existing_columns() -> set[str]:
+    # tables are also created by `init_db`, which may already include the new columns
+    inspector = sa.inspect(op.get_bind())
+    return {column["name"] for column in inspector.get_columns("runs")}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = _existing_columns()
+    with op.batch_alter_table("runs") as batch_op:
+        for name in COLUMNS:
+            if name not in existing:
+                batch_op.add_column(sa.Column(name, sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    existing = _existing_columns()
+    with op.batch_alter_table("runs") as batch_op:
+        for name in COLUMNS:
+            if name in existing:
+                batch_op.drop_column(name)
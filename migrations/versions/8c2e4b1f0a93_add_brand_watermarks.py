@@ -0,0 +1,44 @@
+"""add brand watermarks
+
+Revision ID: 8c2e4b1f0a93
+Revises: 3f1a9c2d7b64
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c2e4b1f0a93"
+down_revision: str | Sequence[str] | None = "3f1a9c2d7b64"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLE = "brand_watermarks"
+
+
+def _table_exists() -> bool:
+    # tables are also created by `init_db`, which may already include the new table
+    return sa.inspect(op.get_bind()).has_table(TABLE)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if _table_exists():
+        return
+    op.create_table(
+        TABLE,
+        sa.Column("brand_id", sa.String(), primary_key=True),
+        sa.Column("listing_id", sa.String(), nullable=False),
+        sa.Column("run_id", sa.String(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _table_exists():
+        op.drop_table(TABLE)
@@ -0,0 +1,122 @@
+"""add vehicle feature masks
+
+Revision ID: a9d3f5b7c1e2
+Revises: f2a8c6d4e1b7
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a9d3f5b7c1e2"
+down_revision: str | Sequence[str] | None = "f2a8c6d4e1b7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+COLUMNS = ["features_mask", "features_known"]
+INDEX = "ix_vehicles_features"
+# bit positions as of this revision, bit i standing for FEATURES[i]; kept here so changes to
+# the entities do not change the masks the migration writes
+FEATURES = (
+    "registered",
+    "metallic",
+    "alloy_wheels",
+    "digital_air_conditioning",
+    "steering_wheel_controls",
+    "navigation",
+    "touch_screen",
+    "heads_up_display",
+    "usb_port",
+    "cruise_control",
+    "bluetooth",
+    "car_play",
+    "rain_sensor",
+    "park_assist",
+    "automatic_light_sensor",
+    "blind_spot_sensor",
+    "start_stop_system",
+    "hill_assist",
+    "seat_memory",
+    "seat_massage",
+    "seat_heating",
+    "seat_cooling",
+    "electric_windows",
+    "electric_seat_adjustment",
+    "armrest",
+    "panoramic_roof",
+    "sunroof",
+    "fog_lights",
+    "electric_mirrors",
+    "alarm",
+    "central_lock",
+    "remote_unlock",
+    "airbag",
+    "abs",
+    "electronic_stability",
+    "dpf_fap_filter",
+    "power_steering",
+    "turbo",
+    "isofix",
+    "tow_hook",
+    "customs_cleared",
+    "foreign_license_plates",
+    "on_lease",
+    "service_history",
+    "damaged",
+    "disabled_accessible",
+    "oldtimer",
+)
+
+
+def _existing_columns() -> set[str]:
+    # tables are also created by `init_db`, which may already include the new columns
+    inspector = sa.inspect(op.get_bind())
+    return {column["name"] for column in inspector.get_columns("vehicles")}
+
+
+def _existing_indexes() -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    return {index["name"] for index in inspector.get_indexes("vehicles")}
+
+
+def _backfill() -> None:
+    """Packs the stored flags ("1"/"0", "true"/"false") with a single UPDATE."""
+    table = sa.table(
+        "vehicles",
+        *(sa.column(feature, sa.String) for feature in FEATURES),
+        *(sa.column(column, sa.BigInteger) for column in COLUMNS),
+    )
+    mask, known = [], []
+    for bit, feature in enumerate(FEATURES):
+        value = sa.func.lower(table.c[feature])
+        mask.append(sa.case((value.in_(["1", "true"]), 1 << bit), else_=0))
+        known.append(sa.case((value.in_(["1", "true", "0", "false"]), 1 << bit), else_=0))
+    # flags occupy distinct bits, so adding them is the same as or-ing them
+    op.execute(table.update().values(features_mask=sum(mask), features_known=sum(known)))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if "features_mask" not in _existing_columns():
+        with op.batch_alter_table("vehicles") as batch_op:
+            for column in COLUMNS:
+                batch_op.add_column(
+                    sa.Column(column, sa.BigInteger(), nullable=False, server_default="0")
+                )
+        _backfill()
+    if INDEX not in _existing_indexes():
+        op.create_index(INDEX, "vehicles", COLUMNS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if INDEX in _existing_indexes():
+        op.drop_index(INDEX, table_name="vehicles")
+    if "features_mask" in _existing_columns():
+        with op.batch_alter_table("vehicles") as batch_op:
+            for column in reversed(COLUMNS):
+                batch_op.drop_column(column)
@@ -0,0 +1,49 @@
+"""add listing brand id
+
+Revision ID: d41b7e9a2c58
+Revises: 8c2e4b1f0a93
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d41b7e9a2c58"
+down_revision: str | Sequence[str] | None = "8c2e4b1f0a93"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+INDEX = "ix_listings_brand_id"
+
+
+def _existing_columns() -> set[str]:
+    # tables are also created by `init_db`, which may already include the new column
+    inspector = sa.inspect(op.get_bind())
+    return {column["name"] for column in inspector.get_columns("listings")}
+
+
+def _existing_indexes() -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    return {index["name"] for index in inspector.get_indexes("listings")}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if "brand_id" not in _existing_columns():
+        with op.batch_alter_table("listings") as batch_op:
+            batch_op.add_column(sa.Column("brand_id", sa.String(), nullable=True))
+    if INDEX not in _existing_indexes():
+        op.create_index(INDEX, "listings", ["brand_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if INDEX in _existing_indexes():
+        op.drop_index(INDEX, table_name="listings")
+    if "brand_id" in _existing_columns():
+        with op.batch_alter_table("listings") as batch_op:
+            batch_op.drop_column("brand_id")
@@ -0,0 +1,57 @@
+"""add query indexes
+
+Revision ID: e7c3a5f1b2d4
+Revises: d41b7e9a2c58
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e7c3a5f1b2d4"
+down_revision: str | Sequence[str] | None = "d41b7e9a2c58"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (table, index, columns)
+INDEXES = [
+    ("listings", "ix_listings_run_id_visited_at", ["run_id", "visited_at"]),
+    ("listings", "ix_listings_listing_id_visited_at", ["listing_id", "visited_at"]),
+    ("listings", "ix_listings_visited_at", ["visited_at"]),
+    ("vehicles", "ix_vehicles_brand_last_visited_at", ["brand", "last_visited_at"]),
+    ("vehicles", "ix_vehicles_last_visited_at", ["last_visited_at"]),
+]
+# (table, index, columns) made redundant by the indexes above
+REPLACED_INDEXES = [
+    ("listings", "ix_listings_listing_id", ["listing_id"]),
+]
+
+
+def _existing_indexes(table: str) -> set[str]:
+    # tables are also created by `init_db`, which may already include the new indexes
+    inspector = sa.inspect(op.get_bind())
+    return {index["name"] for index in inspector.get_indexes(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, index, columns in INDEXES:
+        if index not in _existing_indexes(table):
+            op.create_index(index, table, columns)
+    for table, index, _ in REPLACED_INDEXES:
+        if index in _existing_indexes(table):
+            op.drop_index(index, table_name=table)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, index, columns in REPLACED_INDEXES:
+        if index not in _existing_indexes(table):
+            op.create_index(index, table, columns)
+    for table, index, _ in reversed(INDEXES):
+        if index in _existing_indexes(table):
+            op.drop_index(index, table_name=table)
@@ -0,0 +1,114 @@
+"""add price columns
+
+Revision ID: f2a8c6d4e1b7
+Revises: e7c3a5f1b2d4
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+
+import re
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2a8c6d4e1b7"
+down_revision: str | Sequence[str] | None = "e7c3a5f1b2d4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLES = ["listings", "vehicles"]
+BATCH_SIZE = 5000
+
+# price parsing as of this revision, kept here so later changes to the entities do not change
+# what the migration writes
+PRICE_ON_REQUEST = "Na upit"
+_AMOUNT = re.compile(r"\d[\d.,\s]*")
+_CENTS = re.compile(r"[.,]\d{1,2}$")
+
+
+def _existing_columns(table: str) -> set[str]:
+    # tables are also created by `init_db`, which may already include the new columns
+    inspector = sa.inspect(op.get_bind())
+    return {column["name"] for column in inspector.get_columns(table)}
+
+
+def _existing_indexes(table: str) -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    return {index["name"] for index in inspector.get_indexes(table)}
+
+
+def _parse_price(text: str | None) -> tuple[int | None, bool]:
+    """Returns the amount of a displayed price without cents and whether it is on request."""
+    text = (text or "").strip()
+    if text.casefold() == PRICE_ON_REQUEST.casefold():
+        return None, True
+    match = _AMOUNT.search(text)
+    if match is None:
+        return None, False
+    digits = _CENTS.sub("", match.group().strip())
+    return int(re.sub(r"\D", "", digits)), False
+
+
+def _backfill(table_name: str) -> None:
+    """Parses the price of every stored row, in batches of `BATCH_SIZE` rows."""
+    table = sa.table(
+        table_name,
+        sa.column("id", sa.Integer),
+        sa.column("price", sa.String),
+        sa.column("price_amount", sa.Integer),
+        sa.column("price_on_request", sa.Boolean),
+    )
+    update = (
+        table.update()
+        .where(table.c.id == sa.bindparam("row_id"))
+        .values(price_amount=sa.bindparam("amount"), price_on_request=sa.bindparam("on_request"))
+    )
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(table.c.id, table.c.price)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        params = []
+        for row_id, text in rows:
+            amount, on_request = _parse_price(text)
+            params.append({"row_id": row_id, "amount": amount, "on_request": on_request})
+        connection.execute(update, params)
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        if "price_amount" not in _existing_columns(table):
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.add_column(sa.Column("price_amount", sa.Integer(), nullable=True))
+                batch_op.add_column(
+                    sa.Column(
+                        "price_on_request",
+                        sa.Boolean(),
+                        nullable=False,
+                        server_default=sa.false(),
+                    )
+                )
+        _backfill(table)
+        if f"ix_{table}_price_amount" not in _existing_indexes(table):
+            op.create_index(f"ix_{table}_price_amount", table, ["price_amount"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        if f"ix_{table}_price_amount" in _existing_indexes(table):
+            op.drop_index(f"ix_{table}_price_amount", table_name=table)
+        if "price_amount" in _existing_columns(table):
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.drop_column("price_on_request")
+                batch_op.drop_column("price_amount")
@@ -0,0 +1,14 @@
+from unittest.mock import Mock
+
+import pytest
+
+from benchmarks.page_weight import PageWeight, measure_page_weight
+
+
+@pytest.mark.unit
+def test_measure_page_weight():
+    driver = Mock()
+    driver.execute_script.return_value = {"bytes": 1536.0, "requests": 4, "load_ms": 812.5}
+
+    assert measure_page_weight(driver) == PageWeight(bytes=1536, requests=4, load_ms=812.5)
+    assert "performance.getEntriesByType" in driver.execute_script.call_args.args[0]
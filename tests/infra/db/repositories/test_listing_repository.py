@@ -1,8 +1,10 @@
 from datetime import UTC, datetime, timedelta
 
 import pytest
+from sqlalchemy.exc import IntegrityError
 
 from core.entities.listing import Listing
+from core.entities.refresh import RefreshReason
 from infra.db.models.listing import ListingModel
 from infra.db.models.vehicle import VehicleModel
 from infra.db.repositories.listings import SqlAlchemyListingRepository
@@ -41,6 +43,37 @@ class TestSqlAlchemyListingRepository:
             assert result is not None
             assert result.url == sample_listing.url
 
+    def test_add_many(self, repo, sample_listing):
+        listings = [
+            Listing(
+                id=f"listing-{idx:03}",
+                url=f"https://olx.ba/listing-{idx:03}",
+                title=f"Car {idx}",
+                price="10.000 KM",
+                visited_at=sample_listing.visited_at,
+                run_id="run-001",
+                brand_id="7",
+            )
+            for idx in range(3)
+        ]
+
+        assert repo.add_many(listings) == 3
+        assert repo.add_many([]) == 0
+
+        stored = sorted(repo.search_with_run_id("run-001"), key=lambda listing: listing.id)
+        assert [listing.id for listing in stored] == ["listing-000", "listing-001", "listing-002"]
+        assert all(listing.brand_id == "7" for listing in stored)
+        assert stored[0].visited_at.replace(tzinfo=UTC) == sample_listing.visited_at
+
+    def test_add_many_is_atomic(self, repo, sample_listing):
+        invalid = Listing(id="listing-002", url="", title="No url", price="1 KM")
+        invalid.url = None
+
+        with pytest.raises(IntegrityError):
+            repo.add_many([sample_listing, invalid])
+
+        assert repo.exists(sample_listing.id) is False
+
     def test_exists(self, repo, sample_listing):
         repo.add(sample_listing)
 
@@ -173,6 +206,54 @@ class TestSqlAlchemyListingRepository:
         assert len(results) == 1
         assert results[0].id == "listing-001"
 
+    def test_find_refresh_candidates(self, repo, in_memory_db):
+        now = datetime(2026, 1, 31, 12, 0, 0)
+        # (listing id, current price, vehicle price, vehicle last visited at)
+        rows = [
+            ("listing-new", "20000 KM", None, None),
+            ("listing-price", "19000 KM", "21000 KM", now - timedelta(days=1)),
+            ("listing-stale", "30000 KM", "30000 KM", now - timedelta(days=45)),
+            ("listing-fresh", "40000 KM", "40000 KM", now - timedelta(days=1)),
+        ]
+        with in_memory_db.create_session() as session:
+            for listing_id, _, vehicle_price, last_visited_at in rows:
+                if vehicle_price is not None:
+                    session.add(
+                        VehicleModel(
+                            listing_id=listing_id,
+                            url=f"https://olx.ba/{listing_id}",
+                            title="Vehicle",
+                            price=vehicle_price,
+                            last_visited_at=last_visited_at,
+                        )
+                    )
+            session.commit()
+        for listing_id, price, _, _ in rows:
+            repo.add(
+                Listing(
+                    id=listing_id,
+                    url=f"https://olx.ba/{listing_id}",
+                    title="Listing",
+                    price=price,
+                    visited_at=now,
+                    run_id="run-002",
+                )
+            )
+        # listings of other runs are ignored
+        repo.add(Listing(id="listing-other", url="u", title="t", price="1 KM", run_id="run-001"))
+
+        results = repo.find_refresh_candidates("run-002", stale_before=now - timedelta(days=30))
+
+        reasons = {c.listing.id: c.reason for c in results}
+        assert reasons == {
+            "listing-new": RefreshReason.NEW,
+            "listing-price": RefreshReason.PRICE_CHANGED,
+            "listing-stale": RefreshReason.STALE,
+        }
+        stale = next(c for c in results if c.listing.id == "listing-stale")
+        assert stale.last_visited_at == now - timedelta(days=45)
+        assert stale.listing.price == "30000 KM"
+
     def test_search_with_run_id(self, repo):
         # Add listings with different run_ids
         for i in range(3):
@@ -289,6 +370,22 @@ class TestSqlAlchemyListingRepository:
         assert len(results) == 1
         assert count == 3
 
+    def test_search_by_price_range(self, repo):
+        for idx, price in enumerate(["18.000 KM", "19,500 KM", "25.000,50 KM", "Na upit", "0 KM"]):
+            repo.add(Listing(id=f"L{idx}", url="u", title="Car", price=price))
+
+        results, count = repo.search(min_price=18000, max_price=25000)
+        assert count == 3
+        assert sorted(r.price_amount for r in results) == [18000, 19500, 25000]
+
+        # prices on request have no amount and never match a price range
+        results, count = repo.search(max_price=100)
+        assert [r.price for r in results] == ["0 KM"]
+
+        (stored,), _ = repo.search(listing_id="L3")
+        assert stored.price_on_request is True
+        assert stored.price_amount is None
+
     def test_get_unique_run_ids(self, repo):
         now = datetime.now(UTC)
         repo.add(Listing(id="l1", url="u1", title="t1", price="p1", visited_at=now, run_id="run-A"))
@@ -331,3 +428,32 @@ class TestSqlAlchemyListingRepository:
         assert metrics[0]["listing_count"] == 1
         assert metrics[1]["run_id"] == "run-1"
         assert metrics[1]["listing_count"] == 2
+
+    def test_count_by_brand_over_recent_runs(self, repo):
+        now = datetime.now(UTC)
+        rows = [
+            ("1", "run-old", "10", now - timedelta(days=14)),
+            ("2", "run-prev", "10", now - timedelta(days=7)),
+            ("3", "run-prev", "10", now - timedelta(days=7)),
+            ("4", "run-last", "10", now),
+            ("5", "run-last", "20", now),
+            ("6", "run-last", None, now),
+        ]
+        for listing_id, run_id, brand_id, visited_at in rows:
+            repo.add(
+                Listing(
+                    id=listing_id,
+                    url=f"https://olx.ba/artikal/{listing_id}",
+                    title="Car",
+                    price="1 KM",
+                    visited_at=visited_at,
+                    run_id=run_id,
+                    brand_id=brand_id,
+                )
+            )
+
+        run_ids = repo.find_recent_run_ids(limit=2)
+
+        assert run_ids == ["run-last", "run-prev"]
+        assert repo.count_by_brand(run_ids) == {"10": 3, "20": 1}
+        assert repo.find_latest("5").brand_id == "20"
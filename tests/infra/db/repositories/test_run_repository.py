@@ -12,6 +12,19 @@ class TestSqlAlchemyRunRepository:
     def repo(self, in_memory_db):
         return SqlAlchemyRunRepository(in_memory_db)
 
+    def test_update_pacing(self, repo):
+        run = repo.add(Run(id="test-run-pacing", started_at=datetime.now(UTC)))
+        assert run.request_rate is None
+        assert run.request_error_ratio is None
+
+        run.request_rate = 0.35
+        run.request_error_ratio = 0.05
+        repo.update(run)
+
+        saved_run = repo.get("test-run-pacing")
+        assert saved_run.request_rate == 0.35
+        assert saved_run.request_error_ratio == 0.05
+
     def test_add_run(self, repo):
         run = Run(id="test-run-1", started_at=datetime.now(UTC))
         saved_run = repo.add(run)
@@ -1,9 +1,12 @@
+from dataclasses import replace
 from datetime import UTC, datetime, timedelta
 
 import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
 
 from core.entities.listing import Listing
-from core.entities.vehicle import Vehicle
+from core.entities.vehicle import Vehicle, feature_mask
 from infra.db.models.vehicle import VehicleModel
 from infra.db.repositories.listings import SqlAlchemyListingRepository
 from infra.db.repositories.vehicles import SqlAlchemyVehicleRepository
@@ -52,6 +55,24 @@ class TestSqlAlchemyVehicleRepository:
             assert result.brand == sample_vehicle.brand
             assert result.model == sample_vehicle.model
 
+    def test_update_vehicle(self, repo, sample_vehicle):
+        repo.add(sample_vehicle)
+        sample_vehicle.mileage = "60000"
+        sample_vehicle.color = "Crna"
+
+        result = repo.update(sample_vehicle)
+
+        assert result.mileage == "60000"
+        assert result.color == "Crna"
+        saved = repo.get(sample_vehicle.id)
+        assert saved.mileage == "60000"
+        assert saved.color == "Crna"
+        assert saved.brand == sample_vehicle.brand
+
+    def test_update_missing_vehicle(self, repo, sample_vehicle):
+        with pytest.raises(ValueError, match="Vehicle with id vehicle-001 not found"):
+            repo.update(sample_vehicle)
+
     def test_add_vehicle_with_optional_fields(self, repo):
         vehicle = Vehicle(
             id="vehicle-minimal",
@@ -117,6 +138,64 @@ class TestSqlAlchemyVehicleRepository:
             assert retrieved is not None
             assert retrieved.brand == f"Brand-{i}"
 
+    def test_add_many(self, repo, sample_vehicle):
+        other = Vehicle(
+            id="vehicle-002", url="https://olx.ba/vehicle-002", title="A4", price="1 KM"
+        )
+
+        assert repo.add_many([sample_vehicle, other]) == 2
+
+        assert repo.get("vehicle-001").engine_power == 140
+        assert repo.get("vehicle-002").title == "A4"
+
+    def test_add_many_is_atomic(self, repo, sample_vehicle):
+        repo.add(sample_vehicle)
+        new = Vehicle(id="vehicle-002", url="https://olx.ba/vehicle-002", title="A4", price="1 KM")
+
+        # the listing id of a vehicle is unique
+        with pytest.raises(IntegrityError):
+            repo.add_many([new, sample_vehicle])
+
+        assert repo.get("vehicle-002") is None
+
+    def test_upsert_many(self, repo, sample_vehicle, in_memory_db):
+        unchanged = Vehicle(
+            id="vehicle-002", url="https://olx.ba/vehicle-002", title="A4", price="1 KM"
+        )
+        repo.add_many([sample_vehicle, unchanged])
+
+        def total_changes():
+            with in_memory_db.create_session() as session:
+                return session.execute(text("SELECT total_changes()")).scalar()
+
+        changes = total_changes()
+        changed = replace(sample_vehicle, price="24000 KM", mileage=None)
+        new = Vehicle(id="vehicle-003", url="https://olx.ba/vehicle-003", title="A6", price="2 KM")
+
+        assert repo.upsert_many([changed, unchanged, new]) == 3
+
+        assert repo.get("vehicle-001").price == "24000 KM"
+        assert repo.get("vehicle-001").mileage is None
+        assert repo.get("vehicle-001").engine_power == 140
+        assert repo.get("vehicle-003").title == "A6"
+        # the unchanged vehicle is not written again
+        assert total_changes() - changes == 2
+        with in_memory_db.create_session() as session:
+            assert session.query(VehicleModel).count() == 3
+        assert repo.upsert_many([]) == 0
+
+    def test_upsert_many_keeps_newer_vehicles(self, repo, sample_vehicle):
+        repo.add(sample_vehicle)
+        archived = replace(
+            sample_vehicle,
+            price="1 KM",
+            last_visited_at=sample_vehicle.last_visited_at - timedelta(days=1),
+        )
+
+        repo.upsert_many([archived])
+
+        assert repo.get(sample_vehicle.id).price == sample_vehicle.price
+
     def test_convert_entity_to_orm_and_back(self, repo, sample_vehicle):
         orm = repo._convert_entity_to_orm(sample_vehicle)
         entity = repo._convert_orm_to_entity(orm)
@@ -188,6 +267,42 @@ class TestSqlAlchemyVehicleRepository:
         assert len(results) == 1
         assert count == 2
 
+    def test_upsert_many_updates_price_amount(self, repo, sample_vehicle):
+        repo.upsert_many([replace(sample_vehicle, price="30.000 KM")])
+        repo.upsert_many([replace(sample_vehicle, price="Na upit")])
+
+        stored = repo.get(sample_vehicle.id)
+        assert stored.price_amount is None
+        assert stored.price_on_request is True
+        assert repo.search(min_price=0) == ([], 0)
+
+    def test_search_by_features(self, repo, sample_vehicle):
+        repo.add_many(
+            [
+                replace(sample_vehicle, id="V1", navigation=True, car_play=True),
+                replace(sample_vehicle, id="V2", navigation=True, car_play=False),
+                replace(sample_vehicle, id="V3", navigation=False),
+                replace(sample_vehicle, id="V4"),
+            ]
+        )
+
+        def ids(**filters):
+            results, count = repo.search(**filters)
+            assert count == len(results)
+            return {r.id for r in results}
+
+        assert ids(features=["navigation"]) == {"V1", "V2"}
+        assert ids(features=["navigation", "car_play"]) == {"V1"}
+        # vehicles without a known value are neither with nor without a feature
+        assert ids(without_features=["car_play"]) == {"V2"}
+        assert ids(without_features=["navigation", "car_play"]) == set()
+        assert ids(features=["navigation"], without_features=["car_play"]) == {"V2"}
+
+        # stored flags are read back as text and packed the same way
+        stored = repo.get("V2")
+        assert stored.features_mask == feature_mask(["navigation"])
+        assert stored.features_known == feature_mask(["navigation", "car_play"])
+
     def test_get_unique_brands(self, repo):
         now = datetime.now(UTC)
         repo.add(
@@ -0,0 +1,36 @@
+from datetime import datetime
+
+import pytest
+
+from core.entities.watermark import BrandWatermark
+from infra.db.repositories.watermarks import SqlAlchemyWatermarkRepository
+
+
+@pytest.mark.integration
+class TestSqlAlchemyWatermarkRepository:
+    @pytest.fixture
+    def repo(self, in_memory_db):
+        return SqlAlchemyWatermarkRepository(in_memory_db)
+
+    def test_get_missing_watermark(self, repo):
+        assert repo.get("123") is None
+
+    def test_save_inserts_and_updates_watermark(self, repo):
+        saved = repo.save(
+            BrandWatermark(
+                brand_id="123", listing_id="11111", run_id="run-1", updated_at=datetime(2026, 1, 1)
+            )
+        )
+        assert saved == repo.get("123")
+
+        repo.save(
+            BrandWatermark(
+                brand_id="123", listing_id="22222", run_id="run-2", updated_at=datetime(2026, 1, 2)
+            )
+        )
+
+        watermark = repo.get("123")
+        assert watermark.listing_id == "22222"
+        assert watermark.run_id == "run-2"
+        assert watermark.updated_at == datetime(2026, 1, 2)
+        assert repo.get("456") is None
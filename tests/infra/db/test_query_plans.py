@@ -0,0 +1,102 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from infra.db.repositories.listings import SqlAlchemyListingRepository
+from infra.db.repositories.vehicles import SqlAlchemyVehicleRepository
+
+
+@pytest.mark.integration
+class TestQueryPlans:
+    """The queries of the vehicle stage and the dashboard are served by indexes."""
+
+    @pytest.fixture
+    def listings(self, in_memory_db):
+        return SqlAlchemyListingRepository(in_memory_db)
+
+    @pytest.fixture
+    def vehicles(self, in_memory_db):
+        return SqlAlchemyVehicleRepository(in_memory_db)
+
+    @pytest.fixture
+    def query_plans(self, in_memory_db):
+        """Runs the call and returns the EXPLAIN QUERY PLAN of every statement it executed."""
+        engine = in_memory_db.engine
+
+        def explain(call) -> list[str]:
+            statements = []
+
+            def capture(conn, cursor, statement, parameters, context, executemany):
+                statements.append((statement, parameters))
+
+            event.listen(engine, "before_cursor_execute", capture)
+            try:
+                call()
+            finally:
+                event.remove(engine, "before_cursor_execute", capture)
+            with engine.connect() as connection:
+                return [
+                    "\n".join(
+                        row[3]
+                        for row in connection.exec_driver_sql(
+                            f"EXPLAIN QUERY PLAN {statement}", parameters
+                        )
+                    )
+                    for statement, parameters in statements
+                ]
+
+        return explain
+
+    def test_listings_of_a_run(self, listings, query_plans):
+        for call in (
+            lambda: listings.find_without_vehicle_by_run_id("run-001"),
+            lambda: listings.find_refresh_candidates("run-001", datetime.now()),
+            lambda: listings.search_with_run_id("run-001"),
+        ):
+            (plan,) = query_plans(call)
+            assert "SEARCH listings USING INDEX ix_listings_run_id_visited_at (run_id=?)" in plan
+
+    def test_runs_overview(self, listings, query_plans):
+        for call in (listings.get_listings_per_run, listings.find_recent_run_ids):
+            (plan,) = query_plans(call)
+            assert "USING COVERING INDEX ix_listings_run_id_visited_at" in plan
+
+    def test_latest_listings(self, listings, query_plans):
+        (plan,) = query_plans(listings.find_latest_run)
+        assert plan == "SCAN listings USING INDEX ix_listings_visited_at"
+
+        (plan,) = query_plans(lambda: listings.find_latest("listing-001"))
+        assert "USING INDEX ix_listings_listing_id_visited_at (listing_id=?)" in plan
+
+    def test_listing_search(self, listings, query_plans):
+        _, page = query_plans(lambda: listings.search())
+        assert page == "SCAN listings USING INDEX ix_listings_visited_at"
+
+        count, page = query_plans(lambda: listings.search(run_id="run-001"))
+        assert "ix_listings_run_id_visited_at (run_id=?)" in count
+        assert "ix_listings_run_id_visited_at (run_id=?)" in page
+        assert "TEMP B-TREE" not in page  # already sorted by the index
+
+    def test_price_range(self, listings, vehicles, query_plans):
+        count, _ = query_plans(lambda: listings.search(min_price=10000, max_price=20000))
+        assert "ix_listings_price_amount (price_amount>? AND price_amount<?)" in count
+
+        count, _ = query_plans(lambda: vehicles.search(min_price=10000, max_price=20000))
+        assert "ix_vehicles_price_amount (price_amount>? AND price_amount<?)" in count
+
+    def test_vehicle_search(self, vehicles, query_plans):
+        _, page = query_plans(lambda: vehicles.search())
+        assert page == "SCAN vehicles USING INDEX ix_vehicles_last_visited_at"
+
+        count, page = query_plans(lambda: vehicles.search(brand="BMW"))
+        assert "ix_vehicles_brand_last_visited_at (brand=?)" in count
+        assert page == "SEARCH vehicles USING INDEX ix_vehicles_brand_last_visited_at (brand=?)"
+
+    def test_feature_filter(self, vehicles, query_plans):
+        count, _ = query_plans(lambda: vehicles.search(features=["navigation", "car_play"]))
+        assert count == "SCAN vehicles USING COVERING INDEX ix_vehicles_features"
+
+    def test_unique_brands(self, vehicles, query_plans):
+        (plan,) = query_plans(vehicles.get_unique_brands)
+        assert plan == "SCAN vehicles USING COVERING INDEX ix_vehicles_brand_last_visited_at"
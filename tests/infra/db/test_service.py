@@ -0,0 +1,63 @@
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import text
+
+from infra.db.service import DatabaseService
+
+
+@pytest.mark.integration
+class TestDatabaseService:
+    def pragma(self, db_service, name):
+        with db_service.create_session() as session:
+            return session.execute(text(f"PRAGMA {name}")).scalar()
+
+    def test_sets_sqlite_pragmas_on_connect(self, tmp_path):
+        db_service = DatabaseService(
+            f"sqlite:///{tmp_path / 'test.db'}",
+            sqlite_pragmas={
+                "journal_mode": "wal",
+                "synchronous": "normal",
+                "cache_size": -8192,
+                "temp_store": "memory",
+                "busy_timeout": 2500,
+                "mmap_size": None,
+            },
+        )
+
+        assert self.pragma(db_service, "journal_mode") == "wal"
+        assert self.pragma(db_service, "synchronous") == 1  # normal
+        assert self.pragma(db_service, "cache_size") == -8192
+        assert self.pragma(db_service, "temp_store") == 2  # memory
+        assert self.pragma(db_service, "busy_timeout") == 2500
+        # pragmas set to None keep the sqlite default
+        assert self.pragma(db_service, "mmap_size") == 0
+        db_service.engine.dispose()
+
+    def test_keeps_sqlite_defaults_without_pragmas(self, tmp_path):
+        db_service = DatabaseService(f"sqlite:///{tmp_path / 'test.db'}")
+
+        assert self.pragma(db_service, "journal_mode") == "delete"
+        assert self.pragma(db_service, "synchronous") == 2  # full
+        db_service.engine.dispose()
+
+    def test_configures_pool_of_server_databases(self):
+        with patch("infra.db.service.create_engine") as create_engine:
+            DatabaseService(
+                "postgresql://user@localhost/carscout",
+                sqlite_pragmas={"journal_mode": "wal"},
+                pool_size=3,
+                max_overflow=1,
+                pool_recycle=600,
+                pool_pre_ping=True,
+            )
+
+        create_engine.assert_called_once_with(
+            "postgresql://user@localhost/carscout",
+            echo=False,
+            future=True,
+            pool_size=3,
+            max_overflow=1,
+            pool_recycle=600,
+            pool_pre_ping=True,
+        )
@@ -0,0 +1,109 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from infra.factory.providers.caching_cookie_provider import CachingCookieProvider
+from infra.interfaces.cookie_provider import CookieProvider
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.unit
+class TestCachingCookieProvider:
+    URL = "https://example.com"
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def mock_provider(self):
+        provider = Mock(spec=CookieProvider)
+        provider.provide.return_value = [{"name": "session_id", "value": "abc123"}]
+        return provider
+
+    @pytest.fixture
+    def cache_path(self, tmp_path):
+        return tmp_path / "cache" / "cookies.json"
+
+    @pytest.fixture
+    def cookie_provider(self, mock_provider, mock_logger_factory, cache_path, clock):
+        return CachingCookieProvider(
+            provider=mock_provider,
+            logger_factory=mock_logger_factory,
+            path=str(cache_path),
+            ttl=60.0,
+            clock=clock,
+        )
+
+    def test_provide_reuses_cached_cookies(self, cookie_provider, mock_provider):
+        assert cookie_provider.provide(self.URL) == [{"name": "session_id", "value": "abc123"}]
+        assert cookie_provider.provide(self.URL) == [{"name": "session_id", "value": "abc123"}]
+        mock_provider.provide.assert_called_once_with(self.URL)
+
+    def test_provide_refreshes_after_ttl(self, cookie_provider, mock_provider, clock):
+        cookie_provider.provide(self.URL)
+        clock.now += 59
+        cookie_provider.provide(self.URL)
+        assert mock_provider.provide.call_count == 1
+
+        clock.now += 1
+        cookie_provider.provide(self.URL)
+        assert mock_provider.provide.call_count == 2
+
+    def test_provide_refreshes_when_cookie_expires(self, cookie_provider, mock_provider, clock):
+        mock_provider.provide.return_value = [
+            {"name": "session_id", "value": "abc123", "expiry": clock.now + 10},
+            {"name": "user_token", "value": "xyz789"},
+        ]
+        cookie_provider.provide(self.URL)
+        clock.now += 10
+        cookie_provider.provide(self.URL)
+        assert mock_provider.provide.call_count == 2
+
+    def test_cache_is_shared_through_file(
+        self, cookie_provider, mock_provider, mock_logger_factory, cache_path, clock
+    ):
+        cookie_provider.provide(self.URL)
+        assert json.loads(cache_path.read_text())[self.URL]["cookies"] == [
+            {"name": "session_id", "value": "abc123"}
+        ]
+
+        other_provider = Mock(spec=CookieProvider)
+        other = CachingCookieProvider(
+            other_provider, mock_logger_factory, path=str(cache_path), clock=clock
+        )
+        assert other.provide(self.URL) == [{"name": "session_id", "value": "abc123"}]
+        other_provider.provide.assert_not_called()
+
+    def test_invalidate(self, cookie_provider, mock_provider, cache_path):
+        cookie_provider.provide(self.URL)
+        cookie_provider.invalidate(self.URL)
+
+        assert self.URL not in json.loads(cache_path.read_text())
+        mock_provider.invalidate.assert_called_once_with(self.URL)
+        cookie_provider.provide(self.URL)
+        assert mock_provider.provide.call_count == 2
+
+    def test_corrupt_cache_is_ignored(self, cookie_provider, mock_provider, cache_path):
+        cache_path.parent.mkdir(parents=True)
+        cache_path.write_text("{not json")
+
+        assert cookie_provider.provide(self.URL) == [{"name": "session_id", "value": "abc123"}]
+        mock_provider.provide.assert_called_once()
+        assert self.URL in json.loads(cache_path.read_text())
+
+    def test_in_memory_cache_without_path(self, mock_provider, mock_logger_factory, tmp_path):
+        cookie_provider = CachingCookieProvider(mock_provider, mock_logger_factory)
+        cookie_provider.provide(self.URL)
+        cookie_provider.provide(self.URL)
+
+        mock_provider.provide.assert_called_once()
+        assert list(tmp_path.iterdir()) == []
@@ -1,4 +1,5 @@
-from unittest.mock import Mock
+import asyncio
+from unittest.mock import Mock, patch
 
 import httpx
 import pytest
@@ -6,6 +7,7 @@ import requests
 
 from infra.factory.clients.http import ClientType, HttpClientFactory
 from infra.interfaces.cookie_provider import CookieProvider
+from infra.utils.rate_limiter import HostRateLimiter
 
 
 @pytest.mark.unit
@@ -58,6 +60,10 @@ class TestHttpClientFactory:
         for cookie in provided_cookies:
             assert client.cookies[cookie["name"]] == cookie["value"]
 
+    def test_invalidate_cookies(self, factory, mock_cookie_provider):
+        factory.invalidate_cookies()
+        mock_cookie_provider.invalidate.assert_called_once_with("https://example.com")
+
     def test_create_httpx_client(self, mock_logger_factory, mock_cookie_provider, http_headers):
         factory = HttpClientFactory(
             url="https://example.com",
@@ -101,3 +107,58 @@ class TestHttpClientFactory:
         provided_cookies = mock_cookie_provider.provide()
         for cookie in provided_cookies:
             assert client.cookies[cookie["name"]] == cookie["value"]
+
+    def test_create_async_client(self, factory, mock_cookie_provider, http_headers):
+        client = factory.create_async(max_connections=8)
+
+        assert isinstance(client, httpx.AsyncClient)
+        assert client.headers["User-Agent"] == http_headers["User-Agent"]
+        mock_cookie_provider.provide.assert_called_once_with("https://example.com")
+        for cookie in mock_cookie_provider.provide():
+            assert client.cookies[cookie["name"]] == cookie["value"]
+
+    @pytest.mark.parametrize("client_type", [ClientType.REQUESTS, ClientType.HTTPX])
+    def test_created_clients_go_through_rate_limiter(
+        self, mock_logger_factory, mock_cookie_provider, client_type
+    ):
+        rate_limiter = Mock(spec=HostRateLimiter)
+        factory = HttpClientFactory(
+            url="https://example.com",
+            headers={},
+            logger_factory=mock_logger_factory,
+            cookie_provider=mock_cookie_provider,
+            client_type=client_type,
+            rate_limiter=rate_limiter,
+        )
+        client = factory.create()
+
+        with (
+            patch.object(requests.Session, "send", return_value=Mock()),
+            patch.object(httpx.HTTPTransport, "handle_request", return_value=httpx.Response(200)),
+        ):
+            client.get("https://example.com/api/listings/1")
+
+        rate_limiter.acquire.assert_called_once_with("https://example.com/api/listings/1")
+
+    def test_created_async_clients_go_through_rate_limiter(
+        self, mock_logger_factory, mock_cookie_provider
+    ):
+        rate_limiter = Mock(spec=HostRateLimiter)
+        factory = HttpClientFactory(
+            url="https://example.com",
+            headers={},
+            logger_factory=mock_logger_factory,
+            cookie_provider=mock_cookie_provider,
+            rate_limiter=rate_limiter,
+        )
+
+        async def get():
+            async with factory.create_async() as client:
+                await client.get("https://example.com/api/listings/1")
+
+        with patch.object(
+            httpx.AsyncHTTPTransport, "handle_async_request", return_value=httpx.Response(200)
+        ):
+            asyncio.run(get())
+
+        rate_limiter.acquire_async.assert_awaited_once_with("https://example.com/api/listings/1")
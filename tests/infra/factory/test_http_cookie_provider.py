@@ -0,0 +1,88 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+
+import pytest
+
+from infra.factory.providers.http_cookie_provider import HttpCookieProvider
+from infra.interfaces.cookie_provider import CookieProvider
+
+
+class CookieHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        if self.path == "/error":
+            self.send_response(500)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Set-Cookie", "session_id=abc123; Path=/")
+        self.send_header(
+            "Set-Cookie", "user_token=xyz789; Path=/; Expires=Fri, 01 Jan 2100 00:00:00 GMT"
+        )
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.mark.unit
+class TestHttpCookieProvider:
+    @pytest.fixture
+    def server(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), CookieHandler)
+        server.requests = []
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+
+    @pytest.fixture
+    def url(self, server):
+        return f"http://127.0.0.1:{server.server_port}/kategorije"
+
+    @pytest.fixture
+    def mock_fallback(self):
+        provider = Mock(spec=CookieProvider)
+        provider.provide.return_value = [{"name": "browser_cookie", "value": "browser"}]
+        return provider
+
+    @pytest.fixture
+    def cookie_provider(self, mock_logger_factory, mock_fallback):
+        return HttpCookieProvider(
+            headers={"User-Agent": "TestBot/1.0"},
+            logger_factory=mock_logger_factory,
+            fallback=mock_fallback,
+            timeout=5.0,
+        )
+
+    def test_provide_returns_cookies_set_by_server(
+        self, cookie_provider, mock_fallback, server, url
+    ):
+        cookies = cookie_provider.provide(url)
+
+        assert sorted(cookies, key=lambda c: c["name"]) == [
+            {"name": "session_id", "value": "abc123"},
+            {"name": "user_token", "value": "xyz789", "expiry": 4102444800},
+        ]
+        assert server.requests[0]["User-Agent"] == "TestBot/1.0"
+        mock_fallback.provide.assert_not_called()
+
+    def test_provide_falls_back_on_request_error(self, cookie_provider, mock_fallback, server):
+        url = f"http://127.0.0.1:{server.server_port}/error"
+
+        assert cookie_provider.provide(url) == [{"name": "browser_cookie", "value": "browser"}]
+        mock_fallback.provide.assert_called_once_with(url)
+
+    def test_invalidate_switches_to_fallback(self, cookie_provider, mock_fallback, server, url):
+        cookie_provider.provide(url)
+        cookie_provider.invalidate(url)
+
+        assert cookie_provider.provide(url) == [{"name": "browser_cookie", "value": "browser"}]
+        assert len(server.requests) == 1
+        mock_fallback.invalidate.assert_not_called()
+
+        # once the fallback is in use, invalidation is passed on to it
+        cookie_provider.invalidate(url)
+        mock_fallback.invalidate.assert_called_once_with(url)
@@ -38,3 +38,15 @@ class TestWebdriverCookieProvider:
             cookie_provider.provide("https://example.com")
 
         mock_webdriver.quit.assert_called_once()
+
+    def test_provide_keeps_cookie_expiry(self, mock_webdriver_factory, mock_webdriver):
+        mock_webdriver.get_cookies.return_value = [
+            {"name": "session", "value": "abc", "expiry": 1767225600, "path": "/"},
+            {"name": "tracking", "value": "xyz", "path": "/"},
+        ]
+        cookie_provider = WebdriverCookieProvider(mock_webdriver_factory)
+
+        assert cookie_provider.provide("https://example.com") == [
+            {"name": "session", "value": "abc", "expiry": 1767225600},
+            {"name": "tracking", "value": "xyz"},
+        ]
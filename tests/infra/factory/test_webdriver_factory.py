@@ -3,7 +3,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 from selenium.common.exceptions import WebDriverException
 
-from infra.factory.webdriver import WebdriverFactory
+from infra.factory.webdriver import RESOURCE_TYPE_PATTERNS, WebdriverFactory
 
 
 class TestWebdriverFactory:
@@ -80,3 +80,83 @@ class TestWebdriverFactory:
 
         mock_logger = mock_logger_factory.create.return_value
         mock_logger.error.assert_called()
+
+    @patch("infra.factory.webdriver.webdriver.Chrome")
+    @patch("infra.factory.webdriver.stealth")
+    @patch("infra.factory.webdriver.timeout")
+    def test_create_blocks_requests(
+        self, mock_timeout, mock_stealth, mock_chrome, mock_logger_factory
+    ):
+        mock_timeout.return_value.__enter__.return_value = None
+        factory = WebdriverFactory(
+            chrome_options=[],
+            use_stealth=False,
+            logger_factory=mock_logger_factory,
+            blocked_urls=["*doubleclick.net*", "*.woff*"],
+            blocked_resource_types=["font"],
+        )
+
+        driver = factory.create()
+
+        driver.execute_cdp_cmd.assert_any_call("Network.enable", {})
+        blocked_urls = driver.execute_cdp_cmd.call_args.args[1]["urls"]
+        assert blocked_urls[:2] == ["*doubleclick.net*", "*.woff*"]
+        assert set(RESOURCE_TYPE_PATTERNS["font"]) <= set(blocked_urls)
+        # patterns shared by a url pattern and a resource type are blocked once
+        assert len(blocked_urls) == len(set(blocked_urls))
+
+    @patch("infra.factory.webdriver.webdriver.Chrome")
+    @patch("infra.factory.webdriver.stealth")
+    @patch("infra.factory.webdriver.timeout")
+    def test_create_without_blocking(self, mock_timeout, mock_stealth, mock_chrome, factory):
+        mock_timeout.return_value.__enter__.return_value = None
+
+        driver = factory.create()
+
+        driver.execute_cdp_cmd.assert_not_called()
+
+    @patch("infra.factory.webdriver.webdriver.Chrome")
+    @patch("infra.factory.webdriver.stealth")
+    @patch("infra.factory.webdriver.timeout")
+    def test_create_with_performance_logging(
+        self, mock_timeout, mock_stealth, mock_chrome, mock_logger_factory
+    ):
+        mock_timeout.return_value.__enter__.return_value = None
+        factory = WebdriverFactory(
+            chrome_options=[],
+            use_stealth=False,
+            logger_factory=mock_logger_factory,
+            performance_logging=True,
+        )
+
+        factory.create()
+
+        options = mock_chrome.call_args.kwargs["options"]
+        assert options.to_capabilities()["goog:loggingPrefs"] == {"performance": "ALL"}
+
+    @patch("infra.factory.webdriver.webdriver.Chrome")
+    @patch("infra.factory.webdriver.stealth")
+    @patch("infra.factory.webdriver.timeout")
+    def test_create_with_page_load_strategy(
+        self, mock_timeout, mock_stealth, mock_chrome, mock_logger_factory
+    ):
+        mock_timeout.return_value.__enter__.return_value = None
+        factory = WebdriverFactory(
+            chrome_options=[],
+            use_stealth=False,
+            logger_factory=mock_logger_factory,
+            page_load_strategy="eager",
+        )
+
+        factory.create()
+
+        assert mock_chrome.call_args.kwargs["options"].page_load_strategy == "eager"
+
+    def test_unknown_resource_type(self, mock_logger_factory):
+        with pytest.raises(ValueError, match="script"):
+            WebdriverFactory(
+                chrome_options=[],
+                use_stealth=False,
+                logger_factory=mock_logger_factory,
+                blocked_resource_types=["image", "script"],
+            )
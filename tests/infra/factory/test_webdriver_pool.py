@@ -0,0 +1,124 @@
+import os
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from infra.factory.webdriver import WebdriverFactory
+from infra.factory.webdriver_pool import WebdriverPool, process_tree_rss
+
+
+@pytest.mark.unit
+class TestWebdriverPool:
+    @pytest.fixture
+    def mock_webdriver_factory(self):
+        def create():
+            driver = Mock()
+            driver.execute_script.return_value = 1
+            return driver
+
+        factory = Mock(spec=WebdriverFactory)
+        factory.create.side_effect = create
+        return factory
+
+    @pytest.fixture
+    def pool(self, mock_logger_factory, mock_webdriver_factory):
+        return WebdriverPool(
+            webdriver_factory=mock_webdriver_factory,
+            logger_factory=mock_logger_factory,
+            size=1,
+            max_pages=3,
+        )
+
+    def test_lease_reuses_released_driver(self, pool, mock_webdriver_factory):
+        driver = pool.lease()
+        pool.release(driver)
+
+        assert pool.lease() is driver
+        mock_webdriver_factory.create.assert_called_once()
+        driver.quit.assert_not_called()
+
+    def test_lease_replaces_unresponsive_driver(self, pool, mock_webdriver_factory):
+        driver = pool.lease()
+        pool.release(driver)
+        driver.execute_script.side_effect = WebDriverException("chrome not reachable")
+
+        replacement = pool.lease()
+
+        assert replacement is not driver
+        driver.quit.assert_called_once()
+        assert mock_webdriver_factory.create.call_count == 2
+
+    def test_release_recycles_broken_driver(self, pool, mock_webdriver_factory):
+        driver = pool.lease()
+        pool.release(driver, broken=True)
+
+        driver.quit.assert_called_once()
+        assert pool.lease() is not driver
+
+    def test_release_recycles_driver_after_max_pages(self, pool):
+        driver = pool.lease()
+        for _ in range(3):
+            pool.record_page(driver)
+        pool.release(driver)
+
+        driver.quit.assert_called_once()
+        assert pool.lease() is not driver
+
+    def test_release_recycles_driver_over_memory_limit(self, pool):
+        pool._max_rss_mb = 512
+        driver = pool.lease()
+
+        with patch.object(pool, "_rss", return_value=600 * 1024 * 1024):
+            pool.release(driver)
+
+        driver.quit.assert_called_once()
+
+    def test_lease_waits_for_free_driver(self, pool):
+        driver = pool.lease()
+
+        with pytest.raises(TimeoutError):
+            pool.lease(timeout=0.01)
+
+        threading.Timer(0.05, pool.release, args=(driver,)).start()
+        assert pool.lease(timeout=5) is driver
+
+    def test_lease_returns_slot_when_creation_fails(self, pool, mock_webdriver_factory):
+        mock_webdriver_factory.create.side_effect = WebDriverException("no chrome")
+
+        with pytest.raises(WebDriverException):
+            pool.lease()
+
+        mock_webdriver_factory.create.side_effect = None
+        mock_webdriver_factory.create.return_value = Mock()
+        assert pool.lease(timeout=0.01) is mock_webdriver_factory.create.return_value
+
+    def test_leased_marks_driver_broken_on_webdriver_error(self, pool):
+        with pytest.raises(WebDriverException):
+            with pool.leased() as driver:
+                raise WebDriverException("tab crashed")
+
+        driver.quit.assert_called_once()
+
+    def test_close_quits_idle_and_released_drivers(self, pool):
+        pool._size = 2
+        idle = pool.lease()
+        leased = pool.lease()
+        pool.release(idle)
+
+        pool.close()
+
+        idle.quit.assert_called_once()
+        leased.quit.assert_not_called()
+        pool.release(leased)
+        leased.quit.assert_called_once()
+        with pytest.raises(RuntimeError):
+            pool.lease()
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="requires /proc")
+def test_process_tree_rss():
+    assert process_tree_rss(os.getpid()) > 0
+    assert process_tree_rss(2**22 + 1) is None
@@ -0,0 +1,67 @@
+import gzip
+from datetime import datetime
+
+import pytest
+
+from core.entities.listing import Listing
+from infra.io.response_archive import ResponseArchive
+
+
+@pytest.mark.integration
+class TestResponseArchive:
+    @pytest.fixture
+    def archive(self, tmp_path, mock_logger_factory):
+        return ResponseArchive(
+            basedir=str(tmp_path / "archive"), logger_factory=mock_logger_factory
+        )
+
+    @pytest.fixture
+    def listing(self):
+        return Listing(
+            id="11111",
+            url="https://olx.ba/artikal/11111",
+            title="BMW M3",
+            price="40.000 KM",
+            visited_at=datetime(2025, 12, 16, 10, 0, 0),
+            run_id="run-1",
+        )
+
+    def test_write_and_read(self, archive, listing):
+        payload = {"brand": {"name": "BMW"}, "attributes": [{"name": "Gorivo", "value": "Dizel"}]}
+        with archive.writer() as writer:
+            writer.write(listing, payload)
+            writer.write(Listing(id="22222", url="u", title="t", price="p", run_id="run-2"), {})
+
+        assert archive.run_ids() == ["run-1", "run-2"]
+        responses = list(archive.read("run-1"))
+        assert len(responses) == 1
+        assert responses[0].listing == listing
+        assert responses[0].payload == payload
+
+    def test_sessions_are_appended(self, archive, listing):
+        for idx in range(3):
+            with archive.writer() as writer:
+                writer.write(listing, {"session": idx})
+
+        assert [r.payload["session"] for r in archive.read("run-1")] == [0, 1, 2]
+
+    def test_listing_without_run_id(self, archive, listing):
+        listing.run_id = None
+        with archive.writer() as writer:
+            writer.write(listing, {})
+
+        assert archive.run_ids() == [ResponseArchive.UNKNOWN_RUN_ID]
+
+    def test_read_stops_at_truncated_record(self, archive, listing):
+        with archive.writer() as writer:
+            writer.write(listing, {"record": 1})
+        with gzip.open(archive.path("run-1"), "ab") as file:
+            file.write(b'{"listing": {"id": "2"')
+        data = archive.path("run-1").read_bytes()
+        archive.path("run-1").write_bytes(data[:-10])
+
+        assert [r.payload for r in archive.read("run-1")] == [{"record": 1}]
+
+    def test_read_missing_run(self, archive):
+        with pytest.raises(FileNotFoundError):
+            list(archive.read("missing"))
@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+
+from infra.io.write_behind import WriteBehindBuffer
+
+
+@pytest.mark.unit
+class TestWriteBehindBuffer:
+    @pytest.fixture
+    def batches(self):
+        return []
+
+    @pytest.fixture
+    def make_buffer(self, mock_logger_factory, batches):
+        def make(**kwargs):
+            kwargs.setdefault("write_batch", batches.append)
+            kwargs.setdefault("write_one", lambda item: batches.append([item]))
+            return WriteBehindBuffer(logger_factory=mock_logger_factory, **kwargs)
+
+        return make
+
+    def test_writes_full_batches_and_the_rest_on_close(self, make_buffer, batches):
+        with make_buffer(batch_size=2, flush_interval=60) as buffer:
+            for item in range(5):
+                buffer.put(item)
+
+        assert batches == [[0, 1], [2, 3], [4]]
+        assert buffer.written == 5
+        assert buffer.failed == 0
+
+    def test_flush_writes_pending_entities(self, make_buffer, batches):
+        with make_buffer(batch_size=10, flush_interval=60) as buffer:
+            buffer.put(1)
+            buffer.flush()
+
+            assert batches == [[1]]
+
+    def test_writes_batch_after_flush_interval(self, make_buffer, batches):
+        with make_buffer(batch_size=10, flush_interval=0.05) as buffer:
+            buffer.put(1)
+            buffer.put(2)
+            deadline = time.monotonic() + 5
+            while not batches and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            assert batches == [[1, 2]]
+
+    def test_failed_batch_is_written_one_by_one(self, make_buffer, batches):
+        failed = []
+        written = []
+
+        def write_one(item):
+            if item == 2:
+                raise ValueError("bad row")
+            batches.append([item])
+
+        def write_batch(items):
+            raise ValueError("batch failed")
+
+        with make_buffer(
+            write_batch=write_batch,
+            write_one=write_one,
+            batch_size=3,
+            on_written=written.extend,
+            on_failed=lambda item, err: failed.append((item, str(err))),
+        ) as buffer:
+            for item in range(3):
+                buffer.put(item)
+
+        assert batches == [[0], [1]]
+        assert written == [0, 1]
+        assert failed == [(2, "bad row")]
+        assert (buffer.written, buffer.failed) == (2, 1)
+
+    def test_put_blocks_while_buffer_is_full(self, make_buffer, batches):
+        release = threading.Event()
+
+        def write_batch(items):
+            release.wait(5)
+            batches.append(items)
+
+        buffer = make_buffer(write_batch=write_batch, batch_size=1, max_pending=1)
+        buffer.put(1)  # taken by the writer, which waits for the release
+        buffer.put(2)  # fills the buffer
+        third = threading.Thread(target=buffer.put, args=(3,))
+        third.start()
+        third.join(0.2)
+
+        assert third.is_alive()  # back pressure on the producer
+        release.set()
+        third.join(5)
+        buffer.close()
+        assert batches == [[1], [2], [3]]
+
+    def test_writes_pending_entities_when_block_fails(self, make_buffer, batches):
+        with pytest.raises(RuntimeError, match="scraper"):
+            with make_buffer(batch_size=10, flush_interval=60) as buffer:
+                buffer.put(1)
+                raise RuntimeError("scraper crashed")
+
+        assert batches == [[1]]
+        with pytest.raises(RuntimeError, match="closed"):
+            buffer.put(2)
+
+    def test_failing_callback_does_not_stop_writer(self, make_buffer, batches):
+        def on_written(items):
+            raise ValueError("callback failed")
+
+        with make_buffer(batch_size=1, on_written=on_written) as buffer:
+            buffer.put(1)
+            buffer.put(2)
+
+        assert batches == [[1], [2]]
+        assert buffer.written == 2
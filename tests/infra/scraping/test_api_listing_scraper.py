@@ -0,0 +1,143 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from core.entities.brand import Brand
+from core.entities.listing import Listing
+from core.entities.watermark import BrandWatermark
+from core.exceptions import IncompleteCrawlError
+from infra.factory.clients.http import ClientType, HttpClientFactory
+from infra.interfaces.cookie_provider import CookieProvider
+from infra.scraping.api_listing_scraper import ApiListingScraper
+
+SEARCH_PAGES = {
+    1: [
+        {"id": 11111, "title": " BMW M3 ", "display_price": "40.000 KM"},
+        {"id": 22222, "title": "BMW 320d", "price": 25500},
+    ],
+    2: [{"id": 33333, "title": "BMW X5", "price": 0}],
+}
+
+
+class SearchHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        self.server.requests.append(query)
+        page = int(query["page"][0])
+        if page in self.server.failing_pages:
+            status, payload = 500, {"error": "server error"}
+        elif url.path != "/api/search" or query["brand"] != ["1"]:
+            status, payload = 404, {"error": "not found"}
+        else:
+            status = 200
+            payload = {
+                "data": SEARCH_PAGES.get(page, []),
+                "meta": {"current_page": page, "last_page": len(SEARCH_PAGES)},
+            }
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.mark.integration
+class TestApiListingScraper:
+    @pytest.fixture
+    def server(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), SearchHandler)
+        server.requests = []
+        server.failing_pages = set()
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+
+    @pytest.fixture
+    def base_url(self, server):
+        return f"http://127.0.0.1:{server.server_port}"
+
+    @pytest.fixture
+    def http_client_factory(self, mock_logger_factory, base_url):
+        cookie_provider = Mock(spec=CookieProvider)
+        cookie_provider.provide.return_value = []
+        return HttpClientFactory(
+            url=base_url,
+            headers={},
+            logger_factory=mock_logger_factory,
+            cookie_provider=cookie_provider,
+            client_type=ClientType.REQUESTS,
+        )
+
+    @pytest.fixture
+    def scraper(self, mock_logger_factory, http_client_factory, base_url):
+        return ApiListingScraper(
+            logger_factory=mock_logger_factory,
+            http_client_factory=http_client_factory,
+            created_gte="-24+hours",
+            timeout=5.0,
+            base_url=base_url,
+        )
+
+    def test_run_yields_listings_of_all_pages(self, scraper, server, base_url):
+        listings = list(scraper.run(Brand(id="1", name="BMW", slug="bmw")))
+
+        assert all(isinstance(listing, Listing) for listing in listings)
+        assert [(listing.id, listing.title, listing.price) for listing in listings] == [
+            ("11111", "BMW M3", "40.000 KM"),
+            ("22222", "BMW 320d", "25.500 KM"),
+            ("33333", "BMW X5", "Na upit"),
+        ]
+        assert listings[0].url == f"{base_url}/artikal/11111"
+        assert all(listing.visited_at is not None for listing in listings)
+
+        # pagination stops at the last page and the search query is passed through
+        assert [query["page"] for query in server.requests] == [["1"], ["2"]]
+        assert server.requests[0]["created_gte"] == ["-24 hours"]
+        assert server.requests[0]["category_id"] == ["18"]
+
+    def test_incremental_run_stops_at_watermark(self, scraper, server):
+        scraper._incremental = True
+        watermark = BrandWatermark(brand_id="1", listing_id="22222")
+
+        listings = list(scraper.run(Brand(id="1", name="BMW", slug="bmw"), watermark=watermark))
+
+        # the first page holds only listings covered by the watermark
+        assert listings == []
+        assert len(server.requests) == 1
+        assert server.requests[0]["sort_by"] == ["date"]
+        assert server.requests[0]["sort_order"] == ["desc"]
+
+    def test_run_stops_when_search_is_not_found(self, scraper, server):
+        listings = list(scraper.run(Brand(id="2", name="Audi", slug="audi")))
+
+        assert listings == []
+        # a missing page is not retried
+        assert len(server.requests) == 1
+
+    def test_run_reports_client_creation_failure(self, scraper, http_client_factory):
+        http_client_factory._cookie_provider.provide.side_effect = Exception("No cookies")
+
+        with pytest.raises(IncompleteCrawlError, match="No cookies"):
+            list(scraper.run(Brand(id="1", name="BMW", slug="bmw")))
+
+    def test_run_reports_page_failing_mid_crawl(self, scraper, server):
+        server.failing_pages = {2}
+        listings = []
+
+        with patch("backoff._sync.time.sleep"):
+            with pytest.raises(IncompleteCrawlError, match="page=2"):
+                listings.extend(scraper.run(Brand(id="1", name="BMW", slug="bmw")))
+
+        # the listings of the first page are yielded before the crawl fails
+        assert [listing.id for listing in listings] == ["11111", "22222"]
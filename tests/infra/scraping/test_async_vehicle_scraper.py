@@ -0,0 +1,153 @@
+import json
+from unittest.mock import Mock
+
+import httpx
+import pytest
+
+from core.entities.listing import Listing
+from core.entities.vehicle import Vehicle
+from infra.factory.clients.http import HttpClientFactory
+from infra.scraping.async_vehicle_scraper import AsyncVehicleScraper
+
+
+@pytest.mark.unit
+class TestAsyncVehicleScraper:
+    @pytest.fixture
+    def api_payloads(self):
+        return {
+            "11111": {
+                "state": "active",
+                "brand": {"name": "BMW"},
+                "model": {"name": "M3"},
+                "attributes": [{"name": "Gorivo", "value": "Dizel", "type": "string"}],
+            },
+            "22222": {
+                "state": "active",
+                "brand": {"name": "Audi"},
+                "model": {"name": "A4"},
+                "attributes": [{"name": "Godište", "value": "2015", "type": "number"}],
+            },
+        }
+
+    @pytest.fixture
+    def requested_urls(self):
+        return []
+
+    @pytest.fixture
+    def session_cookies(self):
+        return {"session": "valid"}
+
+    @pytest.fixture
+    def mock_http_client_factory(self, api_payloads, requested_urls, session_cookies):
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested_urls.append(str(request.url))
+            if request.headers.get("cookie") != f"session={session_cookies['session']}":
+                return httpx.Response(403)
+            listing_id = request.url.path.rsplit("/", 1)[-1]
+            if listing_id not in api_payloads:
+                return httpx.Response(404)
+            return httpx.Response(200, content=json.dumps(api_payloads[listing_id]))
+
+        factory = Mock(spec=HttpClientFactory)
+        cookies = {"session": "valid"}
+
+        def create_async(*args, **kwargs):
+            return httpx.AsyncClient(transport=httpx.MockTransport(handler), cookies=cookies)
+
+        def invalidate_cookies():
+            cookies["session"] = session_cookies["session"]
+
+        factory.create_async.side_effect = create_async
+        factory.invalidate_cookies.side_effect = invalidate_cookies
+        return factory
+
+    @pytest.fixture
+    def scraper(self, mock_logger_factory, mock_http_client_factory):
+        return AsyncVehicleScraper(
+            logger_factory=mock_logger_factory,
+            http_client_factory=mock_http_client_factory,
+            timeout=5.0,
+            reinit_session_every=500,
+            concurrency=4,
+        )
+
+    @pytest.fixture
+    def listings(self):
+        return [
+            Listing(
+                id="11111",
+                url="https://olx.ba/artikal/11111",
+                title="BMW M3",
+                price="40.000 KM",
+            ),
+            Listing(
+                id="22222",
+                url="https://olx.ba/artikal/22222",
+                title="Audi A4",
+                price="30.000 KM",
+            ),
+            Listing(
+                id="33333",
+                url="https://olx.ba/artikal/33333",
+                title="Mercedes C250",
+                price="25.000 KM",
+            ),
+        ]
+
+    def test_run_yields_vehicle_for_every_listing(self, scraper, listings, requested_urls):
+        results = list(scraper.run(listings))
+
+        assert len(results) == 3
+        vehicles = sorted((v for v in results if v is not None), key=lambda v: v.id)
+        assert all(isinstance(v, Vehicle) for v in vehicles)
+        assert [v.id for v in vehicles] == ["11111", "22222"]
+        assert vehicles[0].brand == "BMW"
+        assert vehicles[0].fuel_type == "Dizel"
+        assert vehicles[1].build_year == 2015
+
+        # the listing missing from the api is reported as a failure
+        assert results.count(None) == 1
+        assert sorted(requested_urls) == [
+            "https://olx.ba/api/listings/11111",
+            "https://olx.ba/api/listings/22222",
+            "https://olx.ba/api/listings/33333",
+        ]
+
+    def test_run_session_reinit(self, scraper, mock_http_client_factory, listings):
+        scraper._reinit_session_every = 2
+
+        list(scraper.run(listings))
+
+        # one session for the first two listings, another one for the last listing
+        assert mock_http_client_factory.create_async.call_count == 2
+
+    def test_run_handles_client_creation_failure(self, scraper, mock_http_client_factory, listings):
+        mock_http_client_factory.create_async.side_effect = Exception("No cookies")
+
+        assert list(scraper.run(listings)) == []
+
+    def test_run_retries_rejected_listings_with_fresh_cookies(
+        self, scraper, mock_http_client_factory, listings, session_cookies, requested_urls
+    ):
+        # the api no longer accepts the cookies the clients were created with
+        session_cookies["session"] = "renewed"
+
+        results = list(scraper.run(listings))
+
+        mock_http_client_factory.invalidate_cookies.assert_called_once()
+        assert mock_http_client_factory.create_async.call_count == 2
+        assert len(results) == 3
+        assert sorted(v.id for v in results if v is not None) == ["11111", "22222"]
+        # every listing was requested once per session, rejections are not retried by backoff
+        assert len(requested_urls) == 6
+
+    def test_run_gives_up_when_fresh_cookies_are_rejected(
+        self, scraper, mock_http_client_factory, listings, session_cookies
+    ):
+        mock_http_client_factory.invalidate_cookies.side_effect = None
+        session_cookies["session"] = "renewed"
+
+        results = list(scraper.run(listings))
+
+        assert results == [None, None, None]
+        mock_http_client_factory.invalidate_cookies.assert_called_once()
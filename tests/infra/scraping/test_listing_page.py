@@ -0,0 +1,118 @@
+import pytest
+
+from infra.scraping.listing_page import (
+    EXTRACT_PAGE_SCRIPT,
+    PRICE_ON_REQUEST,
+    ListingPage,
+    ListingPageParser,
+)
+
+
+@pytest.mark.unit
+class TestListingPageParser:
+    @pytest.fixture
+    def parser(self):
+        return ListingPageParser(base_url="https://olx.ba/")
+
+    @pytest.fixture
+    def page_source(self):
+        return """
+        <html>
+            <body>
+                <div class="cards">
+                    <a href="/artikal/11111 ">
+                        <h1 class="main-heading"> BMW X5 </h1>
+                        <div class="price-wrap"><span class="smaller">45.000 KM</span></div>
+                    </a>
+                    <a href="/artikal/22222">
+                        <h1 class="main-heading">Škoda Octavia</h1>
+                        <div class="price-wrap">
+                            <span class="smaller">Na upit</span>
+                            <span class="smaller">ignored</span>
+                        </div>
+                    </a>
+                    <a href="/artikal/33333"><h1 class="main-heading">No price</h1></a>
+                    <a href="/profil/someone">Not a listing</a>
+                </div>
+                <div class="olx-pagination-wrapper">
+                    <ul><li>1</li><li class="active">2</li><li> 3 </li></ul>
+                </div>
+            </body>
+        </html>
+        """
+
+    def test_parse_returns_listings_and_next_page(self, parser, page_source):
+        page = parser.parse(page_source)
+
+        assert [(lst.id, lst.url, lst.title, lst.price) for lst in page.listings] == [
+            ("11111", "https://olx.ba/artikal/11111", "BMW X5", "45.000 KM"),
+            ("22222", "https://olx.ba/artikal/22222", "Škoda Octavia", "Na upit"),
+        ]
+        assert all(lst.visited_at is not None for lst in page.listings)
+        assert page.next_page == "3"
+        assert page.last_page == 3
+
+    def test_parse_last_page(self, parser):
+        page_source = """
+        <div class="olx-pagination-wrapper"><li>4</li><li class="active">5</li></div>
+        """
+        assert parser.parse(page_source) == ListingPage(listings=[], next_page=None, last_page=5)
+
+    @pytest.mark.parametrize("page_source", ["", "<html><body>No listings here</body></html>"])
+    def test_parse_page_without_results(self, parser, page_source):
+        assert parser.parse(page_source) == ListingPage()
+
+    def test_parse_script_result(self, parser):
+        result = {
+            "not_found": False,
+            "listings": [
+                {"href": "/artikal/11111 ", "title": " BMW X5 ", "price": "45.000 KM"},
+                {"href": "/artikal/22222", "title": "No price", "price": None},
+            ],
+            "next_page": "3",
+            "last_page": 7,
+        }
+
+        page = parser.parse_script_result(result)
+
+        assert [(lst.id, lst.url, lst.title, lst.price) for lst in page.listings] == [
+            ("11111", "https://olx.ba/artikal/11111", "BMW X5", "45.000 KM"),
+        ]
+        assert page.next_page == "3"
+        assert page.last_page == 7
+
+    def test_parse_search_results(self, parser):
+        search_results = {
+            "data": [
+                {"id": 11111, "title": "BMW X5", "display_price": "45.000 KM"},
+                {"id": 22222, "title": "Audi A4", "price": 18500},
+                {"id": 33333, "title": "Golf 2", "price": 0},
+            ],
+            "meta": {"current_page": 2, "last_page": 3},
+        }
+
+        page = parser.parse_search_results(search_results)
+
+        assert [(lst.id, lst.url, lst.title, lst.price) for lst in page.listings] == [
+            ("11111", "https://olx.ba/artikal/11111", "BMW X5", "45.000 KM"),
+            ("22222", "https://olx.ba/artikal/22222", "Audi A4", "18.500 KM"),
+            ("33333", "https://olx.ba/artikal/33333", "Golf 2", PRICE_ON_REQUEST),
+        ]
+        assert page.next_page == "3"
+        assert page.last_page == 3
+
+    def test_parse_search_results_last_page(self, parser):
+        search_results = {
+            "data": [{"id": 11111, "title": "BMW X5", "price": 45000}],
+            "meta": {"current_page": 3, "last_page": 3},
+        }
+
+        assert parser.parse_search_results(search_results).next_page is None
+        assert parser.parse_search_results({"data": [], "meta": {}}) == ListingPage()
+
+    def test_extract_page_script_matches_xpath_lookups(self):
+        # the script mirrors the XPaths of the html parser
+        assert "a[href^='/artikal/']" in EXTRACT_PAGE_SCRIPT
+        assert "h1[class*='main-heading']" in EXTRACT_PAGE_SCRIPT
+        assert "div[class*='price-wrap'] span[class*='smaller']" in EXTRACT_PAGE_SCRIPT
+        assert "div[class='olx-pagination-wrapper']" in EXTRACT_PAGE_SCRIPT
@@ -1,12 +1,21 @@
-from unittest.mock import Mock, patch
+import json
+import threading
+from unittest.mock import Mock, PropertyMock, patch
+from urllib.parse import parse_qs, urlsplit
 
 import pytest
+from selenium.common.exceptions import TimeoutException, WebDriverException
 
 from core.entities.brand import Brand
 from core.entities.listing import Listing
-from core.exceptions import PageNotFoundError
+from core.entities.watermark import BrandWatermark
+from core.exceptions import IncompleteCrawlError, PageNotFoundError
 from infra.factory.webdriver import WebdriverFactory
+from infra.factory.webdriver_pool import WebdriverPool
+from infra.scraping.listing_page import EXTRACT_PAGE_SCRIPT, NOT_FOUND_PATTERNS
 from infra.scraping.listing_scraper import ListingScraper
+from infra.scraping.readiness import READINESS_SCRIPTS
+from infra.utils.rate_limiter import HostRateLimiter, PacingState
 
 
 @pytest.mark.unit
@@ -23,13 +32,19 @@ class TestListingScraper:
         return driver
 
     @pytest.fixture
-    def scraper(self, mock_logger_factory, mock_webdriver_factory):
+    def mock_rate_limiter(self):
+        rate_limiter = Mock(spec=HostRateLimiter)
+        rate_limiter.acquire.return_value = 0.0
+        rate_limiter.state.return_value = PacingState(rate=0.5, error_ratio=0.0, requests=1)
+        return rate_limiter
+
+    @pytest.fixture
+    def scraper(self, mock_logger_factory, mock_webdriver_factory, mock_rate_limiter):
         return ListingScraper(
             logger_factory=mock_logger_factory,
             webdriver_factory=mock_webdriver_factory,
-            min_req_delay=1.0,
-            max_req_delay=2.0,
             timeout=5.0,
+            rate_limiter=mock_rate_limiter,
         )
 
     @pytest.fixture
@@ -50,7 +65,7 @@ class TestListingScraper:
         for page_source in valid_pages:
             assert scraper._check_page_unk(page_source) is False
 
-    def test_extract_listings(self, scraper):
+    def test_parse_listings(self, scraper):
         page_source = """
         <html>
             <a href="/artikal/11111">
@@ -87,7 +102,7 @@ class TestListingScraper:
                 "price": "35.000 KM",
             },
         ]
-        listings = scraper._extract_listings(page_source)
+        listings = scraper._page_parser.parse(page_source).listings
         assert len(listings) == len(expected)
 
         for actual, result in zip(expected, listings, strict=False):
@@ -96,12 +111,12 @@ class TestListingScraper:
             assert result.title == actual["title"]
             assert result.price == actual["price"]
 
-    def test_extract_listings_empty(self, scraper):
+    def test_parse_listings_empty(self, scraper):
         page_source = "<html><body>No listings here</body></html>"
-        listings = scraper._extract_listings(page_source)
+        listings = scraper._page_parser.parse(page_source).listings
         assert len(listings) == 0
 
-    def test_get_next_page(self, scraper):
+    def test_parse_next_page(self, scraper):
         inputs = [
             # actual positive case - needs to extract the next page number
             """
@@ -126,7 +141,7 @@ class TestListingScraper:
         ]
         expected_results = ["3", None, None]
         for page_source, expected in zip(inputs, expected_results, strict=False):
-            result = scraper._get_next_page(page_source)
+            result = scraper._page_parser.parse(page_source).next_page
             assert result is None and expected is None or result == expected
 
     def test_get_page_source_returns_html(self, scraper, mock_driver):
@@ -147,16 +162,152 @@ class TestListingScraper:
             with pytest.raises(PageNotFoundError):
                 scraper._get_page_source(url, mock_driver)
 
-    def test_get_page_source_respects_delay(self, scraper, mock_driver):
+    def test_get_page_source_respects_rate_limit(self, scraper, mock_driver, mock_rate_limiter):
+        mock_driver.page_source = "<html>Content</html>"
+        url = "https://olx.ba/test"
+
+        scraper._get_page_source(url, mock_driver)
+
+        mock_rate_limiter.acquire.assert_called_once_with(url)
+        mock_rate_limiter.record_success.assert_called_once_with(url)
+
+    def test_get_page_source_waits_for_readiness(self, scraper, mock_driver):
         mock_driver.page_source = "<html>Content</html>"
+        mock_driver.execute_script.side_effect = [False, False, True]
+        scraper._readiness = "cards"
+
+        with patch("selenium.webdriver.support.wait.time.sleep"):
+            scraper._get_page_source("https://olx.ba/test", mock_driver)
+
+        mock_driver.execute_script.assert_called_with(
+            READINESS_SCRIPTS["cards"], NOT_FOUND_PATTERNS
+        )
+        assert mock_driver.execute_script.call_count == 3
+        # the wait of every page is recorded, from the request until the page was ready
+        waits = scraper.page_waits
+        assert waits.pages == 1
+        assert waits.total_seconds == waits.p95_seconds > 0
+
+    def test_get_page_source_reports_timeouts(self, scraper, mock_driver, mock_rate_limiter):
+        mock_driver.page_source = "<html>Loading...</html>"
+        url = "https://olx.ba/test"
+
+        with (
+            patch(
+                "infra.scraping.listing_scraper.WebDriverWait.until",
+                side_effect=TimeoutException(),
+            ),
+            patch("time.sleep"),
+        ):
+            with pytest.raises(TimeoutException):
+                scraper._get_page_source(url, mock_driver)
+
+        # every attempt is reported to the rate limiter so it can back off
+        assert mock_rate_limiter.record_failure.call_count == 3
+        mock_rate_limiter.record_success.assert_not_called()
+
+    def test_get_page_extracts_inside_browser(self, scraper, mock_driver, mock_rate_limiter):
+        result = {
+            "not_found": False,
+            "listings": [{"href": "/artikal/11111", "title": "BMW M3", "price": "40.000 KM"}],
+            "next_page": "2",
+            "last_page": 2,
+        }
+        mock_driver.execute_script.side_effect = lambda script, *args: (
+            True if script in READINESS_SCRIPTS.values() else result
+        )
+        # the html never leaves the browser
+        type(mock_driver).page_source = PropertyMock(side_effect=AssertionError("page_source"))
+        scraper._extraction = "script"
         url = "https://olx.ba/test"
 
-        with patch("time.sleep") as mock_sleep:
-            scraper._get_page_source(url, mock_driver)
+        page = scraper._get_page(url, mock_driver)
+
+        assert [listing.id for listing in page.listings] == ["11111"]
+        assert page.next_page == "2"
+        mock_driver.execute_script.assert_called_with(EXTRACT_PAGE_SCRIPT, NOT_FOUND_PATTERNS)
+        mock_rate_limiter.record_success.assert_called_once_with(url)
+
+    def test_get_page_script_raises_page_not_found_error(self, scraper, mock_driver):
+        mock_driver.execute_script.side_effect = lambda script, *args: (
+            True if script in READINESS_SCRIPTS.values() else {"not_found": True}
+        )
+        scraper._extraction = "script"
+
+        with patch("time.sleep"):
+            with pytest.raises(PageNotFoundError):
+                scraper._get_page("https://olx.ba/test", mock_driver)
 
-            mock_sleep.assert_called_once()
-            delay_arg = mock_sleep.call_args[0][0]
-            assert scraper._min_req_delay <= delay_arg <= scraper._max_req_delay
+    @staticmethod
+    def performance_log(*responses: tuple[str, str, str]) -> list[dict]:
+        """Performance log entries of the given (request id, url, mime type) responses."""
+        return [
+            {
+                "message": json.dumps(
+                    {
+                        "message": {
+                            "method": "Network.responseReceived",
+                            "params": {
+                                "requestId": request_id,
+                                "response": {"url": url, "mimeType": mime_type},
+                            },
+                        }
+                    }
+                )
+            }
+            for request_id, url, mime_type in responses
+        ]
+
+    def test_get_page_reads_captured_search_results(self, scraper, mock_driver):
+        search_results = {
+            "data": [{"id": 11111, "title": "BMW M3", "display_price": "40.000 KM"}],
+            "meta": {"current_page": 1, "last_page": 2},
+        }
+        mock_driver.get_log.side_effect = [
+            self.performance_log(("1", "https://olx.ba/api/search?page=9", "application/json")),
+            self.performance_log(
+                ("2", "https://olx.ba/pretraga?page=1", "text/html"),
+                ("3", "https://olx.ba/api/search?page=1", "application/json"),
+                ("4", "https://olx.ba/api/categories", "application/json"),
+            ),
+        ]
+        mock_driver.execute_cdp_cmd.return_value = {"body": json.dumps(search_results)}
+        # no html is parsed when the search results were captured
+        type(mock_driver).page_source = PropertyMock(side_effect=AssertionError("page_source"))
+        scraper._extraction = "network"
+
+        page = scraper._get_page("https://olx.ba/pretraga?page=1", mock_driver)
+
+        assert [(lst.id, lst.price) for lst in page.listings] == [("11111", "40.000 KM")]
+        assert page.next_page == "2"
+        # responses logged before the page was loaded are dropped
+        mock_driver.execute_cdp_cmd.assert_called_once_with(
+            "Network.getResponseBody", {"requestId": "3"}
+        )
+
+    def test_get_page_falls_back_to_html_without_captured_results(self, scraper, mock_driver):
+        mock_driver.get_log.side_effect = WebDriverException("log type 'performance' not found")
+        mock_driver.page_source = """
+        <a href="/artikal/11111">
+            <h1 class="main-heading">BMW M3</h1>
+            <div class="price-wrap"><span class="smaller">40.000 KM</span></div>
+        </a>
+        """
+        scraper._extraction = "network"
+
+        page = scraper._get_page("https://olx.ba/pretraga?page=1", mock_driver)
+
+        assert [lst.id for lst in page.listings] == ["11111"]
+        mock_driver.execute_cdp_cmd.assert_not_called()
+
+    def test_get_page_network_raises_page_not_found_error(self, scraper, mock_driver):
+        mock_driver.get_log.return_value = []
+        mock_driver.page_source = f"<html><body>{NOT_FOUND_PATTERNS[0]}</body></html>"
+        scraper._extraction = "network"
+
+        with patch("time.sleep"):
+            with pytest.raises(PageNotFoundError):
+                scraper._get_page("https://olx.ba/test", mock_driver)
 
     def test_scrape_listings_single_page(self, scraper, mock_driver, sample_brand):
         page_html = """
@@ -170,8 +321,7 @@ class TestListingScraper:
         mock_driver.page_source = page_html
 
         with patch.object(scraper, "_get_page_source", return_value=page_html):
-            with patch.object(scraper, "_get_next_page", return_value=None):
-                listings = list(scraper.scrape_listings(mock_driver, sample_brand))
+            listings = list(scraper.scrape_listings(mock_driver, sample_brand))
 
         assert len(listings) == 1
         assert listings[0].id == "11111"
@@ -212,6 +362,180 @@ class TestListingScraper:
         assert listings[1].title == "Audi A4"
         assert listings[1].price == "30.000 KM"
 
+    def test_scrape_listings_stops_at_watermark(self, scraper, mock_driver, sample_brand):
+        def render(*listing_ids):
+            cards = "".join(
+                f'<a href="/artikal/{listing_id}"><h1 class="main-heading">BMW</h1>'
+                f'<div class="price-wrap"><span class="smaller">1 KM</span></div></a>'
+                for listing_id in listing_ids
+            )
+            pagination = (
+                '<div class="olx-pagination-wrapper"><li class="active">1</li><li>2</li></div>'
+            )
+            return f"<html>{cards}{pagination}</html>"
+
+        pages = [render("44444", "33333"), render("22222", "11111"), render("00001")]
+        watermark = BrandWatermark(brand_id=sample_brand.id, listing_id="22222")
+        scraper._incremental = True
+
+        with patch.object(scraper, "_get_page_source", side_effect=pages) as get_page_source:
+            listings = list(scraper.scrape_listings(mock_driver, sample_brand, watermark))
+
+        assert [listing.id for listing in listings] == ["44444", "33333"]
+        # the page made of listings covered by the watermark is not yielded, nor paged past
+        assert get_page_source.call_count == 2
+        assert "sort_by=date&sort_order=desc" in get_page_source.call_args.args[0]
+
+    def test_scrape_listings_ignores_watermark_when_not_incremental(
+        self, scraper, mock_driver, sample_brand
+    ):
+        page_html = """
+        <html>
+            <a href="/artikal/11111">
+                <h1 class="main-heading">BMW M3</h1>
+                <div class="price-wrap"><span class="smaller">40.000 KM</span></div>
+            </a>
+        </html>
+        """
+        watermark = BrandWatermark(brand_id=sample_brand.id, listing_id="22222")
+
+        with patch.object(scraper, "_get_page_source", return_value=page_html) as get_page_source:
+            listings = list(scraper.scrape_listings(mock_driver, sample_brand, watermark))
+
+        assert [listing.id for listing in listings] == ["11111"]
+        assert "sort_by" not in get_page_source.call_args.args[0]
+
+    def test_scrape_listings_fetches_remaining_pages_concurrently(
+        self, scraper, mock_webdriver_factory, mock_driver, sample_brand
+    ):
+        def render(page, *listing_ids):
+            cards = "".join(
+                f'<a href="/artikal/{listing_id}"><h1 class="main-heading">BMW</h1>'
+                f'<div class="price-wrap"><span class="smaller">1 KM</span></div></a>'
+                for listing_id in listing_ids
+            )
+            items = "".join(
+                f'<li class="active">{p}</li>' if p == page else f"<li>{p}</li>"
+                for p in range(1, 5)
+            )
+            return f'<html>{cards}<div class="olx-pagination-wrapper">{items}</div></html>'
+
+        pages = {
+            "1": render(1, "1", "2"),
+            "2": render(2, "2", "3"),  # "2" moved over from the first page
+            "3": render(3, "4"),
+            "4": render(4, "5"),
+        }
+        used_drivers = set()
+        barrier = threading.Barrier(2, timeout=5)
+
+        def get_page_source(url, driver):
+            page = parse_qs(urlsplit(url).query)["page"][0]
+            used_drivers.add(id(driver))
+            if page in ("2", "3"):
+                barrier.wait()  # both pages are in flight at the same time
+            return pages[page]
+
+        borrowed_driver = Mock()
+        mock_webdriver_factory.create.return_value = borrowed_driver
+        scraper._page_concurrency = 2
+
+        with patch.object(scraper, "_get_page_source", side_effect=get_page_source):
+            listings = list(scraper.scrape_listings(mock_driver, sample_brand))
+
+        assert sorted(listing.id for listing in listings) == ["1", "2", "3", "4", "5"]
+        assert used_drivers == {id(mock_driver), id(borrowed_driver)}
+        # the borrowed browser is quit, the brand's own browser is left to the caller
+        borrowed_driver.quit.assert_called_once()
+        mock_driver.quit.assert_not_called()
+
+    def test_scrape_listings_reports_page_failing_mid_crawl(
+        self, scraper, mock_driver, sample_brand
+    ):
+        page_html = """
+        <html>
+            <a href="/artikal/11111">
+                <h1 class="main-heading">BMW M3</h1>
+                <div class="price-wrap"><span class="smaller">40.000 KM</span></div>
+            </a>
+            <div class="olx-pagination-wrapper"><li class="active">1</li><li>2</li></div>
+        </html>
+        """
+        listings = []
+
+        with patch.object(
+            scraper, "_get_page_source", side_effect=[page_html, TimeoutException("timeout")]
+        ):
+            with pytest.raises(IncompleteCrawlError, match="page=2"):
+                listings.extend(scraper.scrape_listings(mock_driver, sample_brand))
+
+        assert [listing.id for listing in listings] == ["11111"]
+
+    def test_scrape_listings_reports_concurrent_page_failures(
+        self, scraper, mock_webdriver_factory, mock_driver, sample_brand
+    ):
+        page_html = """
+        <html>
+            <a href="/artikal/11111">
+                <h1 class="main-heading">BMW M3</h1>
+                <div class="price-wrap"><span class="smaller">40.000 KM</span></div>
+            </a>
+            <div class="olx-pagination-wrapper">
+                <li class="active">1</li><li>2</li><li>3</li>
+            </div>
+        </html>
+        """
+
+        def get_page_source(url, driver):
+            page = parse_qs(urlsplit(url).query)["page"][0]
+            if page == "2":
+                raise TimeoutException("timeout")
+            if page == "3":
+                raise PageNotFoundError(url)  # the results shrank while paging
+            return page_html
+
+        mock_webdriver_factory.create.return_value = Mock()
+        scraper._page_concurrency = 2
+        listings = []
+
+        with patch.object(scraper, "_get_page_source", side_effect=get_page_source):
+            with pytest.raises(IncompleteCrawlError, match=r"pages \[2\]"):
+                listings.extend(scraper.scrape_listings(mock_driver, sample_brand))
+
+        assert [listing.id for listing in listings] == ["11111"]
+
+    def test_scrape_listings_stops_at_missing_page(self, scraper, mock_driver, sample_brand):
+        with patch.object(
+            scraper, "_get_page_source", side_effect=PageNotFoundError("https://olx.ba/test")
+        ):
+            assert list(scraper.scrape_listings(mock_driver, sample_brand)) == []
+
+    def test_scrape_listings_borrows_drivers_from_pool(self, scraper, mock_driver, sample_brand):
+        page_html = """
+        <html>
+            <a href="/artikal/11111">
+                <h1 class="main-heading">BMW M3</h1>
+                <div class="price-wrap"><span class="smaller">40.000 KM</span></div>
+            </a>
+            <div class="olx-pagination-wrapper">
+                <li class="active">1</li><li>2</li><li>3</li>
+            </div>
+        </html>
+        """
+        borrowed_driver = Mock()
+        pool = Mock(spec=WebdriverPool)
+        pool.lease.side_effect = [borrowed_driver, TimeoutError("pool exhausted")]
+        scraper._webdriver_pool = pool
+        scraper._page_concurrency = 3
+
+        with patch.object(scraper, "_get_page_source", return_value=page_html) as get_page_source:
+            listings = list(scraper.scrape_listings(mock_driver, sample_brand))
+
+        assert [listing.id for listing in listings] == ["11111"]
+        assert get_page_source.call_count == 3
+        pool.lease.assert_called_with(timeout=0)
+        pool.release.assert_called_once_with(borrowed_driver, broken=False)
+
     def test_run_handles_driver_on_success(
         self, scraper, mock_webdriver_factory, mock_driver, sample_brand
     ):
@@ -229,10 +553,83 @@ class TestListingScraper:
         mock_webdriver_factory.create.return_value = mock_driver
 
         with patch.object(scraper, "scrape_listings", side_effect=Exception("Error")):
-            list(scraper.run(sample_brand))
+            with pytest.raises(IncompleteCrawlError):
+                list(scraper.run(sample_brand))
 
         mock_driver.quit.assert_called_once()
 
+    def test_run_leases_driver_from_pool(
+        self, scraper, mock_webdriver_factory, mock_driver, sample_brand
+    ):
+        pool = Mock(spec=WebdriverPool)
+        pool.lease.return_value = mock_driver
+        scraper._webdriver_pool = pool
+
+        with patch.object(scraper, "scrape_listings", return_value=iter([])):
+            list(scraper.run(sample_brand))
+
+        mock_webdriver_factory.create.assert_not_called()
+        pool.release.assert_called_once_with(mock_driver, broken=False)
+        mock_driver.quit.assert_not_called()
+
+    def test_run_releases_broken_driver_to_pool(self, scraper, mock_driver, sample_brand):
+        pool = Mock(spec=WebdriverPool)
+        pool.lease.return_value = mock_driver
+        scraper._webdriver_pool = pool
+
+        with patch.object(
+            scraper, "scrape_listings", side_effect=WebDriverException("chrome not reachable")
+        ):
+            with pytest.raises(IncompleteCrawlError):
+                list(scraper.run(sample_brand))
+
+        pool.release.assert_called_once_with(mock_driver, broken=True)
+
+    @pytest.mark.parametrize(
+        "error, broken",
+        [(WebDriverException("invalid session id"), True), (TimeoutException("timeout"), False)],
+    )
+    def test_run_releases_driver_failing_mid_crawl(
+        self, scraper, mock_driver, sample_brand, error, broken
+    ):
+        pool = Mock(spec=WebdriverPool)
+        pool.lease.return_value = mock_driver
+        scraper._webdriver_pool = pool
+
+        with patch.object(scraper, "_get_page_source", side_effect=error):
+            with pytest.raises(IncompleteCrawlError):
+                list(scraper.run(sample_brand))
+
+        # a crashed browser is not handed out again, a timed out page leaves it usable
+        pool.release.assert_called_once_with(mock_driver, broken=broken)
+
+    def test_run_releases_driver_crashing_on_concurrent_page(
+        self, scraper, mock_driver, sample_brand
+    ):
+        page_html = """
+        <html>
+            <a href="/artikal/11111">
+                <h1 class="main-heading">BMW M3</h1>
+                <div class="price-wrap"><span class="smaller">40.000 KM</span></div>
+            </a>
+            <div class="olx-pagination-wrapper"><li class="active">1</li><li>2</li></div>
+        </html>
+        """
+        pool = Mock(spec=WebdriverPool)
+        pool.lease.side_effect = [mock_driver, TimeoutError("pool exhausted")]
+        scraper._webdriver_pool = pool
+        scraper._page_concurrency = 2
+
+        with patch.object(
+            scraper,
+            "_get_page_source",
+            side_effect=[page_html, WebDriverException("invalid session id")],
+        ):
+            with pytest.raises(IncompleteCrawlError, match=r"pages \[2\]"):
+                list(scraper.run(sample_brand))
+
+        pool.release.assert_called_once_with(mock_driver, broken=True)
+
     def test_run_yields_listings(self, scraper, mock_webdriver_factory, mock_driver, sample_brand):
         mock_webdriver_factory.create.return_value = mock_driver
         mock_listings = [
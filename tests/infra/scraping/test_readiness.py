@@ -0,0 +1,34 @@
+from typing import get_args
+
+import pytest
+
+from infra.scraping.readiness import READINESS_SCRIPTS, PageWaitRecorder, PageWaits, Readiness
+
+
+@pytest.mark.unit
+class TestReadiness:
+    def test_every_readiness_has_a_script(self):
+        assert set(READINESS_SCRIPTS) == set(get_args(Readiness))
+
+    def test_conditions_are_met_by_loaded_pages(self):
+        # no condition waits longer than a fully loaded page
+        for script in READINESS_SCRIPTS.values():
+            assert 'document.readyState === "complete"' in script
+
+    def test_page_wait_recorder_summary(self):
+        recorder = PageWaitRecorder(window=4)
+        for seconds in (0.5, 1.0, 1.5, 2.0, 4.0):
+            recorder.record(seconds)
+
+        waits = recorder.summary()
+
+        assert waits.pages == 5
+        assert waits.total_seconds == pytest.approx(9.0)
+        assert waits.mean_seconds == pytest.approx(1.8)
+        # the percentile covers the last `window` pages only
+        assert waits.p95_seconds == 4.0
+
+    def test_page_wait_recorder_without_pages(self):
+        assert PageWaitRecorder().summary() == PageWaits(
+            pages=0, total_seconds=0.0, mean_seconds=0.0, p95_seconds=0.0
+        )
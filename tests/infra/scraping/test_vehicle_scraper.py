@@ -1,3 +1,4 @@
+from dataclasses import fields
 from datetime import datetime
 from unittest.mock import Mock, patch
 
@@ -7,7 +8,8 @@ from core.entities.listing import Listing
 from core.entities.vehicle import Vehicle
 from infra.factory.clients.http import HttpClientFactory
 from infra.interfaces.http import HttpClient
-from infra.scraping.vehicle_scraper import VehicleScraper
+from infra.io.response_archive import ResponseArchive
+from infra.scraping.vehicle_scraper import VEHICLE_ATTRIBUTES, VehicleScraper
 
 
 @pytest.mark.unit
@@ -25,8 +27,6 @@ class TestVehicleScraper:
         return VehicleScraper(
             logger_factory=mock_logger_factory,
             http_client_factory=mock_http_client_factory,
-            min_req_delay=1.0,
-            max_req_delay=2.0,
             timeout=5.0,
             reinit_session_every=500,
         )
@@ -88,6 +88,15 @@ class TestVehicleScraper:
         assert result["metallic"] is True
         assert result["alloy_wheels"] is True
 
+        # attributes missing from the response are left out
+        assert "horsepower" not in result
+        assert "oldtimer" not in result
+
+    def test_vehicle_attributes_map_to_vehicle_fields(self):
+        vehicle_fields = {f.name for f in fields(Vehicle)}
+        assert set(VEHICLE_ATTRIBUTES.fields) <= vehicle_fields
+        assert len(VEHICLE_ATTRIBUTES.fields) == len(set(VEHICLE_ATTRIBUTES.fields))
+
     def test_get_vehicle_info_success(
         self, scraper, mock_http_client, sample_listing, sample_api_response
     ):
@@ -99,9 +108,8 @@ class TestVehicleScraper:
         with patch("time.sleep") as mock_sleep:
             vehicle = scraper._get_vehicle_info(sample_listing, mock_http_client)
 
-            mock_sleep.assert_called_once()
-            delay_arg = mock_sleep.call_args[0][0]
-            assert scraper._min_req_delay <= delay_arg <= scraper._max_req_delay
+            # pacing is left to the rate limiter of the http client
+            mock_sleep.assert_not_called()
 
         # check if api request was made
         expected_url = "https://olx.ba/api/listings/11111"
@@ -274,3 +282,90 @@ class TestVehicleScraper:
         # once after id=44444
         # once after id=66666
         assert mock_http_client_factory.create.call_count == 4
+
+    def test_run_refreshes_cookies_when_session_is_rejected(
+        self, scraper, mock_http_client_factory, sample_listing, sample_api_response
+    ):
+        rejected_client = Mock(spec=HttpClient)
+        rejected_client.get.return_value = Mock(ok=False, status_code=403)
+        fresh_client = Mock(spec=HttpClient)
+        fresh_client.get.return_value = Mock(
+            ok=True, status_code=200, json=Mock(return_value=sample_api_response)
+        )
+        mock_http_client_factory.create.side_effect = [rejected_client, fresh_client]
+
+        with patch("time.sleep") as mock_sleep:
+            vehicles = list(scraper.run([sample_listing]))
+
+        # a rejected session is not retried with the same cookies
+        rejected_client.get.assert_called_once()
+        mock_sleep.assert_not_called()
+        mock_http_client_factory.invalidate_cookies.assert_called_once()
+        assert mock_http_client_factory.create.call_count == 2
+        assert len(vehicles) == 1
+        assert vehicles[0].id == sample_listing.id
+
+    def test_run_stops_when_refreshed_sessions_are_still_rejected(
+        self, scraper, mock_http_client_factory, mock_http_client
+    ):
+        scraper._max_session_refreshes = 2
+        mock_http_client_factory.create.return_value = mock_http_client
+        mock_http_client.get.return_value = Mock(ok=False, status_code=403)
+        listings = [
+            Listing(id=str(idx), url=f"https://olx.ba/artikal/{idx}", title="A4", price="1 KM")
+            for idx in range(5)
+        ]
+
+        with patch("time.sleep"):
+            vehicles = list(scraper.run(listings))
+
+        # two listings were rejected after a refresh, the rest are not requested
+        assert vehicles == [None] * 5
+        assert mock_http_client_factory.invalidate_cookies.call_count == 2
+        assert mock_http_client.get.call_count == 4
+
+    def test_run_archives_responses_for_reparsing(
+        self,
+        mock_logger_factory,
+        mock_http_client_factory,
+        mock_http_client,
+        sample_listing,
+        sample_api_response,
+        tmp_path,
+    ):
+        archive = ResponseArchive(basedir=str(tmp_path), logger_factory=mock_logger_factory)
+        scraper = VehicleScraper(
+            logger_factory=mock_logger_factory,
+            http_client_factory=mock_http_client_factory,
+            response_archive=archive,
+        )
+        mock_http_client_factory.create.return_value = mock_http_client
+        mock_http_client.get.return_value = Mock(
+            ok=True, status_code=200, json=Mock(return_value=sample_api_response)
+        )
+
+        scraped = list(scraper.run([sample_listing]))
+        reparsed = list(scraper.reparse(sample_listing.run_id))
+
+        assert archive.run_ids() == [sample_listing.run_id]
+        assert reparsed == scraped
+        # reparsing does not touch the network
+        assert mock_http_client.get.call_count == 1
+
+    def test_reparse_yields_none_for_unparsable_responses(
+        self, mock_logger_factory, mock_http_client_factory, sample_listing, tmp_path
+    ):
+        archive = ResponseArchive(basedir=str(tmp_path), logger_factory=mock_logger_factory)
+        with archive.writer() as writer:
+            writer.write(sample_listing, {"attributes": [{"name": "Godište", "value": "n/a"}]})
+        scraper = VehicleScraper(
+            logger_factory=mock_logger_factory,
+            http_client_factory=mock_http_client_factory,
+            response_archive=archive,
+        )
+
+        assert list(scraper.reparse(sample_listing.run_id)) == [None]
+
+    def test_reparse_requires_archive(self, scraper):
+        with pytest.raises(ValueError, match="response archive"):
+            list(scraper.reparse("run_001"))
@@ -1,39 +1,87 @@
+from datetime import timedelta
 from unittest.mock import patch
 
 import pytest
 
 from infra.containers import Container
+from infra.factory.providers.http_cookie_provider import HttpCookieProvider
+from infra.factory.providers.webdriver_cookie_provider import WebdriverCookieProvider
+from infra.factory.webdriver_pool import WebdriverPool
+from infra.scraping.api_listing_scraper import ApiListingScraper
+from infra.scraping.async_vehicle_scraper import AsyncVehicleScraper
+from infra.scraping.listing_scraper import ListingScraper
+from infra.scraping.vehicle_scraper import VehicleScraper
+from infra.utils.rate_limiter import AimdRateLimiter, HostRateLimiter
 
 
 class TestContainer:
     @pytest.fixture
     def test_config(self):
         return {
-            "database": {"url": "sqlite:///:memory:", "echo": False},
+            "database": {
+                "url": "sqlite:///:memory:",
+                "echo": False,
+                "write_batch_size": 500,
+                "write_flush_interval": 5.0,
+                "write_max_pending": 2000,
+                "sqlite": {"journal_mode": "wal", "busy_timeout": 5000, "mmap_size": None},
+                "pool": {"size": 5, "max_overflow": 10, "recycle_seconds": 1800, "pre_ping": True},
+            },
             "logging": {"log_level": 10, "format_str": "%(message)s", "use_json": False},
             "webdriver": {
                 "chrome_options": [],
                 "use_stealth": True,
                 "timeout_seconds": 30,
+                "page_load_strategy": "eager",
                 "chrome_binary_path": None,
                 "chromedriver_path": None,
+                "pool": {"size": 1, "max_pages": 200, "max_rss_mb": None},
+                "blocking": {"url_patterns": ["*doubleclick.net*"], "resource_types": ["font"]},
+            },
+            "http": {
+                "url": "http://test.com",
+                "headers": {},
+                "client_type": "requests",
+                "cookie_provider": "webdriver",
+                "cookie_cache": {"path": None, "ttl_seconds": 1800.0},
+            },
+            "rate_limit": {
+                "strategy": "fixed",
+                "requests_per_second": 0.5,
+                "burst": 1,
+                "jitter": 0.0,
+                "min_requests_per_second": 0.1,
+                "max_requests_per_second": 2.0,
+                "increase_step": 0.02,
+                "decrease_factor": 0.5,
             },
-            "http": {"url": "http://test.com", "headers": {}, "client_type": "requests"},
             "file_service": {"type": "local"},
             "project_root": "/tmp",
             "resources": {"brands": "brands.json"},
             "scrapers": {
                 "listing_scraper": {
+                    "engine": "webdriver",
                     "created_gte": "-7+days",
-                    "min_req_delay": 1.0,
-                    "max_req_delay": 2.0,
                     "timeout": 10.0,
+                    "incremental": False,
+                    "page_concurrency": 2,
+                    "extraction": "script",
+                    "readiness": "cards",
+                    "sharding": {
+                        "lookback_runs": 5,
+                        "listings_per_page": 40,
+                        "pages_per_shard": 50,
+                        "max_shards": 16,
+                    },
                 },
                 "vehicle_scraper": {
-                    "min_req_delay": 1.0,
-                    "max_req_delay": 2.0,
+                    "engine": "sequential",
                     "timeout": 10.0,
                     "reinit_session_every": 100,
+                    "max_session_refreshes": 3,
+                    "concurrency": 4,
+                    "archive_dir": None,
+                    "refresh": {"ttl_days": 30.0, "budget": None},
                 },
             },
         }
@@ -49,8 +97,82 @@ class TestContainer:
         assert container.listing_scraper() is not None
         assert container.vehicle_scraper() is not None
         assert container.brand_service() is not None
+        assert container.refresh_policy().ttl == timedelta(days=30)
+        assert container.sharding_policy().max_shards == 16
         assert container.config.database.url() == "sqlite:///:memory:"
 
+    def test_vehicle_scraper_engine_selection(self, test_config):
+        container = Container()
+        container.config.from_dict(test_config)
+        assert isinstance(container.vehicle_scraper(), VehicleScraper)
+        assert not isinstance(container.vehicle_scraper(), AsyncVehicleScraper)
+
+        test_config["scrapers"]["vehicle_scraper"]["engine"] = "concurrent"
+        container.config.from_dict(test_config)
+        assert isinstance(container.vehicle_scraper(), AsyncVehicleScraper)
+
+    def test_listing_scraper_engine_selection(self, test_config):
+        container = Container()
+        container.config.from_dict(test_config)
+        scraper = container.listing_scraper()
+        assert isinstance(scraper, ListingScraper)
+        assert isinstance(scraper._webdriver_pool, WebdriverPool)
+        assert scraper._readiness == "cards"
+        assert container.webdriver_factory()._performance_logging is False
+        assert container.webdriver_factory()._page_load_strategy == "eager"
+        container.shutdown_resources()
+
+        # network extraction reads the performance log of the browser
+        test_config["scrapers"]["listing_scraper"]["extraction"] = "network"
+        container = Container()
+        container.config.from_dict(test_config)
+        assert container.webdriver_factory()._performance_logging is True
+
+        test_config["scrapers"]["listing_scraper"]["engine"] = "api"
+        container.config.from_dict(test_config)
+        assert isinstance(container.listing_scraper(), ApiListingScraper)
+
+    def test_db_service_sqlite_pragmas(self, test_config):
+        container = Container()
+        container.config.from_dict(test_config)
+
+        db_service = container.db_service()
+
+        assert db_service.sqlite_pragmas == {"journal_mode": "wal", "busy_timeout": 5000}
+        db_service.engine.dispose()
+
+    def test_write_behind_buffer_per_call(self, test_config):
+        container = Container()
+        container.config.from_dict(test_config)
+
+        with container.write_behind_buffer(write_batch=list, write_one=print) as first:
+            with container.write_behind_buffer(write_batch=list, write_one=print) as second:
+                assert first is not second
+                assert first._batch_size == 500
+                assert first._queue.maxsize == 2000
+
+    def test_rate_limiter_strategy_selection(self, test_config):
+        container = Container()
+        container.config.from_dict(test_config)
+        assert type(container.rate_limiter()) is HostRateLimiter
+
+        test_config["rate_limit"]["strategy"] = "aimd"
+        container.config.from_dict(test_config)
+        assert isinstance(container.rate_limiter(), AimdRateLimiter)
+
+    def test_cookie_provider_selection(self, test_config):
+        container = Container()
+        container.config.from_dict(test_config)
+        assert isinstance(container.cookie_provider()._provider, WebdriverCookieProvider)
+        # cookies are bootstrapped without blocked requests
+        assert container.cookie_provider()._provider.webdriver_factory._blocked_urls == []
+        assert container.webdriver_factory()._blocked_urls != []
+
+        test_config["http"]["cookie_provider"] = "http"
+        container = Container()
+        container.config.from_dict(test_config)
+        assert isinstance(container.cookie_provider()._provider, HttpCookieProvider)
+
     def test_create_and_patch(self, test_config):
         env_vars = {
             "ENVIRONMENT": "test",
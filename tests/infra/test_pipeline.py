@@ -0,0 +1,67 @@
+from functools import partial
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from core.entities.brand import Brand
+from core.entities.listing import Listing
+from core.entities.watermark import BrandWatermark
+from core.exceptions import IncompleteCrawlError
+from core.services.watermark_service import WatermarkService
+from infra.io.write_behind import WriteBehindBuffer
+from infra.pipeline import process_brand
+
+
+@pytest.mark.unit
+class TestProcessBrand:
+    @pytest.fixture
+    def brand(self):
+        return Brand(id="123", name="BMW", slug="bmw")
+
+    @pytest.fixture
+    def watermark_repo(self):
+        repo = MagicMock()
+        repo.get.return_value = BrandWatermark(brand_id="123", listing_id="10000")
+        repo.save.side_effect = lambda watermark: watermark
+        return repo
+
+    @pytest.fixture
+    def process(self, brand, watermark_repo, mock_logger_factory):
+        listing_service = Mock()
+        listing_service.insert_listings.side_effect = len
+        return partial(
+            process_brand,
+            brand,
+            "run-1",
+            listing_service=listing_service,
+            run_service=Mock(),
+            watermark_service=WatermarkService(watermark_repo),
+            logger=Mock(),
+            write_buffer=partial(WriteBehindBuffer, logger_factory=mock_logger_factory),
+        )
+
+    @staticmethod
+    def crawl(*listing_ids, error=None):
+        def run(brand, watermark=None):
+            for listing_id in listing_ids:
+                yield Listing(id=listing_id, url="u", title="t", price="1 KM")
+            if error:
+                raise error
+
+        return Mock(run=run)
+
+    def test_finished_crawl_advances_watermark(self, process, watermark_repo):
+        stats = process(listing_scraper=self.crawl("10002", "10001"))
+
+        assert stats == {"success_listings": 2, "failed_listings": 0, "complete": True}
+        assert watermark_repo.save.call_args.args[0].listing_id == "10002"
+
+    def test_page_failing_mid_crawl_keeps_watermark(self, process, watermark_repo):
+        # the first page was scraped, the second one failed
+        scraper = self.crawl("10002", error=IncompleteCrawlError("123", "url=...&page=2"))
+
+        stats = process(listing_scraper=scraper)
+
+        # listings of the scraped page are stored, the watermark stays put
+        assert stats == {"success_listings": 1, "failed_listings": 0, "complete": False}
+        watermark_repo.save.assert_not_called()
@@ -110,3 +110,20 @@ class TestSettingsPriority:
                     Settings()
                 assert "created_gte" in str(exc_info.value)
                 assert "Input should be" in str(exc_info.value)
+
+    def test_page_load_strategy_none_is_rejected(self, mock_yaml_content):
+        """
+        Test description:
+        - Verify that the "none" page load strategy is not accepted.
+        Expected outcome:
+        - A validation error is raised, get() would return before the requested page replaced
+          the previous one.
+        """
+        with patch.object(YamlConfigSettingsSource, "__call__", return_value=mock_yaml_content):
+            env_vars = {"WEBDRIVER__PAGE_LOAD_STRATEGY": "none"}
+            with patch.dict(os.environ, env_vars, clear=True):
+                from pydantic import ValidationError
+
+                with pytest.raises(ValidationError) as exc_info:
+                    Settings()
+                assert "page_load_strategy" in str(exc_info.value)
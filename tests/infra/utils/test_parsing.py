@@ -0,0 +1,58 @@
+import pytest
+
+from infra.utils.parsing import AttributeExtractor, AttributeMapping, get_attribute_value
+
+
+@pytest.mark.unit
+class TestGetAttributeValue:
+    @pytest.mark.parametrize(
+        ("attribute", "expected"),
+        [
+            ({}, None),
+            ({"value": "", "type": "string"}, ""),
+            ({"value": " Dizel ", "type": None}, " Dizel "),
+            ({"value": 2015, "type": "number"}, "2015"),
+            ({"value": " 140 ", "type": "number"}, "140"),
+            ({"value": " true ", "type": "string"}, True),
+            ({"value": "false", "type": "string"}, False),
+            ({"value": " Dizel ", "type": "string"}, "Dizel"),
+            ({"value": " 2024-01-01 ", "type": "date"}, "2024-01-01"),
+        ],
+    )
+    def test_get_attribute_value(self, attribute, expected):
+        assert get_attribute_value(attribute) == expected
+
+
+@pytest.mark.unit
+class TestAttributeExtractor:
+    @pytest.fixture
+    def extractor(self):
+        return AttributeExtractor(
+            [
+                AttributeMapping("Gorivo", "fuel_type"),
+                AttributeMapping("Metalik", "metallic"),
+                AttributeMapping("Godište", "build_year", coerce=lambda a: int(a["value"])),
+            ]
+        )
+
+    def test_extract_fills_present_fields_only(self, extractor):
+        attributes = [
+            {"name": "Gorivo", "value": "Dizel", "type": "string"},
+            {"name": "Nepoznato", "value": "x", "type": "string"},
+            {"name": "Godište", "value": "2015", "type": "number"},
+        ]
+
+        assert extractor.extract(attributes) == {"fuel_type": "Dizel", "build_year": 2015}
+
+    def test_extract_without_attributes(self, extractor):
+        assert extractor.extract(None) == {}
+        assert extractor.extract([]) == {}
+
+    def test_fields(self, extractor):
+        assert extractor.fields == ["fuel_type", "metallic", "build_year"]
+
+    def test_duplicate_labels_are_rejected(self):
+        with pytest.raises(ValueError, match="Duplicate attribute label: Gorivo"):
+            AttributeExtractor(
+                [AttributeMapping("Gorivo", "fuel_type"), AttributeMapping("Gorivo", "fuel")]
+            )
@@ -0,0 +1,187 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from infra.utils.rate_limiter import AimdRateLimiter, HostRateLimiter, PacingState, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+        with pytest.raises(ValueError):
+            TokenBucket(rate=1, burst=0)
+
+    def test_burst_is_served_without_waiting(self, clock):
+        bucket = TokenBucket(rate=2.0, burst=3, clock=clock)
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    def test_requests_over_budget_are_queued(self, clock):
+        bucket = TokenBucket(rate=2.0, burst=1, clock=clock)
+        waits = [bucket.reserve() for _ in range(4)]
+        assert waits == pytest.approx([0.0, 0.5, 1.0, 1.5])
+
+    def test_tokens_refill_over_time(self, clock):
+        bucket = TokenBucket(rate=2.0, burst=2, clock=clock)
+        bucket.reserve()
+        bucket.reserve()
+        clock.now = 0.5
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == pytest.approx(0.5)
+
+    def test_refill_is_capped_at_burst(self, clock):
+        bucket = TokenBucket(rate=10.0, burst=2, clock=clock)
+        clock.now = 100.0
+        waits = [bucket.reserve() for _ in range(3)]
+        assert waits == pytest.approx([0.0, 0.0, 0.1])
+
+    def test_jitter_is_added_to_throttled_requests_only(self, clock):
+        bucket = TokenBucket(rate=1.0, burst=1, jitter=0.5, clock=clock)
+        assert bucket.reserve() == 0.0
+        wait = bucket.reserve()
+        assert 1.0 <= wait <= 1.5
+
+    def test_acquire_sleeps_for_reserved_time(self, clock):
+        bucket = TokenBucket(rate=4.0, burst=1, clock=clock)
+        with patch("time.sleep") as mock_sleep:
+            assert bucket.acquire() == 0.0
+            assert bucket.acquire() == pytest.approx(0.25)
+        mock_sleep.assert_called_once()
+        assert mock_sleep.call_args[0][0] == pytest.approx(0.25)
+
+    def test_acquire_async_sleeps_for_reserved_time(self, clock):
+        bucket = TokenBucket(rate=4.0, burst=1, clock=clock)
+
+        async def acquire_twice():
+            return [await bucket.acquire_async(), await bucket.acquire_async()]
+
+        with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            waits = asyncio.run(acquire_twice())
+
+        assert waits == pytest.approx([0.0, 0.25])
+        mock_sleep.assert_awaited_once()
+
+
+@pytest.mark.unit
+class TestHostRateLimiter:
+    def test_bucket_is_shared_per_host(self):
+        limiter = HostRateLimiter(requests_per_second=1.0, burst=2)
+        bucket = limiter.bucket("https://olx.ba/api/listings/1")
+        assert limiter.bucket("https://olx.ba/pretraga?page=2") is bucket
+        assert limiter.bucket("https://example.com/") is not bucket
+        assert bucket.rate == 1.0
+        assert bucket.burst == 2
+
+    def test_hosts_have_independent_budgets(self):
+        limiter = HostRateLimiter(requests_per_second=1.0, burst=1)
+        with patch("time.sleep") as mock_sleep:
+            limiter.acquire("https://olx.ba/a")
+            limiter.acquire("https://example.com/a")
+        mock_sleep.assert_not_called()
+
+        with patch("time.sleep") as mock_sleep:
+            limiter.acquire("https://olx.ba/b")
+        mock_sleep.assert_called_once()
+
+    def test_state_summarizes_recent_outcomes(self):
+        limiter = HostRateLimiter(requests_per_second=1.0, window=4)
+        assert limiter.state("https://olx.ba/") == PacingState(
+            rate=1.0, error_ratio=0.0, requests=0
+        )
+
+        for status in (200, 429, 200, 503, 200, 200):
+            limiter.record_response("https://olx.ba/api/listings/1", status)
+
+        # only the last 4 outcomes are kept: 200, 503, 200, 200
+        assert limiter.state("https://olx.ba/") == PacingState(
+            rate=1.0, error_ratio=0.25, requests=4
+        )
+        assert limiter.state("https://example.com/").requests == 0
+
+
+@pytest.mark.unit
+class TestAimdRateLimiter:
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def limiter(self, mock_logger_factory, clock):
+        return AimdRateLimiter(
+            requests_per_second=1.0,
+            logger_factory=mock_logger_factory,
+            min_requests_per_second=0.25,
+            max_requests_per_second=1.1,
+            increase_step=0.05,
+            decrease_factor=0.5,
+            clock=clock,
+        )
+
+    def test_invalid_arguments(self, mock_logger_factory):
+        with pytest.raises(ValueError):
+            AimdRateLimiter(1.0, mock_logger_factory, decrease_factor=1.0)
+        with pytest.raises(ValueError):
+            AimdRateLimiter(
+                1.0,
+                mock_logger_factory,
+                min_requests_per_second=2.0,
+                max_requests_per_second=1.0,
+            )
+
+    def test_initial_rate_is_clamped(self, mock_logger_factory):
+        limiter = AimdRateLimiter(
+            5.0, mock_logger_factory, min_requests_per_second=0.1, max_requests_per_second=2.0
+        )
+        assert limiter.state("https://olx.ba/").rate == 2.0
+        limiter.set_rate("https://olx.ba/", 0.01)
+        assert limiter.state("https://olx.ba/").rate == 0.1
+
+    def test_success_increases_rate_up_to_max(self, limiter):
+        limiter.record_success("https://olx.ba/a")
+        assert limiter.state("https://olx.ba/").rate == pytest.approx(1.05)
+        limiter.record_success("https://olx.ba/b")
+        limiter.record_success("https://olx.ba/c")
+        assert limiter.state("https://olx.ba/").rate == pytest.approx(1.1)
+
+    def test_failure_decreases_rate_down_to_min(self, limiter, clock):
+        limiter.record_failure("https://olx.ba/a")
+        assert limiter.state("https://olx.ba/").rate == pytest.approx(0.5)
+
+        clock.now = 10.0
+        limiter.record_failure("https://olx.ba/a")
+        assert limiter.state("https://olx.ba/").rate == pytest.approx(0.25)
+
+        clock.now = 20.0
+        limiter.record_failure("https://olx.ba/a")
+        assert limiter.state("https://olx.ba/").rate == pytest.approx(0.25)
+
+    def test_failures_within_one_interval_decrease_once(self, limiter, clock):
+        limiter.record_response("https://olx.ba/a", 429)
+        clock.now = 1.0
+        limiter.record_response("https://olx.ba/b", 503)
+        assert limiter.state("https://olx.ba/").rate == pytest.approx(0.5)
+
+        # one request interval at the decreased rate has passed
+        clock.now = 2.0
+        limiter.record_response("https://olx.ba/c", 429)
+        assert limiter.state("https://olx.ba/").rate == pytest.approx(0.25)
+
+    def test_hosts_adapt_independently(self, limiter):
+        limiter.record_failure("https://olx.ba/a")
+        limiter.record_success("https://example.com/a")
+        assert limiter.state("https://olx.ba/").rate == pytest.approx(0.5)
+        assert limiter.state("https://example.com/").rate == pytest.approx(1.05)
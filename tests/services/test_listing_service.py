@@ -1,11 +1,13 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from unittest.mock import Mock
 
 import pytest
 
 from core.entities.listing import Listing
+from core.entities.refresh import RefreshCandidate, RefreshReason
 from core.repositories.listing_repository import ListingRepository
 from core.services.listing_service import ListingService
+from core.services.refresh_policy import RefreshPolicy
 
 
 @pytest.fixture
@@ -53,6 +55,26 @@ class TestCreateListing:
         assert listing.run_id == "run_001"
         assert isinstance(listing.visited_at, datetime)
 
+    @pytest.mark.parametrize(
+        "price, amount, on_request",
+        [
+            ("25.000 KM", 25000, False),
+            ("25,000 KM", 25000, False),
+            ("1.234.567 KM", 1234567, False),
+            ("25.000,50 KM", 25000, False),
+            ("12 500 KM", 12500, False),
+            ("Na upit", None, True),
+            ("", None, False),
+        ],
+    )
+    def test_create_listing_parses_price(self, price, amount, on_request):
+        """The price amount is parsed from the price, never taken from the data."""
+        data = {"id": "1", "url": "u", "title": "t", "price": price, "price_amount": 1}
+        listing = ListingService.create_listing(data)
+
+        assert listing.price_amount == amount
+        assert listing.price_on_request is on_request
+
 
 class TestInsertListing:
     """Tests for the insert_listing method."""
@@ -83,6 +105,18 @@ class TestInsertListing:
 
         mock_repo.add.assert_called_once_with(listing)
 
+    def test_insert_listings_in_one_batch(self, service, mock_repo):
+        """Test that insert_listings hands the whole batch to the repository."""
+        listings = [
+            Listing(id=f"listing{idx}", url="u", title="Car", price="1 KM") for idx in range(3)
+        ]
+        mock_repo.add_many.return_value = 3
+
+        assert service.insert_listings(listings) == 3
+
+        mock_repo.add_many.assert_called_once_with(listings)
+        mock_repo.add.assert_not_called()
+
 
 class TestFindLatest:
     """Tests for the find_latest method."""
@@ -153,3 +187,46 @@ class TestSearchLastIngestedListings:
         mock_repo.find_latest_run.assert_called_once()
         mock_repo.find_without_vehicle_by_run_id.assert_called_once_with(run_id)
         assert result == []
+
+
+class TestFindListingsToScrape:
+    """Tests for the find_listings_to_scrape method."""
+
+    def test_find_listings_to_scrape(self, service, mock_repo):
+        """Test that candidates are selected by the refresh policy."""
+        now = datetime(2026, 1, 31)
+        stale = RefreshCandidate(
+            listing=Listing(id="1", url="u", title="t", price="1 KM"),
+            reason=RefreshReason.STALE,
+            last_visited_at=datetime(2025, 1, 1),
+        )
+        new = RefreshCandidate(
+            listing=Listing(id="2", url="u", title="t", price="1 KM"), reason=RefreshReason.NEW
+        )
+        mock_repo.find_refresh_candidates.return_value = [stale, new]
+        policy = RefreshPolicy(ttl=timedelta(days=30), budget=1)
+
+        result = service.find_listings_to_scrape("run_123", policy, now=now)
+
+        mock_repo.find_refresh_candidates.assert_called_once_with("run_123", datetime(2026, 1, 1))
+        assert result == [new]
+
+
+class TestGetBrandVolumes:
+    """Tests for the get_brand_volumes method."""
+
+    def test_get_brand_volumes_averages_over_recent_runs(self, service, mock_repo):
+        mock_repo.find_recent_run_ids.return_value = ["run_2", "run_1"]
+        mock_repo.count_by_brand.return_value = {"1": 90, "2": 1}
+
+        result = service.get_brand_volumes(lookback_runs=2)
+
+        mock_repo.find_recent_run_ids.assert_called_once_with(2)
+        mock_repo.count_by_brand.assert_called_once_with(["run_2", "run_1"])
+        assert result == {"1": 45.0, "2": 0.5}
+
+    def test_get_brand_volumes_without_history(self, service, mock_repo):
+        mock_repo.find_recent_run_ids.return_value = []
+
+        assert service.get_brand_volumes() == {}
+        mock_repo.count_by_brand.assert_not_called()
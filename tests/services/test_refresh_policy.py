@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.entities.listing import Listing
+from core.entities.refresh import RefreshCandidate, RefreshReason
+from core.services.refresh_policy import RefreshPolicy
+
+
+def candidate(listing_id: str, reason: RefreshReason, last_visited_at=None) -> RefreshCandidate:
+    return RefreshCandidate(
+        listing=Listing(id=listing_id, url="u", title="t", price="1 KM"),
+        reason=reason,
+        last_visited_at=last_visited_at,
+    )
+
+
+@pytest.fixture
+def candidates():
+    return [
+        candidate("stale-recent", RefreshReason.STALE, datetime(2025, 6, 1)),
+        candidate("price", RefreshReason.PRICE_CHANGED, datetime(2026, 1, 1)),
+        candidate("stale-old", RefreshReason.STALE, datetime(2025, 1, 1)),
+        candidate("new", RefreshReason.NEW),
+        candidate("stale-unknown", RefreshReason.STALE),
+    ]
+
+
+class TestRefreshPolicy:
+    def test_select_orders_by_priority(self, candidates):
+        policy = RefreshPolicy(ttl=timedelta(days=30))
+
+        selected = policy.select(candidates)
+
+        assert [c.listing.id for c in selected] == [
+            "new",
+            "price",
+            "stale-unknown",
+            "stale-old",
+            "stale-recent",
+        ]
+
+    def test_select_respects_budget(self, candidates):
+        policy = RefreshPolicy(ttl=timedelta(days=30), budget=2)
+
+        assert [c.listing.id for c in policy.select(candidates)] == ["new", "price"]
+        assert RefreshPolicy(ttl=timedelta(days=30), budget=0).select(candidates) == []
+
+    def test_stale_before(self):
+        policy = RefreshPolicy(ttl=timedelta(days=30))
+
+        assert policy.stale_before(datetime(2026, 1, 31)) == datetime(2026, 1, 1)
+
+    def test_negative_budget(self):
+        with pytest.raises(ValueError):
+            RefreshPolicy(ttl=timedelta(days=30), budget=-1)
@@ -99,3 +99,55 @@ class TestRunService:
 
         with pytest.raises(ValueError, match="Run run-123 not found"):
             run_service.complete_run("run-123")
+
+    def test_record_pacing(self, run_service, mock_repo):
+        run = Run(id="run-123", started_at=datetime.datetime.now())
+        mock_repo.get.return_value = run
+        mock_repo.update.side_effect = lambda x: x
+
+        run_service.record_pacing("run-123", request_rate=0.35, error_ratio=0.02)
+
+        assert run.request_rate == 0.35
+        assert run.request_error_ratio == 0.02
+        mock_repo.update.assert_called_once_with(run)
+
+    def test_record_pacing_not_found(self, run_service, mock_repo):
+        mock_repo.get.return_value = None
+
+        with pytest.raises(ValueError, match="Run run-123 not found"):
+            run_service.record_pacing("run-123", request_rate=0.35, error_ratio=0.0)
+
+    def test_get_last_request_rate(self, run_service, mock_repo):
+        now = datetime.datetime.now()
+        mock_repo.search.return_value = (
+            [
+                Run(id="run-3", started_at=now),
+                Run(id="run-2", started_at=now, request_rate=0.6),
+                Run(id="run-1", started_at=now, request_rate=0.3),
+            ],
+            3,
+        )
+
+        assert run_service.get_last_request_rate() == 0.6
+        mock_repo.search.assert_called_once_with(limit=10)
+
+    def test_get_last_request_rate_without_history(self, run_service, mock_repo):
+        mock_repo.search.return_value = ([Run(id="run-1", started_at=datetime.datetime.now())], 1)
+
+        assert run_service.get_last_request_rate() is None
+
+    def test_sort_by_start(self, run_service, mock_repo):
+        now = datetime.datetime.now()
+        runs = {
+            "b7e1": Run(id="b7e1", started_at=now - datetime.timedelta(days=2)),
+            "0c3f": Run(id="0c3f", started_at=now),
+            "f4a9": Run(id="f4a9", started_at=now - datetime.timedelta(days=1)),
+        }
+        mock_repo.get.side_effect = runs.get
+
+        assert run_service.sort_by_start(["0c3f", "unknown", "b7e1", "f4a9"]) == [
+            "unknown",
+            "b7e1",
+            "f4a9",
+            "0c3f",
+        ]
@@ -0,0 +1,45 @@
+import pytest
+
+from core.entities.brand import Brand
+from core.services.sharding_policy import ShardingPolicy
+
+
+def make_brands(count: int) -> list[Brand]:
+    return [Brand(id=str(idx), name=f"Brand {idx}", slug=f"brand-{idx}") for idx in range(count)]
+
+
+class TestShardingPolicy:
+    def test_shard_balances_expected_pages(self):
+        brands = make_brands(8)
+        # pages per brand: 10, 7, 5, 4, 3, 1, 1, 1 (32 in total)
+        volumes = {"0": 400, "1": 280, "2": 200, "3": 160, "4": 120, "5": 40, "6": 1}
+        policy = ShardingPolicy(listings_per_page=40, pages_per_shard=16, max_shards=8)
+
+        shards = policy.shard(brands, volumes)
+
+        assert len(shards) == 2
+        assert [shard.expected_pages for shard in shards] == [16, 16]
+        assert sorted(b.id for shard in shards for b in shard.brands) == [b.id for b in brands]
+
+    def test_brands_without_history_count_as_one_page(self):
+        policy = ShardingPolicy(listings_per_page=40, pages_per_shard=2, max_shards=16)
+
+        shards = policy.shard(make_brands(5), volumes={})
+
+        assert len(shards) == 3
+        assert sorted(shard.expected_pages for shard in shards) == [1, 2, 2]
+
+    def test_shard_count_is_capped(self):
+        brands = make_brands(3)
+        volumes = {brand.id: 4000 for brand in brands}
+
+        assert len(ShardingPolicy(pages_per_shard=1, max_shards=2).shard(brands, volumes)) == 2
+        # never more shards than brands
+        assert len(ShardingPolicy(pages_per_shard=1, max_shards=16).shard(brands, volumes)) == 3
+
+    def test_shard_without_brands(self):
+        assert ShardingPolicy().shard([], {}) == []
+
+    def test_invalid_settings(self):
+        with pytest.raises(ValueError):
+            ShardingPolicy(max_shards=0)
@@ -2,7 +2,7 @@ from unittest.mock import Mock
 
 import pytest
 
-from core.entities.vehicle import Vehicle
+from core.entities.vehicle import Vehicle, feature_mask
 from core.services.vehicle_service import VehicleService
 
 
@@ -81,6 +81,27 @@ class TestCreateListing:
         assert not hasattr(vehicle, "extra_field")
         assert not hasattr(vehicle, "another_field")
 
+    def test_create_listing_packs_features(self):
+        """Boolean fields are packed into the feature masks, also when read back as text."""
+        data = {
+            "id": "vehicle1",
+            "url": "u",
+            "title": "t",
+            "price": "1 KM",
+            "navigation": True,
+            "car_play": "0",
+            "seat_heating": "1",
+            "features_mask": 1,
+        }
+        vehicle = VehicleService.create_listing(data)
+
+        assert vehicle.features_mask == feature_mask(["navigation", "seat_heating"])
+        assert vehicle.features_known == feature_mask(["navigation", "car_play", "seat_heating"])
+
+    def test_feature_mask_rejects_unknown_features(self):
+        with pytest.raises(ValueError, match="sunroof_deluxe"):
+            feature_mask(["sunroof", "sunroof_deluxe"])
+
 
 class TestInsertVehicle:
     """Tests for the insert_vehicle method."""
@@ -116,6 +137,44 @@ class TestInsertVehicle:
         mock_repo.add.assert_called_once_with(vehicle)
 
 
+class TestSaveVehicle:
+    """Tests for the save_vehicle method."""
+
+    def test_save_vehicle_inserts_new_vehicle(self, service, mock_repo):
+        """Test that a vehicle which is not stored yet is inserted."""
+        vehicle = Vehicle(id="vehicle444", url="u", title="Audi A4", price="30,000 KM")
+        mock_repo.get.return_value = None
+
+        service.save_vehicle(vehicle)
+
+        mock_repo.add.assert_called_once_with(vehicle)
+        mock_repo.update.assert_not_called()
+
+    def test_save_vehicle_updates_existing_vehicle(self, service, mock_repo):
+        """Test that a stored vehicle is overwritten."""
+        vehicle = Vehicle(id="vehicle444", url="u", title="Audi A4", price="30,000 KM")
+        mock_repo.get.return_value = vehicle
+
+        service.save_vehicle(vehicle)
+
+        mock_repo.update.assert_called_once_with(vehicle)
+        mock_repo.add.assert_not_called()
+
+    def test_save_vehicles_upserts_in_one_batch(self, service, mock_repo):
+        """Test that the vehicles are upserted together, the last vehicle of an id wins."""
+        stored = Vehicle(id="vehicle1", url="u", title="Audi A4", price="30,000 KM")
+        new = Vehicle(id="vehicle2", url="u", title="BMW X5", price="45,000 KM")
+        newer = Vehicle(id="vehicle2", url="u", title="BMW X5", price="44,000 KM")
+        mock_repo.upsert_many.return_value = 2
+
+        assert service.save_vehicles([stored, new, newer]) == 2
+
+        mock_repo.upsert_many.assert_called_once_with([stored, newer])
+        mock_repo.get.assert_not_called()
+        mock_repo.add.assert_not_called()
+        mock_repo.update.assert_not_called()
+
+
 class TestVehicleExists:
     """Tests for the vehicle_exists method."""
 
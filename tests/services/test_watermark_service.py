@@ -0,0 +1,52 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.entities.watermark import BrandWatermark
+from core.services.watermark_service import WatermarkService
+
+
+class TestWatermarkService:
+    @pytest.fixture
+    def mock_repo(self):
+        repo = MagicMock()
+        repo.save.side_effect = lambda watermark: watermark
+        return repo
+
+    @pytest.fixture
+    def watermark_service(self, mock_repo):
+        return WatermarkService(mock_repo)
+
+    def test_advance_creates_watermark_at_newest_listing(self, watermark_service, mock_repo):
+        mock_repo.get.return_value = None
+
+        watermark = watermark_service.advance("123", ["9999", "11111", "abc"], "run-1")
+
+        assert watermark.brand_id == "123"
+        assert watermark.listing_id == "11111"
+        assert watermark.run_id == "run-1"
+        assert watermark.updated_at is not None
+        mock_repo.save.assert_called_once_with(watermark)
+
+    def test_advance_never_moves_watermark_back(self, watermark_service, mock_repo):
+        current = BrandWatermark(brand_id="123", listing_id="22222")
+        mock_repo.get.return_value = current
+
+        assert watermark_service.advance("123", ["11111", "22222"], "run-2") is current
+        mock_repo.save.assert_not_called()
+
+        assert watermark_service.advance("123", ["33333"], "run-2").listing_id == "33333"
+
+    def test_advance_without_listings(self, watermark_service, mock_repo):
+        mock_repo.get.return_value = None
+
+        assert watermark_service.advance("123", [], "run-1") is None
+        mock_repo.save.assert_not_called()
+
+    def test_watermark_covers_older_listings(self):
+        watermark = BrandWatermark(brand_id="123", listing_id="22222")
+
+        assert watermark.covers("22222")
+        assert watermark.covers("9999")
+        assert not watermark.covers("22223")
+        assert not watermark.covers("not-a-number")